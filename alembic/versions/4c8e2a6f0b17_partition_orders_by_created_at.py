@@ -0,0 +1,172 @@
+"""partition orders and order_items by created_at
+
+Revision ID: 4c8e2a6f0b17
+Revises: 9b3e5f7a2c14
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2a6f0b17'
+down_revision: Union[str, None] = '9b3e5f7a2c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Particiones mensuales creadas por adelantado; después las crea `app.commands.manage_partitions`
+MONTHS_AHEAD = 3
+
+# (nombre, tabla, columnas, condición del índice parcial)
+INDEXES = [
+    ('ix_orders_id', 'orders', ['id'], None),
+    ('ix_orders_user_id', 'orders', ['user_id'], None),
+    ('ix_orders_created_at_live', 'orders', ['created_at'], 'deleted_at IS NULL'),
+    ('ix_orders_user_id_created_at_live', 'orders', ['user_id', 'created_at'], 'deleted_at IS NULL'),
+    ('ix_order_items_id', 'order_items', ['id'], None),
+    ('ix_order_items_order_id', 'order_items', ['order_id'], None),
+    ('ix_order_items_product_id', 'order_items', ['product_id'], None),
+    ('ix_order_items_order_id_live', 'order_items', ['order_id'], 'deleted_at IS NULL'),
+]
+
+ORDERS_COLUMNS = "id, user_id, total_price, status, deleted_at, created_at, updated_at"
+ORDER_ITEMS_COLUMNS = "id, order_id, product_id, quantity, subtotal, deleted_at"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _move_aside(table: str, pkey: str):
+    """
+    Renombra la tabla actual y libera los nombres de sus índices para la nueva.
+    """
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+    op.execute(f"ALTER TABLE {table}_legacy RENAME CONSTRAINT {pkey} TO {table}_legacy_pkey")
+    for name, index_table, _, _ in INDEXES:
+        if index_table == table:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _create_indexes():
+    for name, table, columns, where in INDEXES:
+        op.create_index(name, table, columns, unique=False, postgresql_where=sa.text(where) if where else None)
+
+
+def upgrade() -> None:
+    # Los pedidos y sus artículos se reparten en particiones mensuales por la fecha del pedido.
+    # order_items guarda esa fecha en order_created_at (la copia la aplicación, sin valor por
+    # defecto) para que cada mes de artículos se pueda archivar junto al mes de pedidos y la
+    # clave foránea pueda referenciar la clave (id, created_at) aunque el artículo se añada
+    # en otra transacción.
+    # PostgreSQL exige que la clave primaria de una tabla particionada incluya la columna de
+    # partición, así que `id` deja de ser único por sí solo: lo sigue generando la secuencia
+    # y las consultas por id filtran por la columna en lugar de buscar por clave primaria.
+    # La migración copia los datos con las tablas bloqueadas: requiere una ventana de mantenimiento.
+    bind = op.get_bind()
+    first = bind.execute(sa.text("SELECT date_trunc('month', min(created_at))::date FROM orders")).scalar()
+    current = date.today().replace(day=1)
+    month = min(first, current) if first else current
+
+    _move_aside('order_items', 'order_items_pkey')
+    _move_aside('orders', 'orders_pkey')
+
+    op.execute("""
+        CREATE TABLE orders (
+            id INTEGER NOT NULL DEFAULT nextval('orders_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            total_price NUMERIC(10, 2) NOT NULL,
+            status VARCHAR(50) NOT NULL,
+            deleted_at TIMESTAMP,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("""
+        CREATE TABLE order_items (
+            id INTEGER NOT NULL DEFAULT nextval('order_items_id_seq'),
+            order_id INTEGER,
+            product_id INTEGER REFERENCES products (id) ON DELETE CASCADE,
+            quantity INTEGER NOT NULL,
+            subtotal NUMERIC(10, 2) NOT NULL,
+            deleted_at TIMESTAMP,
+            order_created_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (id, order_created_at),
+            FOREIGN KEY (order_id, order_created_at) REFERENCES orders (id, created_at) ON DELETE CASCADE
+        ) PARTITION BY RANGE (order_created_at)
+    """)
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY order_items.id")
+
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        for table in ('orders', 'order_items'):
+            op.execute(
+                f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        month = upper
+    op.execute("CREATE TABLE orders_default PARTITION OF orders DEFAULT")
+    op.execute("CREATE TABLE order_items_default PARTITION OF order_items DEFAULT")
+
+    op.execute(f"INSERT INTO orders ({ORDERS_COLUMNS}) SELECT {ORDERS_COLUMNS} FROM orders_legacy")
+    op.execute(f"""
+        INSERT INTO order_items ({ORDER_ITEMS_COLUMNS}, order_created_at)
+        SELECT i.id, i.order_id, i.product_id, i.quantity, i.subtotal, i.deleted_at,
+               COALESCE(o.created_at, CURRENT_TIMESTAMP)
+        FROM order_items_legacy AS i
+        LEFT JOIN orders_legacy AS o ON o.id = i.order_id
+    """)
+
+    _create_indexes()
+
+    op.execute("DROP TABLE order_items_legacy")
+    op.execute("DROP TABLE orders_legacy")
+    op.execute("ANALYZE orders")
+    op.execute("ANALYZE order_items")
+
+
+def downgrade() -> None:
+    # Las particiones ya archivadas y eliminadas no se recuperan
+    _move_aside('order_items', 'order_items_pkey')
+    _move_aside('orders', 'orders_pkey')
+
+    op.execute("""
+        CREATE TABLE orders (
+            id INTEGER NOT NULL DEFAULT nextval('orders_id_seq') PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            total_price NUMERIC(10, 2) NOT NULL,
+            status VARCHAR(50) NOT NULL,
+            deleted_at TIMESTAMP,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        )
+    """)
+    op.execute("""
+        CREATE TABLE order_items (
+            id INTEGER NOT NULL DEFAULT nextval('order_items_id_seq') PRIMARY KEY,
+            order_id INTEGER REFERENCES orders (id) ON DELETE CASCADE,
+            product_id INTEGER REFERENCES products (id) ON DELETE CASCADE,
+            quantity INTEGER NOT NULL,
+            subtotal NUMERIC(10, 2) NOT NULL,
+            deleted_at TIMESTAMP
+        )
+    """)
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("ALTER SEQUENCE order_items_id_seq OWNED BY order_items.id")
+
+    op.execute(f"INSERT INTO orders ({ORDERS_COLUMNS}) SELECT {ORDERS_COLUMNS} FROM orders_legacy")
+    op.execute(f"INSERT INTO order_items ({ORDER_ITEMS_COLUMNS}) SELECT {ORDER_ITEMS_COLUMNS} FROM order_items_legacy")
+
+    _create_indexes()
+
+    op.execute("DROP TABLE order_items_legacy")
+    op.execute("DROP TABLE orders_legacy")
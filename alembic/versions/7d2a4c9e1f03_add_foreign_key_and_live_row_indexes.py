@@ -0,0 +1,51 @@
+"""add foreign key and live row indexes
+
+Revision ID: 7d2a4c9e1f03
+Revises: 11155d561489
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a4c9e1f03'
+down_revision: Union[str, None] = '11155d561489'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas, condición del índice parcial)
+INDEXES = [
+    # Claves foráneas: joins de las relaciones y borrados en cascada
+    ('ix_orders_user_id', 'orders', ['user_id'], None),
+    ('ix_order_items_order_id', 'order_items', ['order_id'], None),
+    ('ix_order_items_product_id', 'order_items', ['product_id'], None),
+    ('ix_products_category_id', 'products', ['category_id'], None),
+    # Roles del usuario, cargados en cada petición autenticada
+    ('ix_user_roles_association_user_id', 'user_roles_association', ['user_id'], None),
+    # Pedidos vivos de un usuario (fetch_user_orders)
+    ('ix_orders_user_id_created_at_live', 'orders', ['user_id', 'created_at'], 'deleted_at IS NULL'),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,46 @@
+"""add soft delete partial indexes
+
+Revision ID: 9b3e5f7a2c14
+Revises: 7d2a4c9e1f03
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e5f7a2c14'
+down_revision: Union[str, None] = '7d2a4c9e1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Índices parciales sobre las filas vivas: las consultas filtran siempre deleted_at IS NULL.
+# Las búsquedas por id ya usan la clave primaria, así que no llevan índice parcial.
+INDEXES = [
+    ('ix_products_name_live', 'products', ['name']),
+    ('ix_products_category_id_live', 'products', ['category_id']),
+    ('ix_orders_created_at_live', 'orders', ['created_at']),
+    ('ix_order_items_order_id_live', 'order_items', ['order_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text('deleted_at IS NULL'),
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -11,6 +11,9 @@ from app.api.routes.client.category_routes import category_router
 from app.api.routes.admin.admin_order_routes import admin_order_router
 from app.api.routes.client.order_routes import order_router
 from app.api.routes.public.hello import public_router
+from app.api.routes.public.catalog_routes import catalog_router
+from app.api.routes.public.metrics_routes import metrics_router
+from app.api.routes.admin.admin_monitoring_routes import admin_monitoring_router
 
 api_router = APIRouter()
 #Auth
@@ -31,4 +34,8 @@ api_router.include_router(admin_category_router)
 api_router.include_router(order_router)
 api_router.include_router(admin_order_router)
 #Public
-api_router.include_router(public_router)
\ No newline at end of file
+api_router.include_router(public_router)
+api_router.include_router(catalog_router)
+#Monitoring
+api_router.include_router(metrics_router)
+api_router.include_router(admin_monitoring_router)
\ No newline at end of file
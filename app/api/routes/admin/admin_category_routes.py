@@ -8,12 +8,14 @@ from app.schemas.category import CategoryCreateRequest
 from app.services.category.category import create_category, delete_category, update_categpry_id
 from app.dependencies.admin import is_admin
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 
 admin_category_router = APIRouter(
     prefix="/categories",
     tags=["Categories"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
 
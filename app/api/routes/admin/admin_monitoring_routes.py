@@ -0,0 +1,130 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+from app.core.bulkhead import bulkheads
+from app.core.database import engine, pool_status, replica_set
+from app.core.profiling import list_profiles, profile_path, render_profile
+from app.core.slow_queries import slow_query_recorder
+from app.core.settings import get_settings
+from app.models.user.user import User
+from app.responses.monitoring import BulkheadStatusResponse, PoolStatusResponse, ReplicaStatusResponse, SlowQueryResponse
+from app.dependencies.admin import is_admin
+from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
+
+
+settings = get_settings()
+
+
+admin_monitoring_router = APIRouter(
+    prefix="/admin",
+    tags=["Monitoring"],
+    responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
+)
+
+
+@admin_monitoring_router.get("/profiles", response_model=List[str])
+async def fetch_profiles(current_user: User = Depends(get_current_user), user=Depends(is_admin)):
+    """
+    Lista los perfiles guardados, del más reciente al más antiguo.
+
+    Returns:
+       - List[str]: Identificadores de los perfiles.
+    """
+    return list_profiles(settings.PROFILE_DIR)
+
+
+@admin_monitoring_router.get("/profiles/{profile_id}")
+async def fetch_profile(
+    profile_id: str,
+    raw: bool = Query(False, description="Descarga el fichero .prof (para snakeviz o pstats)."),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    user=Depends(is_admin)
+):
+    """
+    Devuelve el árbol de llamadas de un perfil en texto, o el fichero .prof original.
+
+    Args:
+       - profile_id (str): Identificador devuelto en la cabecera `X-Profile-Id`.
+       - raw (bool): Si es True, descarga el fichero .prof.
+       - sort (str): Criterio de ordenación de las funciones.
+       - limit (int): Número máximo de funciones a mostrar.
+
+    Returns:
+       - PlainTextResponse | FileResponse: Informe del perfil o fichero original.
+
+    Raises:
+       - HTTPException 404: Si el perfil no existe.
+    """
+    path = profile_path(settings.PROFILE_DIR, profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado.")
+
+    if raw:
+        return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+    return PlainTextResponse(render_profile(path, sort, limit))
+
+
+@admin_monitoring_router.get("/slow-queries", response_model=List[SlowQueryResponse])
+async def fetch_slow_queries(
+    sort: str = Query("max_ms", pattern="^(max_ms|total_ms|count)$"),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    user=Depends(is_admin)
+):
+    """
+    Lista las consultas más lentas registradas por este worker, con su plan de ejecución.
+
+    El histórico completo de todos los workers está en SLOW_QUERY_LOG_FILE.
+
+    Args:
+       - sort (str): Ordenación por duración máxima, tiempo acumulado o número de ejecuciones.
+       - limit (int): Número máximo de consultas a devolver.
+
+    Returns:
+       - List[SlowQueryResponse]: Consultas lentas agrupadas por SQL normalizada.
+    """
+    return slow_query_recorder.worst(sort, limit)
+
+
+@admin_monitoring_router.get("/db/pool", response_model=List[PoolStatusResponse])
+async def fetch_pool_status(current_user: User = Depends(get_current_user), user=Depends(is_admin)):
+    """
+    Estado actual de los pools de conexiones de este worker (primario y réplicas). En modo
+    PgBouncer no hay pools en la aplicación y la lista está vacía.
+
+    Returns:
+       - List[PoolStatusResponse]: Conexiones libres, en uso y de desbordamiento de cada pool.
+    """
+    engines = [("primary", engine)] + [(replica.name, replica.engine) for replica in replica_set.replicas]
+    return [
+        {"pool": name, **status}
+        for name, status in ((name, pool_status(app_engine)) for name, app_engine in engines)
+        if status is not None
+    ]
+
+
+@admin_monitoring_router.get("/db/replicas", response_model=List[ReplicaStatusResponse])
+async def fetch_replicas(current_user: User = Depends(get_current_user), user=Depends(is_admin)):
+    """
+    Estado de las réplicas de lectura según la última medición de retraso de este worker.
+
+    Returns:
+       - List[ReplicaStatusResponse]: Retraso y disponibilidad de cada réplica.
+    """
+    return replica_set.status()
+
+
+@admin_monitoring_router.get("/bulkheads", response_model=List[BulkheadStatusResponse])
+async def fetch_bulkheads(current_user: User = Depends(get_current_user), user=Depends(is_admin)):
+    """
+    Ocupación actual de los pools de hilos de los servicios de este worker.
+
+    Returns:
+       - List[BulkheadStatusResponse]: Hilos ocupados, llamadas en espera y utilización de cada pool.
+    """
+    return [bulkhead.status() for bulkhead in bulkheads.values()]
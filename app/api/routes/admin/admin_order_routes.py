@@ -6,36 +6,40 @@ from app.responses.order import OrderResponse
 from sqlalchemy.orm import Session
 from app.schemas.order import OrderStatusUpdateRequest
 from app.services.order.order import delete_user_order, fetch_all_order, fetch_order_id, patch_delete_order, update_order
-from app.dependencies.admin import is_admin
+from app.dependencies.admin import get_admin_session, is_admin
+from app.dependencies.fields import order_fields
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 admin_order_router = APIRouter(
     prefix="/orders",
     tags=["Orders"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
    
 
 @admin_order_router.get("/orders/", response_model=List[OrderResponse])
-async def fetch_orders(session: Session = Depends(get_session), current_user: User = Depends(get_current_user),
-    user=Depends(is_admin)):
+async def fetch_orders(session: Session = Depends(get_admin_session), current_user: User = Depends(get_current_user),
+    user=Depends(is_admin), fields=Depends(order_fields)):
     """
     Obtiene una lista de todos los pedidos registrados.
 
     Args:
        - session (Session): Sesión de base de datos obtenida mediante inyección de dependencias.
+       - fields: Campos a devolver (`?fields=id,status,total_price`); por defecto, todos.
 
     Returns:
        - List[OrderResponse]: Lista de pedidos registrados.
     """
-    return await fetch_all_order(session)
+    return await fetch_all_order(session, fields)
 
 
 
 @admin_order_router.get("/{order_id}", status_code=status.HTTP_200_OK, response_model=OrderResponse)
-async def fetch_order_detail_id(order_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user), user=Depends(is_admin)
-    ):
+async def fetch_order_detail_id(order_id: int, session: Session = Depends(get_admin_session), current_user: User = Depends(get_current_user), user=Depends(is_admin),
+    fields=Depends(order_fields)):
 
     """
     Obtiene los detalles de un pedido específico por su ID.
@@ -43,12 +47,13 @@ async def fetch_order_detail_id(order_id: int, session: Session = Depends(get_se
     Args:
        - order_id (int): ID del pedido a consultar.
        - session (Session): Sesión de base de datos obtenida mediante inyección de dependencias.
+       - fields: Campos a devolver (`?fields=`); por defecto, todos.
 
     Returns:
        - OrderResponse: Información del pedido solicitado.
     """    
 
-    return await fetch_order_id(order_id, session)
+    return await fetch_order_id(order_id, session, fields)
 
 
 
@@ -1,18 +1,23 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.orm import Session
+from app.core.bulkhead import iterate_in_thread
 from app.core.database import get_session
 from app.models.user.user import User
-from app.responses.product import ProductResponse
-from app.schemas.product import ProductCreateRequest, ProductUpdateRequest
-from app.services.product.product import create_product, delete_product, update_product
+from app.responses.product import ProductBulkUpdateResponse, ProductImportResponse, ProductResponse
+from app.schemas.product import ProductBulkUpdateRequest, ProductCreateRequest, ProductUpdateRequest
+from app.services.product.product import bulk_update_products, create_product, delete_product, update_product
+from app.services.product.product_import import detect_import_format, import_products
 from app.dependencies.admin import is_admin
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 
 admin_product_router = APIRouter(
     prefix="/products",
     tags=["Products"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -37,6 +42,54 @@ async def create_product_route(data: ProductCreateRequest,
     return await create_product(session, data)
 
 
+@admin_product_router.post("/import", response_model=ProductImportResponse, status_code=status.HTTP_200_OK)
+async def import_products_route(
+    request: Request,
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+    user=Depends(is_admin)
+):
+    """
+    Importa productos de forma masiva desde el cuerpo de la petición (CSV o NDJSON).
+
+    El formato se toma del parámetro `format` o, si no se indica, del Content-Type
+    (`text/csv` o `application/x-ndjson`). El cuerpo se procesa en streaming.
+
+    Args:
+       - request (Request): Petición cuyo cuerpo contiene los productos.
+       - file_format (str, opcional): Formato del contenido, "csv" o "ndjson".
+       - session (Session): Sesión de base de datos obtenida mediante inyección de dependencias.
+       - user: Usuario autenticado con permisos de administrador.
+
+    Returns:
+       - ProductImportResponse: Resumen de la importación con los errores por fila.
+    """
+    file_format = file_format or detect_import_format(request.headers.get("content-type"))
+    return await import_products(session, iterate_in_thread(request.stream()), file_format)
+
+
+@admin_product_router.patch("/bulk", response_model=ProductBulkUpdateResponse, status_code=status.HTTP_200_OK)
+async def bulk_update_products_route(
+    data: ProductBulkUpdateRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+    user=Depends(is_admin)
+):
+    """
+    Actualiza el precio y/o el stock de muchos productos en una sola petición.
+
+    Args:
+       - data (ProductBulkUpdateRequest): Lista de cambios por ID de producto.
+       - session (Session): Sesión de base de datos obtenida mediante inyección de dependencias.
+       - user: Usuario autenticado con permisos de administrador.
+
+    Returns:
+       - ProductBulkUpdateResponse: Resultado de la actualización para cada ID.
+    """
+    return await bulk_update_products(session, data.items)
+
+
 @admin_product_router.put("/products/{product_id}", response_model=ProductResponse)
 async def update_product_route(
     product_id: int,
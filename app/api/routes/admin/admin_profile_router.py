@@ -5,14 +5,16 @@ from app.core.database import get_session
 from app.models.user.user import User
 from app.responses.user_profile import UserProfileDeleteResponse, UserProfileResponse
 from app.services import user_profile
-from app.dependencies.admin import is_admin
+from app.dependencies.admin import get_admin_session, is_admin
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 
 admin_profile_router = APIRouter(
     prefix="/users/profile", 
     tags=["User Profile"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -20,7 +22,7 @@ admin_profile_router = APIRouter(
 @admin_profile_router.get("/{user_id}", status_code=status.HTTP_200_OK, response_model=UserProfileResponse)
 async def fetch_user_profile_detail(
     user_id: int, 
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_admin_session),
     current_user: User = Depends(get_current_user),
     user=Depends(is_admin)
     ):
@@ -6,11 +6,13 @@ from app.responses.user import UserDeleteResponse, UserResponse
 from app.services.user import delete_user_account, fetch_user_detail
 from app.dependencies.admin import is_admin
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 admin_user_router = APIRouter(
     prefix="/users",
     tags=["Users"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
 
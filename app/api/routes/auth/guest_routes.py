@@ -6,15 +6,18 @@ from app.services import user
 from app.core.database import get_session
 from app.schemas.user import  EmailRequest, ResetRequest
 from app.responses.user import LoginResponse
+from app.core.timing import TimedRoute
+from app.dependencies.rate_limit import forgot_password_rate_limit, login_rate_limit
 
 
 guest_router = APIRouter(
     prefix="/auth",
     tags=["Auth"],
     responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
-@guest_router.post("/login", status_code=status.HTTP_200_OK, response_model=LoginResponse)
+@guest_router.post("/login", status_code=status.HTTP_200_OK, response_model=LoginResponse, dependencies=[Depends(login_rate_limit)])
 async def user_login(data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
     """
     Iniciar sesión de usuario.
@@ -49,7 +52,7 @@ async def refresh_token(refresh_token=Header(), session: Session = Depends(get_s
     
     return await user.get_refresh_token(refresh_token, session)
 
-@guest_router.post("/forgot-password", status_code=status.HTTP_200_OK)
+@guest_router.post("/forgot-password", status_code=status.HTTP_200_OK, dependencies=[Depends(forgot_password_rate_limit)])
 async def forgot_password(data: EmailRequest, background_tasks: BackgroundTasks, session: Session = Depends(get_session)):
     """
     Solicitar un enlace de restablecimiento de contraseña.
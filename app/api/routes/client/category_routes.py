@@ -2,16 +2,19 @@ from typing import List
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from app.core.database import get_session
+from app.dependencies.database import get_read_session
 from app.models.user.user import User
 from app.responses.category import  CategoryResponse
 from app.services.category.category import fetch_all_category, fetch_category_id
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 
 category_router = APIRouter(
     prefix="/categories",
     tags=["Categories"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
   
@@ -33,7 +36,7 @@ async def fetch_category_detail_id(category_id: int, session: Session = Depends(
 
     
 @category_router.get("/categories/", response_model=List[CategoryResponse])
-async def fetch_categories(session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def fetch_categories(session: Session = Depends(get_read_session), current_user: User = Depends(get_current_user)):
     """
     Obtiene una lista de todas las categorías registradas.
 
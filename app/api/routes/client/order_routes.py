@@ -7,11 +7,13 @@ from sqlalchemy.orm import Session
 from app.schemas.order import CreateOrderRequest
 from app.services.order.order import create_order, fetch_all_order, fetch_order_id, fetch_user_orders, patch_delete_order, update_order
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 order_router = APIRouter(
     prefix="/orders",
     tags=["Orders"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
 
@@ -39,7 +41,8 @@ async def fetch_order_user(
 orders=Depends(fetch_user_orders)
 ):
     """
-    Permite que un usuario autenticado obtenga sus pedidos.
+    Permite que un usuario autenticado obtenga sus pedidos. Admite `?fields=id,status,total_price`
+    para devolver solo esos campos.
 
     Args:
        - user (User): El usuario autenticado. Se obtiene mediante la inyección de dependencias usando el `Depends(get_current_user)`.
@@ -2,43 +2,63 @@ from typing import List
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from app.core.database import get_session
-from app.responses.product import ProductResponse
-from app.services.product.product import fetch_all_products, fetch_product_id
+from app.dependencies.database import get_read_session
+from app.dependencies.fields import product_fields
+from app.responses.product import ProductBatchResponse, ProductResponse
+from app.schemas.product import ProductBatchRequest
+from app.services.product.product import fetch_all_products, fetch_product_id, fetch_products_by_ids
+from app.core.timing import TimedRoute
 
 
 product_router = APIRouter(
     prefix="/products",
     tags=["Products"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
 
 @product_router.get("/{product_id}", status_code=status.HTTP_200_OK, response_model=ProductResponse)
-async def fetch_product_info_id(product_id: int, session: Session = Depends(get_session)):
+async def fetch_product_info_id(product_id: int, session: Session = Depends(get_session), fields=Depends(product_fields)):
     """
     Obtiene los detalles de un producto específico por su ID.
 
     Args:
        - product_id (int): ID del producto a consultar.
        - session (Session): Sesión de base de datos obtenida mediante inyección de dependencias.
+       - fields: Campos a devolver (`?fields=id,name,price`); por defecto, todos.
 
     Returns:
        - ProductResponse: Información del producto solicitado.
     """    
-    return await fetch_product_id(product_id, session)
+    return await fetch_product_id(product_id, session, fields)
 
     
 @product_router.get("/products/", response_model=List[ProductResponse])
-async def fetch_products(session: Session = Depends(get_session)):
+async def fetch_products(session: Session = Depends(get_read_session), fields=Depends(product_fields)):
     """
     Obtiene la lista de todos los productos disponibles.
 
     Args:
        - session (Session): Sesión de base de datos obtenida mediante inyección de dependencias.
+       - fields: Campos a devolver (`?fields=id,name,price`); por defecto, todos.
 
     Returns:
        - List[ProductResponse]: Lista de productos registrados.
     """
-    return await fetch_all_products(session)
+    return await fetch_all_products(session, fields)
 
-    
+
+@product_router.post("/batch", status_code=status.HTTP_200_OK, response_model=ProductBatchResponse)
+async def fetch_products_batch(data: ProductBatchRequest, session: Session = Depends(get_session)):
+    """
+    Obtiene varios productos en una sola petición (carrito, detalle de pedido...).
+
+    Args:
+       - data (ProductBatchRequest): IDs de los productos a consultar.
+       - session (Session): Sesión de base de datos obtenida mediante inyección de dependencias.
+
+    Returns:
+       - ProductBatchResponse: Productos encontrados en el orden solicitado e IDs que no existen.
+    """
+    return await fetch_products_by_ids(data.ids, session)
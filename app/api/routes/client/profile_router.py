@@ -7,12 +7,14 @@ from app.responses.user_profile import UserProfileResponse
 from app.schemas.user_profile import UserProfileRequest, UserProfileUpdateAdressRequest
 from app.services.user_profile import create_user_profile, get_user_profile, update_user_address, update_user_profile
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 
 profile_router = APIRouter(
     prefix="/users/profile", 
     tags=["User Profile"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=TimedRoute,
 )
 
 
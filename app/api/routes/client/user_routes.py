@@ -7,11 +7,13 @@ from app.schemas.user import  RegisterUserRequest, VerifyUserRequest
 from app.services.user import activate_user_account, create_user_account, fetch_user_detail, update_user_account
 from app.dependencies.admin import is_admin
 from app.dependencies.user import get_current_user
+from app.core.timing import TimedRoute
 
 user_router = APIRouter(
     prefix="/users",
     tags=["Users"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
 @user_router.post("", status_code= status.HTTP_201_CREATED, response_model=UserResponse)
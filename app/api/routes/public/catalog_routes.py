@@ -0,0 +1,62 @@
+import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from app.core.compression import choose_encoding
+from app.core.settings import get_settings
+from app.core.timing import TimedRoute
+from app.services.catalog.snapshot import VARIANTS, current_snapshot
+
+
+settings = get_settings()
+
+
+catalog_router = APIRouter(
+    prefix="/catalog",
+    tags=["Catalog"],
+    responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
+)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@catalog_router.get("/snapshot")
+async def fetch_catalog_snapshot(request: Request):
+    """
+    Catálogo completo (categorías y productos) desde la última instantánea estática.
+
+    El fichero se envía con sendfile sin consultar la base de datos ni serializar nada,
+    en su variante precomprimida si el cliente la acepta. El ETag es fuerte (versión del
+    contenido y codificación) y con `If-None-Match` se responde 304.
+
+    Returns:
+       - FileResponse: JSON del catálogo, o 304 si el cliente ya tiene esta versión.
+    """
+    snapshot = current_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No hay instantánea del catálogo.")
+    version, path = snapshot
+
+    encoding = None
+    accepted = choose_encoding(request.headers.get("accept-encoding", ""))
+    for suffix, variant in VARIANTS:
+        if variant == accepted and os.path.exists(path + suffix):
+            encoding, path = variant, path + suffix
+            break
+
+    # Cada codificación es una representación distinta y necesita su propio ETag fuerte
+    etag = f'"{version}-{encoding}"' if encoding else f'"{version}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.CATALOG_SNAPSHOT_MAX_AGE}",
+        "Vary": "Accept-Encoding"
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(path, media_type="application/json", headers=headers)
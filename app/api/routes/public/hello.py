@@ -1,10 +1,12 @@
 from fastapi import APIRouter
+from app.core.timing import TimedRoute
 
 
 public_router = APIRouter(
     prefix="/index",
     tags=["Public"],
     responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
 )
 
 @public_router.get("/")
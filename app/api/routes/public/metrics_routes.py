@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.settings import get_settings
+from app.core.timing import TimedRoute
+
+
+settings = get_settings()
+
+
+metrics_router = APIRouter(
+    tags=["Monitoring"],
+    responses={404: {"description": "Not Found"}},
+    route_class=TimedRoute,
+)
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Exporta las métricas en formato de texto de Prometheus, agregadas entre todos los workers.
+    """
+    return Response(content=registry.render(settings.METRICS_DIR or None), media_type=CONTENT_TYPE)
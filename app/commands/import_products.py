@@ -0,0 +1,50 @@
+"""
+Importa productos de forma masiva desde un fichero CSV o NDJSON.
+
+Uso:
+    python -m app.commands.import_products productos.csv
+    python -m app.commands.import_products productos.ndjson --format ndjson
+"""
+import argparse
+import asyncio
+import json
+import sys
+from fastapi.responses import JSONResponse
+from app.core.database import SessionLocal
+from app.services.product.product_import import CSV_FORMAT, NDJSON_FORMAT, detect_import_format, import_products
+
+
+def _read_file(path: str, chunk_size: int = 1 << 20):
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importa productos desde un fichero CSV o NDJSON.")
+    parser.add_argument("path", help="Ruta del fichero a importar.")
+    parser.add_argument("--format", dest="file_format", choices=[CSV_FORMAT, NDJSON_FORMAT],
+                        help="Formato del fichero. Por defecto se deduce de la extensión.")
+    args = parser.parse_args(argv)
+
+    file_format = args.file_format or detect_import_format(filename=args.path)
+
+    session = SessionLocal()
+    try:
+        result = asyncio.run(import_products(session, _read_file(args.path), file_format))
+    finally:
+        session.close()
+
+    if isinstance(result, JSONResponse):
+        print(result.body.decode(), file=sys.stderr)
+        return 1
+
+    print(json.dumps(result.model_dump(), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
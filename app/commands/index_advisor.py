@@ -0,0 +1,205 @@
+"""
+Sugiere índices que faltan a partir de las estadísticas de PostgreSQL.
+
+Combina tres fuentes:
+    - Claves foráneas sin un índice que empiece por sus columnas.
+    - `pg_stat_user_tables`: tablas grandes leídas sobre todo con escaneos secuenciales.
+    - `pg_stat_statements`: columnas filtradas o unidas en las consultas que más tiempo
+      consumen y que no encabezan ningún índice. Si la consulta filtra `deleted_at IS NULL`
+      se propone un índice parcial.
+
+Solo informa: no crea ningún índice. Requiere la extensión pg_stat_statements para el
+análisis de consultas (si no está instalada, se omite esa parte).
+
+Uso:
+    python -m app.commands.index_advisor
+    python -m app.commands.index_advisor --limit 50 --min-calls 100 --json
+"""
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+
+MIN_TABLE_ROWS = 1000
+
+UNINDEXED_FOREIGN_KEYS_SQL = """
+    SELECT c.conrelid::regclass::text AS table_name,
+           array_agg(a.attname ORDER BY k.ordinality) AS columns
+    FROM pg_constraint AS c
+    CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, ordinality)
+    JOIN pg_attribute AS a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+    WHERE c.contype = 'f'
+      AND c.connamespace = 'public'::regnamespace
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_index AS i
+          WHERE i.indrelid = c.conrelid
+            AND (i.indkey::int2[])[0:array_length(c.conkey, 1) - 1] @> c.conkey
+      )
+    GROUP BY c.conrelid, c.conname
+"""
+
+TABLE_STATS_SQL = """
+    SELECT relname, seq_scan, seq_tup_read, COALESCE(idx_scan, 0) AS idx_scan, n_live_tup, n_dead_tup
+    FROM pg_stat_user_tables
+    WHERE schemaname = 'public'
+"""
+
+INDEXED_COLUMNS_SQL = """
+    SELECT t.relname AS table_name, a.attname AS column_name
+    FROM pg_index AS i
+    JOIN pg_class AS t ON t.oid = i.indrelid
+    JOIN pg_namespace AS n ON n.oid = t.relnamespace
+    JOIN pg_attribute AS a ON a.attrelid = t.oid AND a.attnum = i.indkey[0]
+    WHERE n.nspname = 'public'
+"""
+
+STATEMENTS_SQL = """
+    SELECT query, calls, total_exec_time, mean_exec_time, rows
+    FROM pg_stat_statements
+    WHERE calls >= :min_calls
+    ORDER BY total_exec_time DESC
+    LIMIT :limit
+"""
+
+_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)\s+AS\s+(\w+)", re.IGNORECASE)
+_PREDICATE = re.compile(r"\b(\w+)\.(\w+)\s*(?:=|IN\b|>=|<=|>|<|= ANY)", re.IGNORECASE)
+_JOIN_PREDICATE = re.compile(r"=\s*(\w+)\.(\w+)")
+_LIVE_FILTER = re.compile(r"\b(\w+)\.deleted_at IS NULL", re.IGNORECASE)
+
+
+def extract_predicates(query: str) -> Tuple[Set[Tuple[str, str]], Set[str]]:
+    """
+    Extrae las columnas (tabla, columna) usadas en filtros y joins de una consulta, y
+    las tablas filtradas por `deleted_at IS NULL`. Resuelve los alias `tabla AS alias`
+    que genera SQLAlchemy (por ejemplo `order_items_1`).
+    """
+    aliases = {alias: table for table, alias in _ALIAS.findall(query)}
+    conditions = re.split(r"\b(?:WHERE|ON)\b", query, flags=re.IGNORECASE)[1:]
+
+    columns = set()
+    for condition in conditions:
+        for alias, column in _PREDICATE.findall(condition) + _JOIN_PREDICATE.findall(condition):
+            if column == "deleted_at":
+                continue
+            columns.add((aliases.get(alias, alias), column))
+
+    live_tables = {aliases.get(alias, alias) for alias in _LIVE_FILTER.findall(query)}
+    return columns, live_tables
+
+
+def index_statement(table: str, columns: List[str], live_only: bool = False) -> str:
+    name = f"ix_{table}_{'_'.join(columns)}{'_live' if live_only else ''}"
+    where = " WHERE deleted_at IS NULL" if live_only else ""
+    return f"CREATE INDEX CONCURRENTLY {name} ON {table} ({', '.join(columns)}){where};"
+
+
+def advise(session, limit: int = 20, min_calls: int = 10) -> Dict[str, list]:
+    suggestions = {"foreign_keys": [], "tables": [], "statements": [], "warnings": []}
+
+    for table, columns in session.execute(text(UNINDEXED_FOREIGN_KEYS_SQL)):
+        suggestions["foreign_keys"].append({
+            "table": table,
+            "columns": list(columns),
+            "suggestion": index_statement(table, list(columns))
+        })
+
+    tables = {}
+    for row in session.execute(text(TABLE_STATS_SQL)).mappings():
+        tables[row["relname"]] = dict(row)
+        if row["n_live_tup"] < MIN_TABLE_ROWS or row["seq_scan"] <= row["idx_scan"]:
+            continue
+        suggestions["tables"].append({
+            "table": row["relname"],
+            "seq_scan": row["seq_scan"],
+            "idx_scan": row["idx_scan"],
+            "avg_rows_per_seq_scan": row["seq_tup_read"] // max(row["seq_scan"], 1),
+            "live_rows": row["n_live_tup"],
+            "dead_rows": row["n_dead_tup"]
+        })
+
+    indexed: Dict[str, Set[str]] = defaultdict(set)
+    for table, column in session.execute(text(INDEXED_COLUMNS_SQL)):
+        indexed[table].add(column)
+
+    try:
+        with session.begin_nested():
+            statements = session.execute(text(STATEMENTS_SQL), {"limit": limit, "min_calls": min_calls}).mappings().all()
+    except Exception:
+        suggestions["warnings"].append(
+            "pg_stat_statements no está disponible: añade shared_preload_libraries = 'pg_stat_statements' "
+            "y ejecuta CREATE EXTENSION pg_stat_statements."
+        )
+        return suggestions
+
+    proposed = set()
+    for statement in statements:
+        columns, live_tables = extract_predicates(statement["query"])
+        for table, column in sorted(columns):
+            if table not in tables or column in indexed[table] or (table, column) in proposed:
+                continue
+            proposed.add((table, column))
+            suggestions["statements"].append({
+                "table": table,
+                "column": column,
+                "calls": statement["calls"],
+                "mean_ms": round(statement["mean_exec_time"], 3),
+                "total_ms": round(statement["total_exec_time"], 3),
+                "query": " ".join(statement["query"].split())[:300],
+                "suggestion": index_statement(table, [column], live_only=table in live_tables)
+            })
+
+    return suggestions
+
+
+def _print_report(suggestions: Dict[str, list]):
+    print("== Claves foráneas sin índice ==")
+    for item in suggestions["foreign_keys"] or [{"suggestion": "(ninguna)"}]:
+        print(f"  {item['suggestion']}")
+
+    print("\n== Tablas con más escaneos secuenciales que por índice ==")
+    for item in suggestions["tables"] or [None]:
+        if item is None:
+            print("  (ninguna)")
+            continue
+        print(f"  {item['table']}: {item['seq_scan']} seq / {item['idx_scan']} idx, "
+              f"{item['avg_rows_per_seq_scan']} filas por escaneo, {item['live_rows']} vivas, {item['dead_rows']} muertas")
+
+    print("\n== Columnas filtradas sin índice (pg_stat_statements) ==")
+    for item in suggestions["statements"] or [None]:
+        if item is None:
+            print("  (ninguna)")
+            continue
+        print(f"  {item['suggestion']}")
+        print(f"      {item['calls']} llamadas, media {item['mean_ms']} ms: {item['query']}")
+
+    for warning in suggestions["warnings"]:
+        print(f"\nAviso: {warning}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Sugiere índices a partir de las estadísticas de PostgreSQL.")
+    parser.add_argument("--limit", type=int, default=20, help="Número de consultas de pg_stat_statements a analizar.")
+    parser.add_argument("--min-calls", type=int, default=10, help="Llamadas mínimas para analizar una consulta.")
+    parser.add_argument("--json", action="store_true", help="Muestra el resultado en JSON.")
+    args = parser.parse_args(argv)
+
+    session = SessionLocal()
+    try:
+        suggestions = advise(session, args.limit, args.min_calls)
+    finally:
+        session.close()
+
+    if args.json:
+        print(json.dumps(suggestions, indent=2, ensure_ascii=False, default=str))
+    else:
+        _print_report(suggestions)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
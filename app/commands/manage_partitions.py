@@ -0,0 +1,55 @@
+"""
+Mantenimiento de las particiones mensuales de pedidos y artículos.
+
+    - create: crea las particiones de los próximos meses (ORDER_PARTITION_MONTHS_AHEAD).
+    - archive: separa las particiones más antiguas que ORDER_PARTITION_RETENTION_MONTHS,
+      las vuelca a CSV comprimido y las elimina.
+
+Sin subcomando ejecuta ambos; pensado para lanzarse a diario desde cron.
+
+Uso:
+    python -m app.commands.manage_partitions
+    python -m app.commands.manage_partitions create --months-ahead 6
+    python -m app.commands.manage_partitions archive --retention-months 24 --archive-dir /backups/orders
+"""
+import argparse
+import json
+import logging
+import sys
+from app.core.database import SessionLocal
+from app.core.settings import get_settings
+from app.services.maintenance.partitions import archive_old_partitions, ensure_partitions
+
+
+settings = get_settings()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Crea y archiva las particiones de pedidos.")
+    parser.add_argument("action", nargs="?", choices=["create", "archive", "all"], default="all")
+    parser.add_argument("--months-ahead", type=int, default=settings.ORDER_PARTITION_MONTHS_AHEAD,
+                        help="Meses futuros con partición creada.")
+    parser.add_argument("--retention-months", type=int, default=settings.ORDER_PARTITION_RETENTION_MONTHS,
+                        help="Meses que se conservan en la base de datos (0 no archiva nada).")
+    parser.add_argument("--archive-dir", default=settings.ORDER_PARTITION_ARCHIVE_DIR or None,
+                        help="Directorio de los ficheros archivados.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    result = {}
+    session = SessionLocal()
+    try:
+        if args.action in ("create", "all"):
+            result["created"] = ensure_partitions(session, args.months_ahead)
+        if args.action in ("archive", "all"):
+            result["archived"] = archive_old_partitions(session, args.retention_months, args.archive_dir)
+    finally:
+        session.close()
+
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
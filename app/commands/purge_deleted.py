@@ -0,0 +1,50 @@
+"""
+Purga física de las filas eliminadas lógicamente con más antigüedad que la retención.
+
+Uso:
+    python -m app.commands.purge_deleted
+    python -m app.commands.purge_deleted --retention-days 30 --batch-size 1000 --archive-dir /backups/purge
+    python -m app.commands.purge_deleted --dry-run
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timedelta
+from app.core.database import SessionLocal
+from app.core.settings import get_settings
+from app.services.maintenance.purge import count_purgeable, purge_soft_deleted
+
+
+settings = get_settings()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Purga las filas eliminadas lógicamente.")
+    parser.add_argument("--retention-days", type=int, default=settings.PURGE_RETENTION_DAYS,
+                        help="Días que se conservan las filas eliminadas.")
+    parser.add_argument("--batch-size", type=int, default=settings.PURGE_BATCH_SIZE, help="Filas por lote.")
+    parser.add_argument("--pause", type=float, default=settings.PURGE_BATCH_PAUSE, help="Segundos entre lotes.")
+    parser.add_argument("--archive-dir", default=settings.PURGE_ARCHIVE_DIR or None,
+                        help="Guarda las filas borradas en NDJSON comprimido en este directorio.")
+    parser.add_argument("--dry-run", action="store_true", help="Solo cuenta las filas que se purgarían.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    session = SessionLocal()
+    try:
+        if args.dry_run:
+            cutoff = datetime.now() - timedelta(days=args.retention_days)
+            result = count_purgeable(session, cutoff)
+        else:
+            result = purge_soft_deleted(session, args.retention_days, args.batch_size, args.pause, args.archive_dir)
+    finally:
+        session.close()
+
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+from starlette.routing import Match
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+class AdmissionLimiter:
+    """
+    Límite de peticiones en curso con una cola de espera acotada y prioridades.
+
+    Hasta `limit` peticiones se ejecutan a la vez; las siguientes esperan en una cola
+    de como mucho `max_queue` entradas, de la que sale primero la de menor `priority`
+    (y, a igual prioridad, la más antigua). Con la cola llena, o tras `timeout` segundos
+    de espera, `acquire` devuelve False y la petición se rechaza.
+
+    Se usa desde el event loop (middleware), así que no necesita bloqueos.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int, timeout: float) -> bool:
+        if self.active < self.limit and not self.queued:
+            self.active += 1
+            return True
+        if self.queued >= self.max_queue:
+            return False
+
+        if len(self._waiters) > 2 * self.max_queue:
+            # Se descartan las esperas ya vencidas que siguen en el montículo
+            self._waiters = [waiter for waiter in self._waiters if not waiter[2].done()]
+            heapq.heapify(self._waiters)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            # release() transfiere la plaza al resolver el future
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # La plaza llegó justo al vencer la espera: se devuelve
+                self.release()
+            future.cancel()
+            return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            future.cancel()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """
+    Control de admisión del worker: un límite global y uno por grupo de rutas.
+
+    Cada petición ocupa primero una plaza de su grupo (aislando, por ejemplo, los informes
+    de administración del resto) y después una plaza global, repartida por prioridad.
+    """
+
+    def __init__(self, global_limit: int, groups: dict, max_queue: int, timeout: float):
+        self.timeout = timeout
+        self.global_limiter = AdmissionLimiter("global", global_limit, max_queue)
+        self.groups = {
+            name: (AdmissionLimiter(name, limit, max_queue), priority)
+            for name, (limit, priority) in groups.items()
+        }
+        for name, (limiter, _) in self.groups.items():
+            ADMISSION_IN_FLIGHT.set_function(lambda limiter=limiter: limiter.active, name)
+        ADMISSION_IN_FLIGHT.set_function(lambda: self.global_limiter.active, "global")
+
+    async def admit(self, group: str) -> Optional[Tuple[AdmissionLimiter, ...]]:
+        """
+        Reserva las plazas de una petición del grupo indicado.
+
+        Returns:
+           - tuple | None: Limitadores a liberar al terminar, o None si la petición se rechaza.
+        """
+        limiter, priority = self.groups[group]
+        start = time.perf_counter()
+
+        if not await limiter.acquire(priority, self.timeout):
+            ADMISSION_REJECTED.inc(group)
+            return None
+
+        remaining = max(self.timeout - (time.perf_counter() - start), 0)
+        if not await self.global_limiter.acquire(priority, remaining):
+            limiter.release()
+            ADMISSION_REJECTED.inc(group)
+            return None
+
+        ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - start, group)
+        return (self.global_limiter, limiter)
+
+    @staticmethod
+    def release(limiters: Tuple[AdmissionLimiter, ...]):
+        for limiter in limiters:
+            limiter.release()
+
+
+# Grupos de rutas: (límite de peticiones en curso, prioridad; menor pasa antes)
+ROUTE_GROUPS = {
+    "orders": (settings.ADMISSION_LIMIT_ORDERS, 0),
+    "auth": (settings.ADMISSION_LIMIT_AUTH, 1),
+    "default": (settings.ADMISSION_MAX_CONCURRENCY, 2),
+    "catalog": (settings.ADMISSION_LIMIT_CATALOG, 3),
+    "admin": (settings.ADMISSION_LIMIT_ADMIN, 4),
+}
+
+ROUTE_PREFIXES = (
+    ("/orders", "orders"),
+    ("/auth", "auth"),
+    ("/products", "catalog"),
+    ("/categories", "catalog"),
+    ("/catalog", "catalog"),
+)
+
+
+def route_group(route) -> str:
+    """
+    Grupo de una ruta: las de `app/api/routes/admin` son de administración aunque
+    compartan prefijo con las de cliente (`/orders`, `/products`...); el resto, por prefijo.
+    """
+    if route is None:
+        return "default"
+    if ".routes.admin." in getattr(getattr(route, "endpoint", None), "__module__", ""):
+        return "admin"
+    for prefix, group in ROUTE_PREFIXES:
+        if getattr(route, "path", "").startswith(prefix):
+            return group
+    return "default"
+
+
+def match_route(routes, scope):
+    """
+    Devuelve la ruta que atenderá la petición, como hace el router de Starlette.
+    """
+    partial = None
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+        if match == Match.PARTIAL and partial is None:
+            partial = route
+    return partial
+
+
+admission_controller = AdmissionController(
+    settings.ADMISSION_MAX_CONCURRENCY,
+    ROUTE_GROUPS,
+    max_queue=settings.ADMISSION_QUEUE_SIZE,
+    timeout=settings.ADMISSION_QUEUE_TIMEOUT
+)
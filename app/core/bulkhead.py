@@ -0,0 +1,136 @@
+import functools
+import time
+from typing import AsyncIterator, Dict, Iterator, Optional
+import anyio
+import anyio.from_thread
+import anyio.to_thread
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.core.metrics import BULKHEAD_ACTIVE, BULKHEAD_QUEUE_WAIT, BULKHEAD_QUEUED, BULKHEAD_REJECTED
+from app.core.profiling import profile_thread
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def _profiled(function, *args, **kwargs):
+    with profile_thread():
+        return function(*args, **kwargs)
+
+
+class Bulkhead:
+    """
+    Límite de concurrencia con nombre para los servicios de un subsistema.
+
+    Los servicios de cada subsistema (auth, catalog, orders, admin) son funciones
+    síncronas que se ejecutan en hilos de anyio, fuera del event loop, con un
+    `CapacityLimiter` propio de `max_workers` plazas: un informe de administración lento
+    ocupa como mucho las plazas de `admin` y no retrasa los pedidos. Si hay más de
+    `max_queue` llamadas esperando plaza, las nuevas se rechazan con 503.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+
+        BULKHEAD_ACTIVE.set_function(lambda: self.active, name)
+        BULKHEAD_QUEUED.set_function(lambda: self.queued, name)
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        # anyio elige la implementación según el event loop en marcha: se crea en el primer uso
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.max_workers)
+        return self._limiter
+
+    @property
+    def active(self) -> int:
+        return int(self._limiter.borrowed_tokens) if self._limiter is not None else 0
+
+    @property
+    def queued(self) -> int:
+        return self._limiter.statistics().tasks_waiting if self._limiter is not None else 0
+
+    def _call(self, submitted: float, function, args, kwargs):
+        BULKHEAD_QUEUE_WAIT.observe(time.perf_counter() - submitted, self.name)
+        return _profiled(function, *args, **kwargs)
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Ejecuta la función síncrona `function` en un hilo del bulkhead, con las ContextVar
+        de la petición (métricas SQL, Server-Timing, réplica, perfil...).
+        """
+        limiter = self.limiter
+        if limiter.available_tokens == 0 and limiter.statistics().tasks_waiting >= self.max_queue:
+            BULKHEAD_REJECTED.inc(self.name)
+            raise HTTPException(
+                status_code=503,
+                detail="Servicio saturado, inténtalo de nuevo en unos segundos.",
+                headers={"Retry-After": str(settings.BULKHEAD_RETRY_AFTER)}
+            )
+
+        call = functools.partial(self._call, time.perf_counter(), function, args, kwargs)
+        return await anyio.to_thread.run_sync(call, limiter=limiter)
+
+    def status(self) -> dict:
+        active = self.active
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "active": active,
+            "queued": self.queued,
+            "utilization": round(active / self.max_workers, 3)
+        }
+
+
+bulkheads: Dict[str, Bulkhead] = {
+    name: Bulkhead(name, max_workers, settings.BULKHEAD_MAX_QUEUE)
+    for name, max_workers in (
+        ("auth", settings.BULKHEAD_AUTH_WORKERS),
+        ("catalog", settings.BULKHEAD_CATALOG_WORKERS),
+        ("orders", settings.BULKHEAD_ORDERS_WORKERS),
+        ("admin", settings.BULKHEAD_ADMIN_WORKERS),
+    )
+}
+
+
+def bulkhead(name: str):
+    """
+    Decorador para las funciones de servicio bloqueantes: se ejecutan en un hilo del
+    bulkhead `name` en lugar de en el event loop. Devuelve una corrutina con la misma
+    firma, así que también sirve para los servicios usados como dependencias de FastAPI.
+
+    Con BULKHEADS_ENABLED desactivado la función se ejecuta en el pool de hilos común.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            if not settings.BULKHEADS_ENABLED:
+                return await run_in_threadpool(_profiled, function, *args, **kwargs)
+            return await bulkheads[name].run(function, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def iterate_in_thread(chunks: AsyncIterator[bytes]) -> Iterator[bytes]:
+    """
+    Recorre un flujo asíncrono (p. ej. `request.stream()`) desde un hilo del bulkhead:
+    cada elemento se pide al event loop y el hilo espera sin bloquear el loop.
+    """
+    iterator = chunks.__aiter__()
+    done = object()
+
+    async def _next():
+        try:
+            return await iterator.__anext__()
+        except StopAsyncIteration:
+            return done
+
+    while True:
+        chunk = anyio.from_thread.run(_next)
+        if chunk is done:
+            return
+        yield chunk
@@ -0,0 +1,221 @@
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+class CatalogCache:
+    """
+    Caché en memoria del catálogo (productos y categorías) de cada worker.
+
+    Las entradas se guardan agrupadas por espacio de nombres ("product", ...) y ya
+    convertidas a tipos básicos, de forma que se puedan devolver sin consultar la
+    base de datos. Todas las operaciones son accesos simples a un diccionario (atómicos
+    con el GIL), por lo que no necesitan bloqueos aunque los servicios se ejecuten en
+    varios hilos; los recorridos se hacen sobre una copia de las claves.
+
+    Las invalidaciones se propagan al resto de workers a través de `sync_dir`: cada
+    espacio de nombres tiene un fichero de versión cuya fecha de modificación se
+    actualiza al invalidar. Antes de leer, cada worker compara esa fecha con la última
+    que vio (como mucho una vez cada `sync_interval` segundos) y, si ha cambiado,
+    descarta sus entradas del espacio de nombres. Sin `sync_dir` (o en otro servidor)
+    una invalidación solo alcanza al worker que la hace y el resto puede servir datos
+    antiguos hasta `ttl`.
+
+    Para no guardar datos leídos antes de una invalidación, quien rellena la caché pide
+    `version()` antes de consultar la base de datos y la pasa a `set`/`set_many`: si el
+    espacio de nombres se ha invalidado entretanto, la escritura se descarta.
+
+    Atributos:
+        ttl (int): Segundos de validez de cada entrada.
+        max_entries (int): Número máximo de entradas antes de purgar la caché.
+        sync_dir (str, opcional): Ruta absoluta del directorio compartido con los ficheros de versión.
+        sync_interval (float): Segundos mínimos entre dos comprobaciones de los ficheros de versión.
+    """
+
+    # Fichero de versión que invalida todos los espacios de nombres
+    ALL = "_all"
+
+    def __init__(self, ttl: int, max_entries: int, sync_dir: Optional[str] = None, sync_interval: float = 0):
+        # Una ruta relativa dependería del directorio desde el que arranca cada worker
+        if sync_dir and not os.path.isabs(sync_dir):
+            raise ValueError(f"El directorio de sincronización de la caché debe ser absoluto: {sync_dir}")
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sync_dir = sync_dir or None
+        self.sync_interval = sync_interval
+        self._entries: Dict[Tuple[str, Any], Tuple[float, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._checked_at: Dict[str, float] = {}
+        # Contador de invalidaciones (locales o de otros workers) por espacio de nombres
+        self._generations: Dict[str, int] = {}
+
+    def _version_path(self, namespace: str) -> str:
+        return os.path.join(self.sync_dir, f"{namespace}.version")
+
+    def _read_version(self, namespace: str) -> int:
+        try:
+            return os.stat(self._version_path(namespace)).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _bump(self, namespace: str):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def _sync(self, namespace: str, force: bool = False):
+        """
+        Descarta las entradas locales si otro worker ha invalidado el espacio de nombres.
+
+        Los ficheros de versión se consultan como mucho una vez cada `sync_interval`
+        segundos por espacio de nombres, salvo con `force`.
+        """
+        if self.sync_dir is None:
+            return
+
+        now = time.monotonic()
+        checked_at = self._checked_at.get(namespace)
+        if not force and checked_at is not None and now - checked_at < self.sync_interval:
+            return
+        self._checked_at[namespace] = now
+
+        version = self._read_version(self.ALL)
+        if self._versions.get(self.ALL) != version:
+            self._versions.clear()
+            self._versions[self.ALL] = version
+            self._entries.clear()
+            self._bump(self.ALL)
+
+        version = self._read_version(namespace)
+        if self._versions.get(namespace) != version:
+            self._versions[namespace] = version
+            self._drop_namespace(namespace)
+            self._bump(namespace)
+
+    def _generation(self, namespace: str) -> Tuple[int, int]:
+        return self._generations.get(self.ALL, 0), self._generations.get(namespace, 0)
+
+    def version(self, namespace: str) -> Tuple[int, int]:
+        """
+        Versión actual del espacio de nombres, para pasarla a `set`/`set_many` al
+        guardar lo que se lea a continuación de la base de datos.
+        """
+        self._sync(namespace)
+        return self._generation(namespace)
+
+    def _publish(self, namespace: str):
+        """
+        Marca el espacio de nombres como invalidado para el resto de workers.
+
+        La fecha se fija explícitamente con `os.utime` en nanosegundos: la del sistema de
+        ficheros tiene resolución de milisegundos y dos invalidaciones seguidas podrían
+        dejar la misma.
+        """
+        if self.sync_dir is None:
+            return
+
+        path = self._version_path(namespace)
+        try:
+            os.makedirs(self.sync_dir, exist_ok=True)
+            version = max(time.time_ns(), self._read_version(namespace) + 1)
+            with open(path, "a"):
+                pass
+            os.utime(path, ns=(version, version))
+        except OSError:
+            logging.exception(f"No se ha podido propagar la invalidación de la caché ({namespace})")
+
+    def _drop_namespace(self, namespace: str):
+        for entry_key in [k for k in list(self._entries) if k[0] == namespace]:
+            self._entries.pop(entry_key, None)
+
+    def get(self, namespace: str, key: Any) -> Optional[Any]:
+        self._sync(namespace)
+        return self._get(namespace, key)
+
+    def _get(self, namespace: str, key: Any) -> Optional[Any]:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop((namespace, key), None)
+            return None
+        return value
+
+    def get_many(self, namespace: str, keys: Iterable[Any]) -> Tuple[Dict[Any, Any], List[Any]]:
+        """
+        Devuelve las entradas encontradas y la lista de claves que no están en caché.
+        """
+        self._sync(namespace)
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._get(namespace, key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        return found, missing
+
+    def set(self, namespace: str, key: Any, value: Any, version: Optional[Tuple[int, int]] = None):
+        """
+        Guarda una entrada. Con `version` (obtenida con `version()` antes de leer el valor)
+        la escritura se descarta si el espacio de nombres se ha invalidado desde entonces.
+        """
+        self.set_many(namespace, {key: value}, version)
+
+    def set_many(self, namespace: str, values: Dict[Any, Any], version: Optional[Tuple[int, int]] = None):
+        if version is not None:
+            self._sync(namespace, force=True)
+            if self._generation(namespace) != version:
+                return
+
+        if len(self._entries) + len(values) > self.max_entries:
+            self._evict()
+        expires_at = time.monotonic() + self.ttl
+        for key, value in values.items():
+            self._entries[(namespace, key)] = (expires_at, value)
+
+        # Una invalidación desde otro hilo mientras se guardaba
+        if version is not None and self._generation(namespace) != version:
+            self._drop_namespace(namespace)
+
+    def invalidate(self, namespace: Optional[str] = None, keys: Optional[Iterable[Any]] = None):
+        """
+        Elimina entradas de la caché.
+
+        Sin argumentos vacía la caché completa; con `namespace` elimina ese espacio
+        de nombres y con `keys` solo las claves indicadas dentro de él. En el resto
+        de workers se descarta siempre el espacio de nombres completo.
+        """
+        if namespace is None:
+            self._entries.clear()
+        elif keys is None:
+            self._drop_namespace(namespace)
+        else:
+            for key in keys:
+                self._entries.pop((namespace, key), None)
+        self._bump(namespace or self.ALL)
+
+        self._publish(namespace or self.ALL)
+
+    def _evict(self):
+        now = time.monotonic()
+        for entry_key in [k for k, (expires_at, _) in list(self._entries.items()) if expires_at < now]:
+            self._entries.pop(entry_key, None)
+
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+
+catalog_cache = CatalogCache(
+    ttl=settings.CATALOG_CACHE_TTL,
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    sync_dir=settings.CATALOG_CACHE_SYNC_DIR,
+    sync_interval=settings.CATALOG_CACHE_SYNC_INTERVAL / 1000
+)
@@ -0,0 +1,101 @@
+import gzip
+from contextvars import ContextVar
+from typing import Dict, Optional
+from fastapi import Response
+from app.core.settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # Dependencia opcional: sin ella solo se negocia gzip
+    brotli = None
+
+
+settings = get_settings()
+
+# Tipos de contenido que merece la pena comprimir
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def supported_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Elige la codificación a partir de la cabecera `Accept-Encoding`: la de mayor peso `q`
+    entre las soportadas y, a igual peso, brotli antes que gzip. Devuelve None si el
+    cliente no acepta ninguna.
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    candidates = [
+        (weights.get(encoding, weights.get("*", 0.0)), -index, encoding)
+        for index, encoding in enumerate(supported_encodings())
+    ]
+    q, _, encoding = max(candidates)
+    return encoding if q > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+# Codificación negociada para la petición en curso (la fija CompressionMiddleware)
+_accepted_encoding: ContextVar[Optional[str]] = ContextVar("accepted_encoding", default=None)
+
+
+def set_accepted_encoding(encoding: Optional[str]):
+    return _accepted_encoding.set(encoding)
+
+
+def reset_accepted_encoding(token):
+    _accepted_encoding.reset(token)
+
+
+def get_accepted_encoding() -> Optional[str]:
+    return _accepted_encoding.get()
+
+
+class PrecompressedBody:
+    """
+    Cuerpo JSON ya serializado para guardar en la caché del catálogo, con sus versiones
+    comprimidas: cada codificación se calcula la primera vez que se pide y se reutiliza
+    en las siguientes respuestas.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = self._encoded[encoding] = compress(self.body, encoding)
+        return data
+
+    def response(self) -> Response:
+        """
+        Respuesta con la codificación negociada por el middleware. Lleva ya
+        `Content-Encoding`, así que el middleware no la vuelve a comprimir.
+        """
+        headers = {"Vary": "Accept-Encoding"}
+        encoding = get_accepted_encoding()
+        if encoding is None or not settings.COMPRESSION_ENABLED or len(self.body) < settings.COMPRESSION_MIN_SIZE:
+            return Response(self.body, headers=headers, media_type="application/json")
+
+        headers["Content-Encoding"] = encoding
+        return Response(self.encoded(encoding), headers=headers, media_type="application/json")
@@ -1,7 +1,15 @@
 from app.core.settings import get_settings 
-from sqlalchemy.orm import sessionmaker, declarative_base  
-from sqlalchemy import create_engine  
-from typing import Generator
+from sqlalchemy.orm import Session, sessionmaker, declarative_base  
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool, QueuePool
+from typing import Generator, Optional
+import time
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_WAIT, DB_POOL_OVERFLOW, DB_POOL_REJECTED, DB_POOL_SIZE, DB_REPLICA_LAG
+from app.core.replicas import READ_ONLY, REPLICA, ReplicaSet, ReplicaState, mark_write
 
 
 
@@ -9,23 +17,173 @@ from typing import Generator
 settings = get_settings()
 
 
-engine = create_engine(
-    settings.DATABASE_URI,  
-    pool_pre_ping=True,  
-    pool_recycle=3600,  
-    max_overflow=0  
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mide cuánto tiempo espera cada petición para obtener una conexión
+    y cuántas se rechazan por superar DB_POOL_TIMEOUT.
+    """
+    metrics_label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_REJECTED.inc(self.metrics_label)
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, self.metrics_label)
+
+
+def create_app_engine(uri: str, label: str = "primary", **pool_options) -> Engine:
+    """
+    Crea un motor con la configuración de pool de la aplicación (DB_POOL_*) y publica su
+    estado en las métricas con la etiqueta `label`. `pool_options` sustituye a la configuración.
+
+    DB_POOL_TIMEOUT es el presupuesto de espera por una conexión: debe ser corto para que
+    las peticiones fallen rápido con 503 (ver `pool_timeout_handler`) en lugar de acumularse.
+
+    Con DB_PGBOUNCER el motor no mantiene pool propio (NullPool): PgBouncer en modo
+    transacción ya reparte las conexiones al servidor y una conexión retenida en el worker
+    solo ocuparía un cliente de PgBouncer. Tampoco se hace pre_ping, que costaría una
+    ida y vuelta extra por conexión nueva. psycopg2 no usa sentencias preparadas en el
+    servidor; con psycopg 3 se desactivan, porque cada transacción puede caer en otra
+    conexión del servidor que no las conoce.
+    """
+    if settings.DB_PGBOUNCER:
+        connect_args = {"prepare_threshold": None} if make_url(uri).get_driver_name() == "psycopg" else {}
+        return create_engine(uri, poolclass=NullPool, connect_args=connect_args, **pool_options)
+
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        **pool_options
+    }
+    pool_class = type(f"InstrumentedQueuePool_{label}", (InstrumentedQueuePool,), {"metrics_label": label})
+    app_engine = create_engine(uri, poolclass=pool_class, **options)
+
+    # Estado del pool, calculado en el momento de exportar las métricas
+    DB_POOL_CHECKED_OUT.set_function(lambda: app_engine.pool.checkedout(), label)
+    DB_POOL_OVERFLOW.set_function(lambda: max(app_engine.pool.overflow(), 0), label)
+    DB_POOL_SIZE.set_function(lambda: app_engine.pool.size(), label)
+    return app_engine
+
+
+engine = create_app_engine(settings.DATABASE_URI)
+
+# Réplicas de lectura opcionales, cada una con su propio pool
+replica_set = ReplicaSet(
+    [
+        ReplicaState(name=f"replica{index}", engine=create_app_engine(uri, f"replica{index}"))
+        for index, uri in enumerate(uri.strip() for uri in settings.DATABASE_REPLICA_URIS.split(",") if uri.strip())
+    ],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL
 )
 
+for replica in replica_set.replicas:
+    DB_REPLICA_LAG.set_function(lambda replica=replica: replica.lag if replica.lag is not None else -1, replica.name)
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas a una réplica cuando se ha marcado como de solo lectura
+    (`session.info["read_only"]`, ver `get_read_session`). La réplica se elige una vez por
+    sesión para que todas sus consultas vean el mismo estado; las escrituras (flush) y las
+    sesiones sin marcar van siempre al primario.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replicas and self.info.get(READ_ONLY) and not self._flushing:
+            if REPLICA not in self.info:
+                self.info[REPLICA] = self.replicas.choose()
+            if self.info[REPLICA] is not None:
+                return self.info[REPLICA].engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
 
+# Escrituras confirmadas: el usuario leerá del primario durante REPLICA_PIN_SECONDS
+@event.listens_for(RoutingSession, "after_flush")
+def _flagged_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _flagged_execute(execute_state):
+    if execute_state.is_insert or execute_state.is_update or execute_state.is_delete:
+        execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session):
+    if session.info.pop("wrote", False):
+        mark_write()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write(session):
+    session.info.pop("wrote", None)
+
+
+# expire_on_commit=False: los objetos conservan sus valores tras el commit y no hace
+# falta un session.refresh() (un SELECT extra) para devolverlos en la respuesta. Los
+# modelos usan eager_defaults para recibir created_at/updated_at en el propio INSERT.
 SessionLocal = sessionmaker(
     bind=engine, 
+    class_=RoutingSession,
+    replicas=replica_set,
     autocommit=False,  
-    autoflush=False  
+    autoflush=False,
+    expire_on_commit=False
 )
 
 
 Base = declarative_base()
 
+
+def pool_timeout_response() -> JSONResponse:
+    """
+    Respuesta 503 con `Retry-After` cuando no hay conexión libre en DB_POOL_TIMEOUT segundos.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Base de datos saturada, inténtalo de nuevo en unos segundos."},
+        headers={"Retry-After": str(settings.DB_RETRY_AFTER)}
+    )
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """
+    Manejador de la aplicación para `sqlalchemy.exc.TimeoutError`.
+
+    La conexión se obtiene de forma perezosa, en la primera consulta: las peticiones que
+    no consultan la base de datos (respuestas de la caché del catálogo) no ocupan el pool
+    y una petición no retiene conexión mientras espera hilo en su bulkhead. Los servicios
+    dejan pasar la excepción para que termine aquí en lugar de en un 500 genérico.
+    """
+    return pool_timeout_response()
+
+
+def pool_status(app_engine: Engine) -> Optional[dict]:
+    pool = app_engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout()
+    }
+
 """
 Esta función proporciona una sesión de base de datos usando SessionLocal(). 
 """
@@ -1,8 +1,10 @@
 import os
+import time
 from pathlib import Path
 from fastapi_mail import FastMail, MessageSchema, MessageType, ConnectionConfig
 from fastapi.background import BackgroundTasks
 from app.core.settings import get_settings
+from app.core.metrics import EMAILS_SENT, EMAIL_SEND_DURATION
 
 
 settings = get_settings()
@@ -25,8 +27,22 @@ conf = ConnectionConfig(
 fm = FastMail(conf)
 
 
-async def send_email(recipients: list, subject: str, context: dict, template_name: str,
-                     background_tasks: BackgroundTasks):
+async def _send_message(message: MessageSchema, template_name: str):
+    """
+    Envía el mensaje registrando el resultado y la duración del envío.
+    """
+    start = time.perf_counter()
+    status = "error"
+    try:
+        await fm.send_message(message, template_name=template_name)
+        status = "sent"
+    finally:
+        EMAILS_SENT.inc(status)
+        EMAIL_SEND_DURATION.observe(time.perf_counter() - start)
+
+
+def send_email(recipients: list, subject: str, context: dict, template_name: str,
+               background_tasks: BackgroundTasks):
     print("Comenzando a enviar el correo a %s con el asunto %s", recipients, subject)
 
     try:
@@ -40,7 +56,7 @@ async def send_email(recipients: list, subject: str, context: dict, template_nam
         print("Mensaje creado correctamente, enviando ahora...")
 
         # Enviar el correo en segundo plano
-        background_tasks.add_task(fm.send_message, message, template_name=template_name)
+        background_tasks.add_task(_send_message, message, template_name=template_name)
         print("Correo enviado exitosamente a %s", recipients)
     except Exception as e:
         print("Error al enviar el correo: %s", str(e))
@@ -0,0 +1,114 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Número máximo de parámetros distintos que se guardan por sentencia; basta con
+# saber que hay más de uno para sospechar de un N+1.
+MAX_PARAMETER_SAMPLES = 16
+
+
+@dataclass
+class RequestStats:
+    """
+    Estadísticas de acceso a la base de datos durante una petición.
+
+    Atributos:
+        query_count (int): Número de sentencias ejecutadas.
+        db_time (float): Tiempo total en base de datos (segundos).
+        slowest_time (float): Duración de la sentencia más lenta (segundos).
+        slowest_statement (str, opcional): Texto de la sentencia más lenta.
+        statements (Counter): Veces que se ha ejecutado cada sentencia.
+        parameters (dict): Muestras de parámetros distintos por sentencia.
+    """
+    query_count: int = 0
+    db_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    statements: Counter = field(default_factory=Counter)
+    parameters: Dict[str, Set[int]] = field(default_factory=dict)
+
+    def record(self, statement: str, parameters, elapsed: float):
+        self.query_count += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+        self.statements[statement] += 1
+        samples = self.parameters.setdefault(statement, set())
+        if len(samples) < MAX_PARAMETER_SAMPLES:
+            samples.add(hash(repr(parameters)))
+
+    def n_plus_one(self, threshold: int) -> List[dict]:
+        """
+        Devuelve las sentencias sospechosas de un patrón N+1: la misma sentencia
+        ejecutada al menos `threshold` veces con parámetros distintos.
+        """
+        return [
+            {"statement": statement, "count": count}
+            for statement, count in self.statements.items()
+            if count >= threshold and len(self.parameters.get(statement, ())) > 1
+        ]
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+# Funciones que reciben cada sentencia medida: (conn, statement, parameters, executemany, elapsed)
+_query_observers: List[Callable] = []
+
+
+def start_request_stats():
+    """
+    Crea las estadísticas de la petición en curso y devuelve (stats, token).
+    """
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    return stats, token
+
+
+def reset_request_stats(token):
+    _request_stats.reset(token)
+
+
+def get_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, parameters, elapsed)
+
+    for observer in _query_observers:
+        observer(conn, statement, parameters, executemany, elapsed)
+
+
+def add_query_observer(observer: Callable):
+    """
+    Registra una función que recibe la duración de cada sentencia, dentro o fuera de una petición.
+    """
+    if observer not in _query_observers:
+        _query_observers.append(observer)
+
+
+def install_query_instrumentation():
+    """
+    Registra los eventos de SQLAlchemy que miden cada sentencia.
+
+    Se registran sobre la clase Engine, de modo que cubren todos los motores de la
+    aplicación. Fuera de una petición (scripts, tareas) las mediciones se ignoran.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
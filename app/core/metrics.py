@@ -0,0 +1,372 @@
+import asyncio
+import fcntl
+import json
+import logging
+import math
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Acumulado de los contadores e histogramas de los workers que ya han terminado
+DEAD_SNAPSHOT = "dead.json"
+DEAD_LOCK = "dead.lock"
+
+
+class _Metric:
+    """
+    Métrica base con un fragmento (shard) de valores por hilo.
+
+    Cada hilo escribe solo en su propio diccionario, así que registrar un valor no
+    necesita locks. Los fragmentos se suman al exportar.
+    """
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            self._local.shard = shard
+            self._shards.append(shard)
+        return shard
+
+    def _add(self, labels: tuple, amount: float):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def samples(self) -> Dict[tuple, object]:
+        merged = {}
+        for shard in list(self._shards):
+            for labels, value in shard.copy().items():
+                merged[labels] = merged.get(labels, 0) + value
+        return merged
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        self._add(labels, amount)
+
+
+class Gauge(_Metric):
+    """
+    Gauge que se puede incrementar/decrementar o calcular al exportar con una función.
+    """
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._functions = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._add(labels, amount)
+
+    def dec(self, *labels, amount: float = 1):
+        self._add(labels, -amount)
+
+    def set_function(self, function: Callable[[], float], *labels):
+        self._functions[labels] = function
+
+    def samples(self) -> Dict[tuple, object]:
+        merged = super().samples()
+        for labels, function in list(self._functions.items()):
+            try:
+                merged[labels] = merged.get(labels, 0) + function()
+            except Exception:
+                logging.exception(f"Error al calcular la métrica {self.name}")
+        return merged
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [contadores por bucket (+Inf incluido), suma, total]
+            state = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            shard[labels] = state
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self) -> Dict[tuple, object]:
+        merged = {}
+        for shard in list(self._shards):
+            for labels, (counts, total, count) in shard.copy().items():
+                current = merged.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                current[0] = [a + b for a, b in zip(current[0], counts)]
+                current[1] += total
+                current[2] += count
+        return merged
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso con exportación en formato de texto de Prometheus.
+
+    Con varios workers de uvicorn cada proceso vuelca periódicamente una instantánea en
+    `METRICS_DIR` (un fichero JSON por pid); al exportar se suman las instantáneas de
+    todos los procesos vivos.
+
+    Cuando un worker termina, sus contadores e histogramas se suman a `dead.json` para
+    que los totales no retrocedan (Prometheus lo interpretaría como un reinicio del
+    contador); sus gauges se descartan. Es el mismo criterio que el modo multiproceso
+    de prometheus_client.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            return self._metrics[metric.name]
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> dict:
+        return {
+            name: [[list(labels), value] for labels, value in metric.samples().items()]
+            for name, metric in self._metrics.items()
+        }
+
+    def write_snapshot(self, directory: str):
+        """
+        Guarda la instantánea del proceso de forma atómica en `directory/<pid>.json`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _merge(self, collected: Dict[str, Dict[tuple, object]], snapshot: dict, include_gauges: bool = True):
+        for name, samples in snapshot.items():
+            metric = self._metrics.get(name)
+            if metric is None or (isinstance(metric, Gauge) and not include_gauges):
+                continue
+            merged = collected.setdefault(name, {})
+            for labels, value in samples:
+                labels = tuple(labels)
+                if isinstance(metric, Histogram):
+                    current = merged.setdefault(labels, [[0] * (len(metric.buckets) + 1), 0.0, 0])
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    merged[labels] = merged.get(labels, 0) + value
+
+    def _retire_snapshot(self, directory: str, path: str):
+        """
+        Suma los contadores e histogramas de un worker terminado a `dead.json` y elimina su
+        instantánea. El lock evita que dos workers sumen la misma instantánea dos veces.
+        """
+        dead_path = os.path.join(directory, DEAD_SNAPSHOT)
+        with open(os.path.join(directory, DEAD_LOCK), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not os.path.exists(path):
+                # Otro worker ya la ha sumado
+                return
+
+            dead = {}
+            self._merge(dead, _load_snapshot(dead_path) or {})
+            self._merge(dead, _load_snapshot(path) or {}, include_gauges=False)
+
+            tmp_path = f"{dead_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({name: [[list(labels), value] for labels, value in samples.items()]
+                           for name, samples in dead.items()}, f)
+            os.replace(tmp_path, dead_path)
+            os.remove(path)
+
+    def _read_snapshots(self, directory: str):
+        for filename in os.listdir(directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                pid = int(filename[:-5])
+            except ValueError:
+                continue
+            if pid == os.getpid():
+                continue
+
+            path = os.path.join(directory, filename)
+            if not _process_alive(pid):
+                try:
+                    self._retire_snapshot(directory, path)
+                except OSError:
+                    logging.exception(f"No se ha podido acumular la instantánea de métricas {filename}")
+                continue
+
+            snapshot = _load_snapshot(path)
+            if snapshot is not None:
+                yield snapshot
+
+        dead = _load_snapshot(os.path.join(directory, DEAD_SNAPSHOT))
+        if dead is not None:
+            yield dead
+
+    def collect(self, directory: Optional[str] = None) -> Dict[str, Dict[tuple, object]]:
+        """
+        Devuelve las muestras de cada métrica, sumando las de otros workers si se indica
+        el directorio de instantáneas.
+        """
+        collected = {name: metric.samples() for name, metric in self._metrics.items()}
+        if not directory or not os.path.isdir(directory):
+            return collected
+
+        for snapshot in self._read_snapshots(directory):
+            self._merge(collected, snapshot)
+        return collected
+
+    def render(self, directory: Optional[str] = None) -> str:
+        collected = self.collect(directory)
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            for labels, value in sorted(collected[name].items()):
+                pairs = list(zip(metric.labelnames, labels))
+                if isinstance(metric, Histogram):
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(metric.buckets + (math.inf,), counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == math.inf else _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(pairs + [('le', le)])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(pairs)} {count}")
+                else:
+                    lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _load_snapshot(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + "}"
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+async def flush_metrics_periodically(directory: str, interval: float):
+    """
+    Vuelca la instantánea del proceso cada `interval` segundos para que el resto de
+    workers pueda agregarla.
+    """
+    while True:
+        try:
+            registry.write_snapshot(directory)
+        except OSError:
+            logging.exception("No se ha podido guardar la instantánea de métricas")
+        await asyncio.sleep(interval)
+
+
+registry = MetricsRegistry()
+
+
+# HTTP
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Peticiones HTTP por método, ruta y código de estado.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP por ruta.", ("method", "route")
+)
+
+# Pool de conexiones
+DB_POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Conexiones en uso.", ("pool",))
+DB_POOL_OVERFLOW = registry.gauge("db_pool_overflow", "Conexiones abiertas por encima de pool_size.", ("pool",))
+DB_POOL_SIZE = registry.gauge("db_pool_size", "Tamaño configurado del pool.", ("pool",))
+DB_POOL_REJECTED = registry.counter(
+    "db_pool_rejected_total", "Peticiones rechazadas con 503 por no obtener conexión a tiempo.", ("pool",)
+)
+DB_REPLICA_LAG = registry.gauge(
+    "db_replica_lag_seconds", "Último retraso medido de cada réplica (-1 si no se ha podido medir).", ("replica",)
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Tiempo de espera para obtener una conexión del pool.", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+# Control de admisión, bulkheads y limitación de peticiones
+ADMISSION_IN_FLIGHT = registry.gauge("admission_in_flight", "Peticiones admitidas en curso por grupo.", ("group",))
+ADMISSION_QUEUE_WAIT = registry.histogram(
+    "admission_queue_wait_seconds", "Espera en la cola de admisión de las peticiones admitidas.", ("group",)
+)
+ADMISSION_REJECTED = registry.counter("admission_rejected_total", "Peticiones rechazadas con 503 por grupo.", ("group",))
+BULKHEAD_ACTIVE = registry.gauge("bulkhead_active_threads", "Hilos ocupados por pool de servicios.", ("pool",))
+BULKHEAD_QUEUED = registry.gauge("bulkhead_queued_calls", "Llamadas esperando hilo por pool de servicios.", ("pool",))
+BULKHEAD_QUEUE_WAIT = registry.histogram(
+    "bulkhead_queue_wait_seconds", "Espera hasta obtener hilo en el pool de servicios.", ("pool",)
+)
+BULKHEAD_REJECTED = registry.counter("bulkhead_rejected_total", "Llamadas rechazadas por pool lleno.", ("pool",))
+RATE_LIMITED = registry.counter(
+    "rate_limited_total", "Peticiones rechazadas con 429 por ruta y tipo de clave.", ("scope", "key")
+)
+
+# bcrypt
+BCRYPT_IN_PROGRESS = registry.gauge("bcrypt_operations_in_progress", "Operaciones bcrypt en curso o en espera.")
+BCRYPT_DURATION = registry.histogram(
+    "bcrypt_duration_seconds", "Duración de las operaciones bcrypt.", ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+)
+
+# Correo
+EMAILS_SENT = registry.counter("emails_sent_total", "Correos enviados por resultado.", ("status",))
+EMAIL_SEND_DURATION = registry.histogram("email_send_duration_seconds", "Duración del envío de correos.")
@@ -0,0 +1,143 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, List, Optional
+
+
+# cProfile no admite dos perfiles activos a la vez en el mismo proceso
+_profiling_active = False
+
+_PROFILE_ID_PATTERN = re.compile(r"^[\w.-]+$")
+
+# Perfiles de los hilos de los bulkheads que trabajan para la petición perfilada
+_thread_profiles: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar("thread_profiles", default=None)
+
+
+def try_start_profile() -> Optional[cProfile.Profile]:
+    """
+    Inicia un perfil si no hay otro en curso. Devuelve None si el perfilador está ocupado.
+    """
+    global _profiling_active
+    if _profiling_active:
+        return None
+    _profiling_active = True
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profile(profiler: cProfile.Profile):
+    global _profiling_active
+    profiler.disable()
+    _profiling_active = False
+
+
+def start_thread_profiles():
+    """
+    Empieza a recoger los perfiles de los hilos que trabajan para la petición en curso.
+    Devuelve la lista donde se acumulan y el token para `reset_thread_profiles`.
+    """
+    profiles: List[cProfile.Profile] = []
+    return profiles, _thread_profiles.set(profiles)
+
+
+def reset_thread_profiles(token):
+    _thread_profiles.reset(token)
+
+
+@contextmanager
+def profile_thread():
+    """
+    Perfila el hilo actual mientras dura el bloque si la petición que lo ha lanzado se
+    está perfilando (las ContextVar viajan con el trabajo al hilo del bulkhead).
+
+    cProfile con sys.setprofile solo mide el hilo que lo activa, así que cada hilo usa
+    su propio perfil y `save_profile` los une al del event loop. Desde Python 3.12
+    cProfile se apoya en sys.monitoring, que es común a todos los hilos: no se puede
+    activar un segundo perfil, pero el del event loop ya recoge también este hilo.
+    """
+    profiles = _thread_profiles.get()
+    profiler = cProfile.Profile() if profiles is not None else None
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiles.append(profiler)
+
+
+def save_profile(
+    profiler: cProfile.Profile,
+    directory: str,
+    method: str,
+    path: str,
+    max_files: int,
+    thread_profiles: Iterable[cProfile.Profile] = ()
+) -> str:
+    """
+    Guarda el perfil en `directory` como fichero .prof, junto con los perfiles de los
+    hilos que trabajaron para la petición, y elimina los más antiguos si se supera
+    `max_files`. Devuelve el identificador del perfil.
+    """
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r"[^\w]+", "_", path).strip("_") or "root"
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 1_000_000:06d}-{method.lower()}-{slug}"[:150]
+
+    stats = pstats.Stats(profiler)
+    for thread_profile in thread_profiles:
+        try:
+            stats.add(thread_profile)
+        except TypeError:
+            # Perfil de hilo vacío
+            pass
+    stats.dump_stats(os.path.join(directory, f"{profile_id}.prof"))
+
+    files = sorted(list_profiles(directory))
+    for old_profile in files[:max(len(files) - max_files, 0)]:
+        try:
+            os.remove(os.path.join(directory, f"{old_profile}.prof"))
+        except OSError:
+            pass
+
+    return profile_id
+
+
+def list_profiles(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        (filename[:-5] for filename in os.listdir(directory) if filename.endswith(".prof")),
+        reverse=True
+    )
+
+
+def profile_path(directory: str, profile_id: str) -> Optional[str]:
+    """
+    Devuelve la ruta del fichero del perfil, o None si el identificador no es válido o no existe.
+    """
+    if not _PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(directory, f"{profile_id}.prof")
+    return path if os.path.isfile(path) else None
+
+
+def render_profile(path: str, sort: str = "cumulative", limit: int = 50) -> str:
+    """
+    Devuelve el árbol de llamadas del perfil en texto (funciones más costosas y sus llamadores).
+    """
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort)
+    stats.print_stats(limit)
+    stats.print_callers(limit)
+    return output.getvalue()
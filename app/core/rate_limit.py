@@ -0,0 +1,148 @@
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+from app.core.settings import get_settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Dependencia opcional, solo para RATE_LIMIT_BACKEND=redis
+    aioredis = None
+
+
+settings = get_settings()
+
+
+def sliding_window_count(current: int, previous: int, now: float, window: float) -> float:
+    """
+    Estima las peticiones de la última ventana deslizante a partir de los contadores de
+    la ventana fija actual y la anterior, ponderando la anterior por la parte que sigue
+    dentro de la ventana deslizante.
+    """
+    weight = 1 - (now % window) / window
+    return previous * weight + current
+
+
+def retry_after(current: int, previous: int, limit: int, now: float, window: float) -> int:
+    """
+    Segundos hasta que la estimación de la ventana deslizante vuelva a estar por debajo del límite.
+    """
+    elapsed = now % window
+    if current >= limit or previous == 0:
+        return max(math.ceil(window - elapsed), 1)
+    # previous * (1 - (elapsed + t) / window) + current < limit
+    wait = window * (1 - (limit - current) / previous) - elapsed
+    return max(math.ceil(wait), 1)
+
+
+class MemoryRateLimitBackend:
+    """
+    Contadores de ventana fija por clave en memoria del worker.
+
+    Se usa solo desde el event loop, así que no necesita bloqueos: cada operación sobre
+    el diccionario es atómica respecto al resto de peticiones. Las claves de ventanas ya
+    pasadas se eliminan periódicamente.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self):
+        self._counters: Dict[str, List[int]] = {}
+        self._hits = 0
+
+    async def hit(self, key: str, window: float, now: float) -> Tuple[int, int]:
+        """
+        Cuenta una petición y devuelve los contadores (actual, anterior) de la clave.
+        """
+        index = int(now // window)
+        entry = self._counters.get(key)
+        if entry is None or entry[0] < index - 1:
+            entry = [index, 0, 0]
+        elif entry[0] == index - 1:
+            entry = [index, 0, entry[1]]
+        entry[1] += 1
+        self._counters[key] = entry
+
+        self._hits += 1
+        if self._hits % self.PRUNE_EVERY == 0:
+            self._prune(index)
+        return entry[1], entry[2]
+
+    def _prune(self, index: int):
+        expired = [key for key, entry in self._counters.items() if entry[0] < index - 1]
+        for key in expired:
+            del self._counters[key]
+
+    async def reset(self):
+        self._counters.clear()
+
+
+class RedisRateLimitBackend:
+    """
+    Contadores de ventana fija en Redis (o cualquier servidor compatible), compartidos
+    por todos los workers. Cada petición hace un único viaje: INCR y EXPIRE de la
+    ventana actual y GET de la anterior en un pipeline, sin bloqueos.
+    """
+
+    def __init__(self, url: str, prefix: str = "rate_limit"):
+        if aioredis is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requiere el paquete redis (pip install redis)")
+        self._client = aioredis.from_url(url)
+        self._prefix = prefix
+
+    async def hit(self, key: str, window: float, now: float) -> Tuple[int, int]:
+        index = int(now // window)
+        current_key = f"{self._prefix}:{key}:{index}"
+        pipe = self._client.pipeline(transaction=False)
+        pipe.incr(current_key)
+        pipe.expire(current_key, math.ceil(window * 2))
+        pipe.get(f"{self._prefix}:{key}:{index - 1}")
+        current, _, previous = await pipe.execute()
+        return int(current), int(previous or 0)
+
+    async def reset(self):
+        async for key in self._client.scan_iter(f"{self._prefix}:*"):
+            await self._client.delete(key)
+
+
+class RateLimiter:
+    """
+    Limitador de ventana deslizante (aproximada con dos ventanas fijas).
+
+    Todas las peticiones cuentan, también las rechazadas, para que un cliente que insiste
+    siga bloqueado. Si el backend falla, la petición se permite: el limitador no debe
+    impedir el acceso cuando Redis no está disponible.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def hit(self, key: str, limit: int, window: float, now: Optional[float] = None) -> Optional[int]:
+        """
+        Registra una petición para `key`.
+
+        Returns:
+           - int | None: Segundos de espera si se ha superado el límite, o None si se permite.
+        """
+        now = time.time() if now is None else now
+        try:
+            current, previous = await self.backend.hit(key, window, now)
+        except Exception as e:
+            logging.warning(f"Limitador de peticiones no disponible: {e}")
+            return None
+
+        if sliding_window_count(current, previous, now, window) <= limit:
+            return None
+        return retry_after(current, previous, limit, now, window)
+
+    async def reset(self):
+        await self.backend.reset()
+
+
+def create_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryRateLimitBackend()
+
+
+rate_limiter = RateLimiter(create_backend())
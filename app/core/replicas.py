@@ -0,0 +1,155 @@
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+# Clave de `session.info` que marca una sesión de solo lectura (puede ir a una réplica)
+READ_ONLY = "read_only"
+
+# Clave de `session.info` con la réplica elegida para la sesión (None si lee del primario)
+REPLICA = "replica"
+
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+@dataclass
+class ReplicaState:
+    """
+    Estado de una réplica de lectura.
+
+    Atributos:
+        name (str): Nombre de la réplica (etiqueta de las métricas).
+        engine (Engine): Motor con su propio pool de conexiones.
+        lag (float, opcional): Último retraso medido en segundos (None si no se ha podido medir).
+        checked_at (float): Momento de la última medición (time.monotonic).
+        error (str, opcional): Error de la última medición.
+    """
+    name: str
+    engine: Engine
+    lag: Optional[float] = None
+    checked_at: float = 0.0
+    error: Optional[str] = None
+
+
+class ReplicaSet:
+    """
+    Réplicas de lectura con medición perezosa del retraso.
+
+    El retraso de cada réplica se mide como mucho una vez cada `check_interval` segundos,
+    al elegir réplica. Solo se usan las réplicas cuyo último retraso medido no supera
+    `max_lag`; si ninguna cumple, `choose` devuelve None y la lectura va al primario.
+    """
+
+    def __init__(self, replicas: List[ReplicaState], max_lag: float, check_interval: float):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._cycle = itertools.cycle(range(len(replicas))) if replicas else None
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def measure_lag(self, replica: ReplicaState) -> float:
+        with replica.engine.connect() as conn:
+            return float(conn.execute(text(LAG_SQL)).scalar())
+
+    def _refresh(self, replica: ReplicaState):
+        now = time.monotonic()
+        # Un solo hilo mide cada vez; los demás usan el valor anterior
+        if now - replica.checked_at < self.check_interval or not self._lock.acquire(blocking=False):
+            return
+        try:
+            replica.checked_at = now
+            replica.lag = self.measure_lag(replica)
+            replica.error = None
+        except Exception as e:
+            replica.lag = None
+            replica.error = str(e)
+            logging.warning(f"No se pudo medir el retraso de la réplica {replica.name}: {e}")
+        finally:
+            self._lock.release()
+
+    def is_healthy(self, replica: ReplicaState) -> bool:
+        return replica.lag is not None and replica.lag <= self.max_lag
+
+    def choose(self) -> Optional[ReplicaState]:
+        """
+        Devuelve la siguiente réplica sana (turno rotatorio) o None si no hay ninguna.
+        """
+        if not self.replicas:
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._cycle)]
+            self._refresh(replica)
+            if self.is_healthy(replica):
+                return replica
+        return None
+
+    def status(self) -> List[dict]:
+        return [
+            {
+                "name": replica.name,
+                "lag_seconds": replica.lag,
+                "healthy": self.is_healthy(replica),
+                "checked_seconds_ago": round(time.monotonic() - replica.checked_at, 3) if replica.checked_at else None,
+                "error": replica.error
+            }
+            for replica in self.replicas
+        ]
+
+
+class PrimaryPin:
+    """
+    Estado de lectura de las propias escrituras durante una petición.
+
+    `pinned` indica que el usuario escribió hace poco y sus lecturas deben ir al primario;
+    `wrote` se activa cuando la petición confirma una escritura. El middleware guarda el
+    objeto en una ContextVar y lo consulta al terminar la petición.
+    """
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, pinned: bool = False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_primary_pin: ContextVar[Optional[PrimaryPin]] = ContextVar("primary_pin", default=None)
+
+
+def start_primary_pin(pinned: bool):
+    return _primary_pin.set(PrimaryPin(pinned))
+
+
+def reset_primary_pin(token):
+    _primary_pin.reset(token)
+
+
+def get_primary_pin() -> Optional[PrimaryPin]:
+    return _primary_pin.get()
+
+
+def read_from_replica(session) -> bool:
+    """
+    Indica si las consultas de la sesión han ido a una réplica. Sus resultados pueden
+    llevar retraso: no se deben guardar en cachés compartidas por todos los usuarios.
+    """
+    return session.info.get(REPLICA) is not None
+
+
+def mark_write():
+    pin = _primary_pin.get()
+    if pin is not None:
+        pin.wrote = True
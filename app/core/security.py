@@ -5,9 +5,11 @@ from fastapi.security import OAuth2PasswordBearer
 import jwt
 from passlib.context import CryptContext
 import base64
+import time
 from datetime import datetime, timezone, timedelta
 from app.core import settings
 from app.core.settings import get_settings
+from app.core.metrics import BCRYPT_DURATION, BCRYPT_IN_PROGRESS
 
 
 
@@ -35,11 +37,21 @@ def decode_jwt(token: str):
         raise HTTPException(status_code=401, detail="Token inválido")
 
 
+def _timed_bcrypt(operation, function, *args):
+    BCRYPT_IN_PROGRESS.inc()
+    start = time.perf_counter()
+    try:
+        return function(*args)
+    finally:
+        BCRYPT_DURATION.observe(time.perf_counter() - start, operation)
+        BCRYPT_IN_PROGRESS.dec()
+
+
 def hash_password(password):
-    return pwd_context.hash(password)
+    return _timed_bcrypt("hash", pwd_context.hash, password)
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return _timed_bcrypt("verify", pwd_context.verify, plain_password, hashed_password)
 
 def is_password_strong_enough(password: str) -> bool:
     if len(password) < 8:
@@ -74,7 +86,7 @@ def str_decode(string: str) -> str:
     return base64.b85decode(string.encode('ascii')).decode('ascii')
 
 
-async def load_user(email: str, db):
+def load_user(email: str, db):
     from app.models.user.user import User
     try:
         user = db.query(User).filter(User.email == email).first()
@@ -0,0 +1,34 @@
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any):
+    # Los importes se envían como cadena exacta ("2400.00"), igual que los serializa
+    # pydantic en los endpoints con response_model, nunca como float
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializa a JSON con orjson: datetime, date, UUID y dataclasses de forma nativa
+    y Decimal como cadena exacta.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON por defecto de la aplicación, serializada con orjson.
+
+    Los servicios de listados devuelven directamente esta respuesta con DTOs
+    (`app.responses.dto`): FastAPI no vuelve a validar el contenido contra el
+    response_model, que se mantiene solo para la documentación OpenAPI.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
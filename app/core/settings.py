@@ -29,6 +29,57 @@ class Settings(BaseSettings):
     # URI de conexión de PostgreSQL
     DATABASE_URI: str = f"postgresql://{POSTGRES_USER}:{quote_plus(POSTGRES_PASS)}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+    # Pool de conexiones. DB_POOL_TIMEOUT (segundos) es la espera máxima por una conexión
+    # antes de responder 503 con Retry-After (DB_RETRY_AFTER segundos)
+    DB_POOL_SIZE: int = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.environ.get("DB_MAX_OVERFLOW", 0))
+    DB_POOL_TIMEOUT: float = float(os.environ.get("DB_POOL_TIMEOUT", 2))
+    DB_POOL_RECYCLE: int = int(os.environ.get("DB_POOL_RECYCLE", 3600))
+    DB_RETRY_AFTER: int = int(os.environ.get("DB_RETRY_AFTER", 1))
+    # PgBouncer en modo transacción delante de PostgreSQL: sin pool en la aplicación
+    DB_PGBOUNCER: bool = os.environ.get("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+    # Control de admisión por worker: peticiones en curso (global y por grupo de rutas),
+    # tamaño de la cola de espera y espera máxima antes de responder 503
+    ADMISSION_ENABLED: bool = os.environ.get("ADMISSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    ADMISSION_MAX_CONCURRENCY: int = int(os.environ.get("ADMISSION_MAX_CONCURRENCY", 64))
+    ADMISSION_LIMIT_AUTH: int = int(os.environ.get("ADMISSION_LIMIT_AUTH", 16))
+    ADMISSION_LIMIT_CATALOG: int = int(os.environ.get("ADMISSION_LIMIT_CATALOG", 32))
+    ADMISSION_LIMIT_ORDERS: int = int(os.environ.get("ADMISSION_LIMIT_ORDERS", 32))
+    ADMISSION_LIMIT_ADMIN: int = int(os.environ.get("ADMISSION_LIMIT_ADMIN", 8))
+    ADMISSION_QUEUE_SIZE: int = int(os.environ.get("ADMISSION_QUEUE_SIZE", 128))
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 5))
+    ADMISSION_RETRY_AFTER: int = int(os.environ.get("ADMISSION_RETRY_AFTER", 1))
+
+    # Pools de hilos por subsistema para los servicios bloqueantes y llamadas en espera
+    # admitidas por pool antes de responder 503
+    BULKHEADS_ENABLED: bool = os.environ.get("BULKHEADS_ENABLED", "true").lower() in ("1", "true", "yes")
+    BULKHEAD_AUTH_WORKERS: int = int(os.environ.get("BULKHEAD_AUTH_WORKERS", 4))
+    BULKHEAD_CATALOG_WORKERS: int = int(os.environ.get("BULKHEAD_CATALOG_WORKERS", 8))
+    BULKHEAD_ORDERS_WORKERS: int = int(os.environ.get("BULKHEAD_ORDERS_WORKERS", 8))
+    BULKHEAD_ADMIN_WORKERS: int = int(os.environ.get("BULKHEAD_ADMIN_WORKERS", 2))
+    BULKHEAD_MAX_QUEUE: int = int(os.environ.get("BULKHEAD_MAX_QUEUE", 64))
+    BULKHEAD_RETRY_AFTER: int = int(os.environ.get("BULKHEAD_RETRY_AFTER", 1))
+
+    # Límite de intentos de login y recuperación de contraseña por IP y por cuenta,
+    # en una ventana deslizante de RATE_LIMIT_WINDOW segundos. Backend: memory o redis
+    RATE_LIMIT_ENABLED: bool = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATE_LIMIT_BACKEND: str = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_REDIS_URL: str = os.environ.get("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_WINDOW: float = float(os.environ.get("RATE_LIMIT_WINDOW", 60))
+    RATE_LIMIT_LOGIN_PER_IP: int = int(os.environ.get("RATE_LIMIT_LOGIN_PER_IP", 20))
+    RATE_LIMIT_LOGIN_PER_ACCOUNT: int = int(os.environ.get("RATE_LIMIT_LOGIN_PER_ACCOUNT", 5))
+    RATE_LIMIT_FORGOT_PER_IP: int = int(os.environ.get("RATE_LIMIT_FORGOT_PER_IP", 5))
+    RATE_LIMIT_FORGOT_PER_ACCOUNT: int = int(os.environ.get("RATE_LIMIT_FORGOT_PER_ACCOUNT", 3))
+    RATE_LIMIT_TRUST_FORWARDED: bool = os.environ.get("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes")
+
+    # Réplicas de lectura (URIs separadas por comas) y lectura de las propias escrituras
+    DATABASE_REPLICA_URIS: str = os.environ.get("DATABASE_REPLICA_URIS", "")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", 5))
+    REPLICA_LAG_CHECK_INTERVAL: float = float(os.environ.get("REPLICA_LAG_CHECK_INTERVAL", 2))
+    REPLICA_PIN_SECONDS: float = float(os.environ.get("REPLICA_PIN_SECONDS", 10))
+    REPLICA_PIN_COOKIE: str = os.environ.get("REPLICA_PIN_COOKIE", "primary_until")
+
     # App Secret Key
     SECRET_KEY: str = os.environ.get("SECRET_KEY")
     
@@ -43,7 +94,81 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.environ.get("SECRET_KEY")
     
     ADMIN_PASSWORD: str = os.environ.get("ADMIN_PASSWORD")
-    
+
+    # Caché del catálogo
+    CATALOG_CACHE_TTL: int = int(os.environ.get("CATALOG_CACHE_TTL", 300))
+    CATALOG_CACHE_MAX_ENTRIES: int = int(os.environ.get("CATALOG_CACHE_MAX_ENTRIES", 10000))
+    # Directorio compartido por los workers para propagar las invalidaciones ("" las deja locales).
+    # Debe ser una ruta absoluta
+    CATALOG_CACHE_SYNC_DIR: str = os.environ.get("CATALOG_CACHE_SYNC_DIR", "/tmp/evoltronic/catalog-cache")
+    # Milisegundos mínimos entre dos comprobaciones de las invalidaciones de otros workers
+    CATALOG_CACHE_SYNC_INTERVAL: int = int(os.environ.get("CATALOG_CACHE_SYNC_INTERVAL", 100))
+    PRODUCT_BATCH_MAX_IDS: int = int(os.environ.get("PRODUCT_BATCH_MAX_IDS", 500))
+
+    # Importación masiva de productos
+    PRODUCT_IMPORT_CHUNK_SIZE: int = int(os.environ.get("PRODUCT_IMPORT_CHUNK_SIZE", 5000))
+    PRODUCT_IMPORT_MAX_ERRORS: int = int(os.environ.get("PRODUCT_IMPORT_MAX_ERRORS", 1000))
+
+    # Actualización masiva de precio y stock
+    PRODUCT_BULK_UPDATE_MAX_ITEMS: int = int(os.environ.get("PRODUCT_BULK_UPDATE_MAX_ITEMS", 20000))
+    PRODUCT_BULK_UPDATE_CHUNK_SIZE: int = int(os.environ.get("PRODUCT_BULK_UPDATE_CHUNK_SIZE", 1000))
+
+    # Instrumentación SQL
+    N_PLUS_ONE_THRESHOLD: int = int(os.environ.get("N_PLUS_ONE_THRESHOLD", 5))
+
+    # Métricas (con varios workers, directorio compartido para agregar las instantáneas)
+    METRICS_DIR: str = os.environ.get("METRICS_DIR", "")
+    METRICS_FLUSH_INTERVAL: float = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+
+    # Server-Timing (siempre activo, o bajo demanda con la cabecera para administradores)
+    SERVER_TIMING_ENABLED: bool = bool(os.environ.get("SERVER_TIMING_ENABLED"))
+    SERVER_TIMING_HEADER: str = os.environ.get("SERVER_TIMING_HEADER", "X-Server-Timing")
+
+    # Perfilado bajo demanda (solo administradores)
+    PROFILE_HEADER: str = os.environ.get("PROFILE_HEADER", "X-Profile")
+    PROFILE_DIR: str = os.environ.get("PROFILE_DIR", "profiles")
+    PROFILE_MAX_FILES: int = int(os.environ.get("PROFILE_MAX_FILES", 50))
+
+    # Registro de consultas lentas (umbral en ms; 0 lo desactiva)
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 500))
+    SLOW_QUERY_EXPLAIN: bool = os.environ.get("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+    SLOW_QUERY_EXPLAIN_INTERVAL: int = int(os.environ.get("SLOW_QUERY_EXPLAIN_INTERVAL", 300))
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = int(os.environ.get("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 10000))
+    SLOW_QUERY_MAX_PENDING: int = int(os.environ.get("SLOW_QUERY_MAX_PENDING", 20))
+    SLOW_QUERY_MAX_ENTRIES: int = int(os.environ.get("SLOW_QUERY_MAX_ENTRIES", 200))
+    SLOW_QUERY_LOG_FILE: str = os.environ.get("SLOW_QUERY_LOG_FILE", "logs/slow_queries.log")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.environ.get("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.environ.get("SLOW_QUERY_LOG_BACKUPS", 5))
+
+    # Purga de filas eliminadas lógicamente
+    PURGE_RETENTION_DAYS: int = int(os.environ.get("PURGE_RETENTION_DAYS", 90))
+    PURGE_BATCH_SIZE: int = int(os.environ.get("PURGE_BATCH_SIZE", 500))
+    PURGE_BATCH_PAUSE: float = float(os.environ.get("PURGE_BATCH_PAUSE", 0.2))
+    PURGE_LOCK_TIMEOUT_MS: int = int(os.environ.get("PURGE_LOCK_TIMEOUT_MS", 2000))
+    PURGE_ARCHIVE_DIR: str = os.environ.get("PURGE_ARCHIVE_DIR", "")
+
+    # Particiones mensuales de pedidos
+    ORDER_PARTITION_MONTHS_AHEAD: int = int(os.environ.get("ORDER_PARTITION_MONTHS_AHEAD", 3))
+    ORDER_PARTITION_RETENTION_MONTHS: int = int(os.environ.get("ORDER_PARTITION_RETENTION_MONTHS", 0))
+    ORDER_PARTITION_ARCHIVE_DIR: str = os.environ.get("ORDER_PARTITION_ARCHIVE_DIR", "archive/orders")
+    ORDER_PARTITION_AUTO_CREATE: bool = os.environ.get("ORDER_PARTITION_AUTO_CREATE", "true").lower() in ("1", "true", "yes")
+
+    # Compresión de respuestas (gzip, y brotli si está instalado el paquete brotli)
+    COMPRESSION_ENABLED: bool = os.environ.get("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_MIN_SIZE: int = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL: int = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 5))
+    # A partir de este tamaño se comprime en un hilo para no bloquear el event loop
+    COMPRESSION_THREAD_MIN_SIZE: int = int(os.environ.get("COMPRESSION_THREAD_MIN_SIZE", 65536))
+
+    # Instantáneas estáticas del catálogo (GET /catalog/snapshot)
+    CATALOG_SNAPSHOT_ENABLED: bool = os.environ.get("CATALOG_SNAPSHOT_ENABLED", "false").lower() in ("1", "true", "yes")
+    CATALOG_SNAPSHOT_DIR: str = os.environ.get("CATALOG_SNAPSHOT_DIR", "snapshots/catalog")
+    CATALOG_SNAPSHOT_DEBOUNCE: float = float(os.environ.get("CATALOG_SNAPSHOT_DEBOUNCE", 5))
+    CATALOG_SNAPSHOT_MAX_DELAY: float = float(os.environ.get("CATALOG_SNAPSHOT_MAX_DELAY", 60))
+    CATALOG_SNAPSHOT_KEEP: int = int(os.environ.get("CATALOG_SNAPSHOT_KEEP", 3))
+    CATALOG_SNAPSHOT_MAX_AGE: int = int(os.environ.get("CATALOG_SNAPSHOT_MAX_AGE", 60))
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -0,0 +1,248 @@
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+from sqlalchemy import URL, Engine, create_engine
+from sqlalchemy.pool import NullPool
+from app.core.instrumentation import add_query_observer
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+_IN_LIST = re.compile(r"\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)+\s*\)")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b")
+
+_SERVICES_PATH = f"{os.sep}app{os.sep}services{os.sep}"
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Normaliza una sentencia para agrupar las ejecuciones de la misma consulta:
+    sustituye parámetros y literales por `?` y colapsa las listas de IN.
+    """
+    normalized = _IN_LIST.sub("(...)", statement)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _STRING.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def parameters_shape(parameters, executemany: bool = False):
+    """
+    Describe los parámetros por nombre y tipo, sin sus valores.
+    """
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "shape": parameters_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def is_read_only(statement: str) -> bool:
+    """
+    Indica si la sentencia es una consulta de solo lectura, la única que se ejecuta con ANALYZE.
+    """
+    upper = statement.lstrip().upper()
+    if upper.startswith("SELECT"):
+        return " FOR UPDATE" not in upper
+    if upper.startswith("WITH"):
+        return _WRITE_KEYWORDS.search(upper) is None
+    return False
+
+
+def find_caller() -> Optional[str]:
+    """
+    Devuelve la función de `app/services` que ha lanzado la sentencia (módulo:función:línea).
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _SERVICES_PATH in filename:
+            module = filename.rsplit(f"{os.sep}app{os.sep}", 1)[1][:-3].replace(os.sep, ".")
+            return f"app.{module}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryRecorder:
+    """
+    Registra las sentencias que superan SLOW_QUERY_THRESHOLD_MS.
+
+    Por cada consulta lenta guarda la SQL normalizada, la forma de los parámetros y la
+    función del servicio que la lanzó, y en segundo plano obtiene su plan con EXPLAIN
+    en una conexión aparte (ANALYZE y BUFFERS solo para SELECT, que no modifica datos;
+    siempre dentro de una transacción que se deshace). Cada registro se escribe como una
+    línea JSON en un log rotativo y se acumula en una tabla en memoria de las peores
+    consultas del worker.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Un motor de EXPLAIN por cada base de datos (primario o réplica) con consultas lentas
+        self._explain_engines: Dict[URL, Engine] = {}
+        self._pending = 0
+        self._logger = logging.getLogger("app.slow_queries")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._handler: Optional[RotatingFileHandler] = None
+        self._handler_lock = threading.Lock()
+
+    def _get_logger(self) -> logging.Logger:
+        # El fichero se vuelve a abrir si cambia SLOW_QUERY_LOG_FILE
+        with self._handler_lock:
+            path = settings.SLOW_QUERY_LOG_FILE
+            if self._handler is None or self._handler.baseFilename != os.path.abspath(path):
+                self._close_handler()
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._handler = RotatingFileHandler(
+                    path,
+                    maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=settings.SLOW_QUERY_LOG_BACKUPS
+                )
+                self._handler.setFormatter(logging.Formatter("%(message)s"))
+                self._logger.addHandler(self._handler)
+        return self._logger
+
+    def _close_handler(self):
+        if self._handler is not None:
+            self._logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+    def observe(self, conn, statement: str, parameters, executemany: bool, elapsed: float):
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold <= 0 or elapsed * 1000 < threshold:
+            return
+        if self._explain_engines.get(conn.engine.url) is conn.engine:
+            return
+
+        normalized = normalize_statement(statement)
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": normalized,
+            "parameters": parameters_shape(parameters, executemany),
+            "caller": find_caller()
+        }
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(normalized)
+            if entry is None:
+                if len(self._entries) >= settings.SLOW_QUERY_MAX_ENTRIES:
+                    # Se descarta la consulta con menor tiempo acumulado
+                    del self._entries[min(self._entries, key=lambda key: self._entries[key]["total_ms"])]
+                entry = self._entries[normalized] = {
+                    "statement": normalized,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "callers": [],
+                    "parameters": record["parameters"],
+                    "plan": None,
+                    "explained_at": None,
+                    "last_seen": None
+                }
+            entry["count"] += 1
+            entry["total_ms"] += record["duration_ms"]
+            entry["max_ms"] = max(entry["max_ms"], record["duration_ms"])
+            entry["last_seen"] = record["timestamp"]
+            if record["caller"] and record["caller"] not in entry["callers"]:
+                entry["callers"] = (entry["callers"] + [record["caller"]])[-5:]
+
+            explain = (
+                settings.SLOW_QUERY_EXPLAIN
+                and not executemany
+                and self._pending < settings.SLOW_QUERY_MAX_PENDING
+                and (entry["explained_at"] is None or now - entry["explained_at"] >= settings.SLOW_QUERY_EXPLAIN_INTERVAL)
+            )
+            if explain:
+                entry["explained_at"] = now
+                self._pending += 1
+
+        if explain:
+            self._get_executor().submit(self._explain_and_log, conn.engine.url, statement, parameters, record)
+        else:
+            self._get_logger().info(json.dumps(record, default=str))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        return self._executor
+
+    def _explain_and_log(self, url: URL, statement: str, parameters, record: dict):
+        try:
+            record["plan"] = self._explain(url, statement, parameters)
+        except Exception as e:
+            record["plan_error"] = str(e)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                entry = self._entries.get(record["statement"])
+                if entry is not None and "plan" in record:
+                    entry["plan"] = record["plan"]
+
+        self._get_logger().info(json.dumps(record, default=str))
+
+    def _explain(self, url: URL, statement: str, parameters) -> str:
+        """
+        Obtiene el plan en la misma base de datos (primario o réplica) en la que se ejecutó
+        la sentencia.
+        """
+        engine = self._explain_engines.get(url)
+        if engine is None:
+            engine = self._explain_engines[url] = create_engine(url, poolclass=NullPool)
+
+        options = "ANALYZE, BUFFERS" if is_read_only(statement) else "COSTS"
+
+        with engine.connect() as conn:
+            try:
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}")
+                rows = conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters or None).fetchall()
+            finally:
+                conn.rollback()
+
+        return "\n".join(row[0] for row in rows)
+
+    def worst(self, sort: str = "max_ms", limit: int = 20) -> List[dict]:
+        """
+        Devuelve las consultas lentas del worker ordenadas por `max_ms`, `total_ms` o `count`.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        for entry in entries:
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 3)
+            entry.pop("explained_at", None)
+        return sorted(entries, key=lambda entry: entry[sort], reverse=True)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+        with self._handler_lock:
+            self._close_handler()
+
+
+slow_query_recorder = SlowQueryRecorder()
+
+
+def install_slow_query_log():
+    add_query_observer(slow_query_recorder.observe)
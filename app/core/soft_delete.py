@@ -0,0 +1,82 @@
+from sqlalchemy import Column, TIMESTAMP, event
+from sqlalchemy.orm import Session, with_loader_criteria
+
+
+# Opción de ejecución y clave de `session.info` para incluir las filas eliminadas
+INCLUDE_DELETED = "include_deleted"
+
+
+class SoftDeleteMixin:
+    """
+    Modelos con borrado lógico.
+
+    Todas las consultas ORM de estos modelos excluyen automáticamente las filas con
+    `deleted_at`, también en los joins de las relaciones y en las cargas perezosas.
+    Para ver las filas eliminadas:
+
+        - En una consulta: `session.query(Order).execution_options(include_deleted=True)`
+        - En toda la sesión: `include_deleted(session)` (vistas de administración)
+
+    Atributos:
+        deleted_at (datetime, opcional): Fecha de eliminación lógica.
+        filter_deleted_in_relationships (bool): Si es False, el filtro solo se aplica cuando
+            el modelo se consulta directamente: las cargas de relaciones (joined, lazy o
+            selectin) devuelven también las filas eliminadas.
+    """
+    deleted_at = Column(TIMESTAMP, nullable=True)
+
+    filter_deleted_in_relationships = True
+
+
+def include_deleted(session: Session) -> Session:
+    """
+    Desactiva el filtro de borrado lógico en todas las consultas de la sesión.
+    """
+    session.info[INCLUDE_DELETED] = True
+    return session
+
+
+_criteria = None
+
+
+def _soft_delete_criteria() -> dict:
+    """
+    Criterio `deleted_at IS NULL` de cada modelo. No se propaga a las cargas de relaciones:
+    el listener lo añade en cada consulta según el modelo.
+    """
+    global _criteria
+    if _criteria is None:
+        _criteria = {
+            model: with_loader_criteria(
+                model,
+                model.deleted_at.is_(None),
+                include_aliases=True,
+                propagate_to_loaders=False
+            )
+            for model in SoftDeleteMixin.__subclasses__()
+        }
+    return _criteria
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _filter_soft_deleted(execute_state):
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.execution_options.get(INCLUDE_DELETED, False)
+        or execute_state.session.info.get(INCLUDE_DELETED, False)
+    ):
+        return
+
+    # Modelos que se consultan directamente (los de las filas del resultado)
+    queried = set() if execute_state.is_relationship_load else {
+        mapper.class_ for mapper in execute_state.all_mappers
+    }
+
+    options = [
+        criteria
+        for model, criteria in _soft_delete_criteria().items()
+        if model.filter_deleted_in_relationships or model in queried
+    ]
+    if options:
+        execute_state.statement = execute_state.statement.options(*options)
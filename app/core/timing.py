@@ -0,0 +1,135 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+
+class ServerTiming:
+    """
+    Tiempos de las fases de una petición, en segundos, para la cabecera Server-Timing.
+
+    Fases:
+        - auth: obtención del usuario autenticado (`get_current_user`).
+        - deps: resolución de dependencias y validación de la entrada (incluye auth).
+        - app: ejecución del endpoint (servicio y consultas).
+        - serialize: validación del `response_model` y serialización de la respuesta.
+        - db: tiempo total en base de datos, de la instrumentación SQL.
+        - total: duración completa de la petición.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.descriptions: Dict[str, str] = {}
+        self.endpoint_start: Optional[float] = None
+        self.endpoint_end: Optional[float] = None
+
+    def add(self, name: str, seconds: float, description: Optional[str] = None):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        if description:
+            self.descriptions[name] = description
+
+    def header_value(self) -> str:
+        parts = []
+        for name, seconds in self.durations.items():
+            part = f"{name};dur={seconds * 1000:.1f}"
+            if name in self.descriptions:
+                part += f';desc="{self.descriptions[name]}"'
+            parts.append(part)
+        return ", ".join(parts)
+
+
+_server_timing: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+def start_server_timing():
+    """
+    Activa la medición de fases para la petición en curso y devuelve (timing, token).
+    """
+    timing = ServerTiming()
+    token = _server_timing.set(timing)
+    return timing, token
+
+
+def reset_server_timing(token):
+    _server_timing.reset(token)
+
+
+def get_server_timing() -> Optional[ServerTiming]:
+    return _server_timing.get()
+
+
+def record_timing(name: str, seconds: float):
+    """
+    Suma `seconds` a la fase `name` si la petición en curso se está midiendo.
+    """
+    timing = _server_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """
+    Envuelve el endpoint para conocer cuándo empieza y termina su ejecución.
+
+    `functools.wraps` conserva la firma original, de la que FastAPI obtiene las
+    dependencias y los parámetros.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timing = _server_timing.get()
+            if timing is None:
+                return await endpoint(*args, **kwargs)
+            timing.endpoint_start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timing.endpoint_end = time.perf_counter()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        timing = _server_timing.get()
+        if timing is None:
+            return endpoint(*args, **kwargs)
+        timing.endpoint_start = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            timing.endpoint_end = time.perf_counter()
+    return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    Ruta que separa el tiempo de una petición en dependencias, endpoint y serialización.
+
+    Solo mide cuando la petición tiene activado Server-Timing; en otro caso el coste es
+    una lectura de una variable de contexto.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request):
+            timing = _server_timing.get()
+            if timing is None:
+                return await handler(request)
+
+            start = time.perf_counter()
+            response = await handler(request)
+            end = time.perf_counter()
+
+            if timing.endpoint_start is not None and timing.endpoint_end is not None:
+                timing.add("deps", timing.endpoint_start - start)
+                timing.add("app", timing.endpoint_end - timing.endpoint_start)
+                timing.add("serialize", end - timing.endpoint_end)
+            return response
+
+        return timed_handler
@@ -1,4 +1,7 @@
-from fastapi import Request,HTTPException
+from fastapi import Depends, Query, Request,HTTPException
+from sqlalchemy.orm import Session
+from app.dependencies.database import get_read_session
+from app.core.soft_delete import include_deleted as include_deleted_rows
 
 
 async def is_admin(request: Request):
@@ -16,8 +19,28 @@ async def is_admin(request: Request):
         raise HTTPException(status_code=403, detail="El usuario no tienen rol asignado")
 
     
-    if not any(role.name == "admin" for role in user.roles):
+    if not user_is_admin(user):
         raise HTTPException(status_code=403, detail="Acceso denegado: Solo para administradores.")
 
     return user
 
+
+def user_is_admin(user) -> bool:
+    """
+    Indica si el usuario tiene el rol de administrador. Es la misma comprobación que
+    `is_admin`, para usarla fuera de las dependencias (por ejemplo, en middlewares).
+    """
+    return bool(user and user.roles and any(role.name == "admin" for role in user.roles))
+
+
+def get_admin_session(
+    include_deleted: bool = Query(False, description="Incluye los registros eliminados lógicamente."),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Sesión de solo lectura para las vistas de administración. Con `?include_deleted=true`
+    desactiva el filtro de borrado lógico para toda la petición.
+    """
+    if include_deleted:
+        include_deleted_rows(session)
+    return session
@@ -0,0 +1,18 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from app.core.database import get_session
+from app.core.replicas import READ_ONLY, get_primary_pin
+
+
+def get_read_session(session: Session = Depends(get_session)):
+    """
+    Sesión para las rutas de solo lectura: sus consultas pueden ir a una réplica.
+
+    Si el usuario ha escrito hace poco (ver `ReadYourWritesMiddleware`) o no hay réplicas
+    sanas, la sesión lee del primario.
+    """
+    pin = get_primary_pin()
+    if pin is None or not pin.pinned:
+        # La réplica se elige y se conecta en la primera consulta
+        session.info[READ_ONLY] = True
+    return session
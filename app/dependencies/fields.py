@@ -0,0 +1,41 @@
+from typing import Optional, Tuple
+from fastapi import HTTPException, Query
+
+
+# Campos que se pueden pedir con `?fields=` en cada recurso
+PRODUCT_FIELDS = ("id", "name", "description", "price", "stock", "category_id")
+ORDER_FIELDS = ("id", "user_id", "total_price", "status", "created_at", "updated_at", "order_items")
+
+
+class FieldSelection:
+    """
+    Dependencia para las respuestas parciales: `?fields=id,name,price` devuelve solo
+    esos campos y los servicios consultan solo esas columnas.
+
+    Devuelve None si no se indica `fields` (respuesta completa) o la tupla de campos en
+    el orden pedido y sin duplicados. Los campos fuera de la lista permitida del recurso
+    responden 400.
+    """
+
+    def __init__(self, allowed: Tuple[str, ...]):
+        self.allowed = allowed
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description="Campos a devolver separados por comas, por ejemplo `id,name,price`.")
+    ) -> Optional[Tuple[str, ...]]:
+        if fields is None:
+            return None
+
+        selected = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [field for field in selected if field not in self.allowed]
+        if not selected or unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos no válidos: {', '.join(unknown) or fields!r}. Permitidos: {', '.join(self.allowed)}."
+            )
+        return selected
+
+
+product_fields = FieldSelection(PRODUCT_FIELDS)
+order_fields = FieldSelection(ORDER_FIELDS)
@@ -0,0 +1,77 @@
+from typing import Optional
+from fastapi import HTTPException, Request
+from app.core.metrics import RATE_LIMITED
+from app.core.rate_limit import rate_limiter
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def client_ip(request: Request) -> str:
+    """
+    IP del cliente. Solo se confía en `X-Forwarded-For` si RATE_LIMIT_TRUST_FORWARDED
+    está activo (la aplicación está detrás de un proxy que la sobrescribe).
+    """
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def _account(request: Request, field: str) -> Optional[str]:
+    # FastAPI ya ha leído el cuerpo al resolver la ruta; request.form()/json() lo reutilizan
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            value = (await request.json()).get(field)
+        else:
+            value = (await request.form()).get(field)
+    except Exception:
+        return None
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+class RateLimit:
+    """
+    Dependencia que limita las peticiones a una ruta por IP y por cuenta (el campo
+    `account_field` del cuerpo, normalmente el email).
+
+    Se declara en `dependencies=[...]` del decorador de la ruta para que se resuelva
+    antes que la sesión de base de datos: una petición rechazada responde 429 con
+    `Retry-After` sin consultar la base de datos ni ejecutar bcrypt.
+    """
+
+    def __init__(self, scope: str, per_ip: int, per_account: int, account_field: str = "email"):
+        self.scope = scope
+        self.per_ip = per_ip
+        self.per_account = per_account
+        self.account_field = account_field
+
+    async def __call__(self, request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        window = settings.RATE_LIMIT_WINDOW
+        checks = [("ip", client_ip(request), self.per_ip)]
+        account = await _account(request, self.account_field)
+        if account:
+            checks.append(("account", account, self.per_account))
+
+        for key_type, key, limit in checks:
+            wait = await rate_limiter.hit(f"{self.scope}:{key_type}:{key}", limit, window)
+            if wait is not None:
+                RATE_LIMITED.inc(self.scope, key_type)
+                raise HTTPException(
+                    status_code=429,
+                    detail="Demasiados intentos. Inténtalo de nuevo más tarde.",
+                    headers={"Retry-After": str(wait)}
+                )
+
+
+login_rate_limit = RateLimit(
+    "login", settings.RATE_LIMIT_LOGIN_PER_IP, settings.RATE_LIMIT_LOGIN_PER_ACCOUNT, account_field="username"
+)
+forgot_password_rate_limit = RateLimit(
+    "forgot_password", settings.RATE_LIMIT_FORGOT_PER_IP, settings.RATE_LIMIT_FORGOT_PER_ACCOUNT
+)
@@ -5,6 +5,9 @@ from app.core.security import decode_jwt
 from app.core.database import get_session  
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.timing import record_timing
+import time
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -24,6 +27,7 @@ async def get_current_user(token: str = Security(oauth2_scheme), session: Sessio
     Raises:
         - HTTPException: Si el token es inválido o el usuario no existe en la base de datos.
     """
+    start = time.perf_counter()
     try:
         payload = decode_jwt(token)
 
@@ -45,10 +49,11 @@ async def get_current_user(token: str = Security(oauth2_scheme), session: Sessio
 
         return user
 
-    except HTTPException as e:
-        raise e
+    except (HTTPException, PoolTimeoutError):
+        raise
 
     except Exception as e:
         raise HTTPException(status_code=401, detail="Token inválido o error al recuperar el usuario.")
     finally:
         session.close()
+        record_timing("auth", time.perf_counter() - start)
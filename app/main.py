@@ -1,12 +1,96 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from app.api.api import api_router
+from app.middlewares.admission import AdmissionControlMiddleware
 from app.middlewares.authentication import AuthenticationMiddleware
+from app.middlewares.compression import CompressionMiddleware
+from app.middlewares.metrics import MetricsMiddleware
+from app.middlewares.profiler import ProfilerMiddleware
+from app.middlewares.query_stats import QueryStatsMiddleware
+from app.middlewares.read_your_writes import ReadYourWritesMiddleware
+from app.middlewares.server_timing import ServerTimingMiddleware
+from app.core.instrumentation import install_query_instrumentation
+from app.core.metrics import flush_metrics_periodically, registry
+from app.core.slow_queries import install_slow_query_log
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.database import SessionLocal, pool_timeout_handler
+from app.core.serialization import FastJSONResponse
+from app.services.catalog.snapshot import snapshot_scheduler
+from app.services.maintenance.partitions import ensure_partitions
+from app.core.settings import get_settings
 
 
-app = FastAPI(title="Evoltronic Store API", version="1.0.0")
+settings = get_settings()
 
+
+def _create_upcoming_partitions():
+    session = SessionLocal()
+    try:
+        ensure_partitions(session)
+    except Exception as e:
+        logging.error(f"No se pudieron crear las particiones de pedidos: {e}")
+    finally:
+        session.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Las particiones de los próximos meses existen antes de recibir pedidos; el comando
+    # manage_partitions las mantiene si el proceso no se reinicia en meses. Un bloqueo
+    # consultivo evita que los workers que arrancan a la vez creen las mismas particiones
+    if settings.ORDER_PARTITION_AUTO_CREATE:
+        await run_in_threadpool(_create_upcoming_partitions)
+
+    # Instantánea del catálogo al arrancar; después se regenera con cada cambio
+    if settings.CATALOG_SNAPSHOT_ENABLED:
+        await run_in_threadpool(snapshot_scheduler.generate)
+
+    # Con varios workers, cada uno publica sus métricas para que /metrics las agregue
+    flush_task = None
+    if settings.METRICS_DIR:
+        flush_task = asyncio.create_task(
+            flush_metrics_periodically(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+        )
+
+    yield
+
+    if flush_task is not None:
+        flush_task.cancel()
+        registry.write_snapshot(settings.METRICS_DIR)
+
+
+app = FastAPI(
+    title="Evoltronic Store API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
+
+# Instrumentación de las sentencias SQL
+install_query_instrumentation()
+install_slow_query_log()
+
+# Perfilado bajo demanda (por dentro de la autenticación, necesita el usuario)
+app.add_middleware(ProfilerMiddleware)
+# Lecturas del primario tras una escritura (también necesita el usuario)
+app.add_middleware(ReadYourWritesMiddleware)
 # Middleware de autenticación
 app.add_middleware(AuthenticationMiddleware)
+# Cabecera Server-Timing (envuelve la autenticación para medirla)
+app.add_middleware(ServerTimingMiddleware)
+# Métricas SQL por petición (envuelve también la consulta de autenticación)
+app.add_middleware(QueryStatsMiddleware)
+# Control de admisión antes de cualquier trabajo (autenticación incluida)
+app.add_middleware(AdmissionControlMiddleware)
+# Compresión gzip/brotli de las respuestas (la latencia medida incluye la compresión)
+app.add_middleware(CompressionMiddleware)
+# Métricas de latencia y códigos de estado por ruta
+app.add_middleware(MetricsMiddleware)
+# Sin conexión libre en el pool: 503 con Retry-After
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
 # Rutas de la aplicación
 app.include_router(api_router)
 
@@ -16,4 +100,4 @@ async def root():
 
 
 
- 
\ No newline at end of file
+
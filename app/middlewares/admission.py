@@ -0,0 +1,46 @@
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.admission import admission_controller, match_route, route_group
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+class AdmissionControlMiddleware:
+    """
+        Limita las peticiones en curso por worker y por grupo de rutas (auth, catalog,
+        orders, admin) para que una base de datos lenta no acumule corrutinas sin límite.
+
+        Cuando no hay plaza la petición espera en una cola acotada donde los pedidos pasan
+        antes que el catálogo; si la cola está llena o la espera supera
+        ADMISSION_QUEUE_TIMEOUT, responde 503 con `Retry-After` sin ejecutar nada más.
+
+        Es un middleware ASGI puro: la plaza se libera cuando la aplicación termina de
+        enviar la respuesta, incluido el cuerpo de las respuestas en streaming, o cuando
+        falla. Con BaseHTTPMiddleware se liberaría al obtener las cabeceras.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(match_route(scope["app"].router.routes, scope))
+        limiters = await admission_controller.admit(group)
+        if limiters is None:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Servidor saturado, inténtalo de nuevo en unos segundos."},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_controller.release(limiters)
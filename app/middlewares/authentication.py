@@ -2,7 +2,8 @@ from fastapi.responses import JSONResponse
 from pytest import Session
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi import Request, HTTPException
-from app.core.database import get_session
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.database import get_session, pool_timeout_response
 from app.dependencies.user import get_current_user
 
 
@@ -29,9 +30,8 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             return await call_next(request)  
         token = auth_header.split(" ")[1]  
 
-        session: Session = next(get_session()) 
-
         try:
+            session: Session = next(get_session()) 
 
             user = await get_current_user(token, session)
             request.state.user = user  
@@ -48,8 +48,11 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
             # Aquí es donde capturamos la excepción y la devolvemos con un código adecuado
             return JSONResponse(
                 status_code=e.status_code,
-                content={"detail": e.detail}
+                content={"detail": e.detail},
+                headers=e.headers
             )
+        except PoolTimeoutError:
+            return pool_timeout_response()
         except Exception as e:
             # Manejo de errores generales
             return JSONResponse(
@@ -0,0 +1,58 @@
+import anyio.to_thread
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from app.core.compression import COMPRESSIBLE_TYPES, choose_encoding, compress, reset_accepted_encoding, set_accepted_encoding
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+async def _single_chunk(body: bytes):
+    yield body
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """
+        Comprime las respuestas JSON y de texto con brotli o gzip según `Accept-Encoding`.
+
+        Solo se comprimen las respuestas con `Content-Length` (no las de streaming ni los
+        ficheros) de al menos COMPRESSION_MIN_SIZE bytes. Las que ya traen `Content-Encoding`,
+        como las de la caché del catálogo (`PrecompressedBody`), se envían tal cual. Los cuerpos
+        de COMPRESSION_THREAD_MIN_SIZE bytes o más se comprimen en un hilo, fuera del event loop.
+    """
+    async def dispatch(self, request: Request, call_next):
+
+        if not settings.COMPRESSION_ENABLED or request.method == "HEAD":
+            return await call_next(request)
+
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        token = set_accepted_encoding(encoding)
+        try:
+            response = await call_next(request)
+        finally:
+            reset_accepted_encoding(token)
+
+        length = response.headers.get("content-length")
+        if (
+            "content-encoding" in response.headers
+            or length is None
+            or int(length) < settings.COMPRESSION_MIN_SIZE
+            or not response.headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        vary = response.headers.get("vary")
+        response.headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        if encoding is None:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        if len(body) >= settings.COMPRESSION_THREAD_MIN_SIZE:
+            body = await anyio.to_thread.run_sync(compress, body, encoding)
+        else:
+            body = compress(body, encoding)
+        response.body_iterator = _single_chunk(body)
+        response.headers["Content-Encoding"] = encoding
+        response.headers["Content-Length"] = str(len(body))
+        return response
@@ -0,0 +1,27 @@
+import time
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from app.core.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """
+        Registra la latencia y el código de estado de cada petición.
+
+        La ruta se etiqueta con su plantilla (por ejemplo `/products/{product_id}`) y no con
+        la URL real, para que el número de series no crezca con cada id. Las peticiones
+        que no coinciden con ninguna ruta se agrupan en `unmatched`.
+    """
+    async def dispatch(self, request: Request, call_next):
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUESTS.inc(request.method, route_path, str(status))
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, request.method, route_path)
@@ -0,0 +1,52 @@
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from app.core.profiling import reset_thread_profiles, save_profile, start_thread_profiles, stop_profile, try_start_profile
+from app.core.settings import get_settings
+from app.dependencies.admin import user_is_admin
+
+
+settings = get_settings()
+
+
+class ProfilerMiddleware(BaseHTTPMiddleware):
+    """
+        Perfila una petición con cProfile cuando un administrador envía la cabecera
+        PROFILE_HEADER.
+
+        El perfil se guarda en PROFILE_DIR y su identificador se devuelve en la cabecera
+        `X-Profile-Id`; se consulta en `/admin/profiles/{profile_id}`. Sin la cabecera el
+        middleware solo comprueba su presencia.
+
+        Se registra por dentro del middleware de autenticación para conocer el usuario.
+        cProfile mide el hilo del event loop, así que el perfil incluye también el trabajo
+        de otras peticiones concurrentes. Los servicios se ejecutan en los hilos de los
+        bulkheads: cada hilo que trabaja para esta petición se perfila por separado
+        (`profile_thread`) y su perfil se une al guardado.
+    """
+    async def dispatch(self, request: Request, call_next):
+
+        if settings.PROFILE_HEADER not in request.headers:
+            return await call_next(request)
+
+        if not user_is_admin(getattr(request.state, "user", None)):
+            return await call_next(request)
+
+        profiler = try_start_profile()
+        if profiler is None:
+            response = await call_next(request)
+            response.headers["X-Profile-Id"] = "busy"
+            return response
+
+        thread_profiles, token = start_thread_profiles()
+        try:
+            response = await call_next(request)
+        finally:
+            stop_profile(profiler)
+            reset_thread_profiles(token)
+
+        profile_id = save_profile(
+            profiler, settings.PROFILE_DIR, request.method, request.url.path, settings.PROFILE_MAX_FILES,
+            thread_profiles
+        )
+        response.headers["X-Profile-Id"] = profile_id
+        return response
@@ -0,0 +1,69 @@
+import json
+import logging
+import time
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from app.core.instrumentation import reset_request_stats, start_request_stats
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+logger = logging.getLogger("app.sql")
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+        Mide las sentencias SQL que ejecuta cada petición.
+
+        Siempre avisa en el log de los posibles patrones N+1 (la misma sentencia repetida
+        con parámetros distintos). Con DEBUG activo, además registra un log estructurado
+        por petición y añade las cabeceras:
+
+            - X-DB-Query-Count: número de sentencias.
+            - X-DB-Time: tiempo total en base de datos (ms).
+            - X-DB-Slowest: duración de la sentencia más lenta (ms).
+            - X-DB-N-Plus-One: número de sentencias sospechosas de N+1.
+    """
+    async def dispatch(self, request: Request, call_next):
+
+        stats, token = start_request_stats()
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            reset_request_stats(token)
+
+        suspects = stats.n_plus_one(settings.N_PLUS_ONE_THRESHOLD)
+
+        if suspects:
+            logger.warning(json.dumps({
+                "event": "n_plus_one",
+                "method": request.method,
+                "path": request.url.path,
+                "statements": [
+                    {"statement": " ".join(item["statement"].split())[:300], "count": item["count"]}
+                    for item in suspects
+                ]
+            }))
+
+        if settings.DEBUG:
+            logger.info(json.dumps({
+                "event": "request_sql",
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "query_count": stats.query_count,
+                "db_time_ms": round(stats.db_time * 1000, 3),
+                "slowest_ms": round(stats.slowest_time * 1000, 3),
+                "slowest_statement": " ".join((stats.slowest_statement or "").split())[:300],
+                "n_plus_one": len(suspects)
+            }))
+
+            response.headers["X-DB-Query-Count"] = str(stats.query_count)
+            response.headers["X-DB-Time"] = f"{stats.db_time * 1000:.3f}"
+            response.headers["X-DB-Slowest"] = f"{stats.slowest_time * 1000:.3f}"
+            response.headers["X-DB-N-Plus-One"] = str(len(suspects))
+
+        return response
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Dict
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from app.core.database import replica_set
+from app.core.replicas import get_primary_pin, reset_primary_pin, start_primary_pin
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+        Fija en el primario las lecturas de quien acaba de escribir, para que no vea
+        datos antiguos de una réplica con retraso.
+
+        Cuando una petición confirma una escritura, durante REPLICA_PIN_SECONDS las
+        lecturas del mismo usuario (por id, en este worker) y del mismo cliente (cookie
+        REPLICA_PIN_COOKIE, válida en cualquier worker) usan el primario.
+
+        Se registra por dentro del middleware de autenticación para conocer el usuario.
+        Sin réplicas configuradas no hace nada.
+    """
+    def __init__(self, app):
+        super().__init__(app)
+        self._writers: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def _is_pinned(self, request: Request, now: float) -> bool:
+        try:
+            if float(request.cookies.get(settings.REPLICA_PIN_COOKIE, 0)) > now:
+                return True
+        except ValueError:
+            pass
+        user = getattr(request.state, "user", None)
+        return user is not None and self._writers.get(user.id, 0) > now
+
+    def _remember_writer(self, request: Request, until: float, now: float):
+        user = getattr(request.state, "user", None)
+        if user is None:
+            return
+        with self._lock:
+            self._writers[user.id] = until
+            expired = [user_id for user_id, expiry in self._writers.items() if expiry <= now]
+            for user_id in expired:
+                del self._writers[user_id]
+
+    async def dispatch(self, request: Request, call_next):
+
+        if not replica_set:
+            return await call_next(request)
+
+        now = time.time()
+        token = start_primary_pin(self._is_pinned(request, now))
+        try:
+            response = await call_next(request)
+            pin = get_primary_pin()
+        finally:
+            reset_primary_pin(token)
+
+        if pin.wrote:
+            until = now + settings.REPLICA_PIN_SECONDS
+            self._remember_writer(request, until, now)
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                f"{until:.3f}",
+                max_age=int(settings.REPLICA_PIN_SECONDS) + 1,
+                httponly=True,
+                samesite="lax"
+            )
+
+        return response
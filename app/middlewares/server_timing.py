@@ -0,0 +1,44 @@
+import time
+from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from app.core.instrumentation import get_request_stats
+from app.core.settings import get_settings
+from app.core.timing import reset_server_timing, start_server_timing
+from app.dependencies.admin import user_is_admin
+
+
+settings = get_settings()
+
+
+class ServerTimingMiddleware(BaseHTTPMiddleware):
+    """
+        Añade la cabecera estándar `Server-Timing` con el desglose de la petición
+        (auth, deps, app, serialize, db y total).
+
+        Se activa para todas las peticiones con SERVER_TIMING_ENABLED, o para una petición
+        concreta enviando la cabecera SERVER_TIMING_HEADER con un usuario administrador.
+        Si no está activo, no se mide nada.
+    """
+    async def dispatch(self, request: Request, call_next):
+
+        requested = settings.SERVER_TIMING_HEADER in request.headers
+        if not settings.SERVER_TIMING_ENABLED and not requested:
+            return await call_next(request)
+
+        timing, token = start_server_timing()
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            reset_server_timing(token)
+
+        if not settings.SERVER_TIMING_ENABLED and not user_is_admin(getattr(request.state, "user", None)):
+            return response
+
+        stats = get_request_stats()
+        if stats is not None:
+            timing.add("db", stats.db_time, f"{stats.query_count} queries")
+        timing.add("total", time.perf_counter() - start)
+
+        response.headers["Server-Timing"] = timing.header_value()
+        return response
@@ -1,11 +1,12 @@
 from sqlalchemy.orm import relationship
 from app.core.database import Base
-from sqlalchemy import  Column, Integer, String, Text, TIMESTAMP
+from app.core.soft_delete import SoftDeleteMixin
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP
 from sqlalchemy.sql import func
 
 
 
-class Category(Base):
+class Category(SoftDeleteMixin, Base):
     """
     Representa una categoría de productos.
 
@@ -21,11 +22,11 @@ class Category(Base):
         products (list[Product]): Productos asociados a esta categoría.
     """
     __tablename__ = "categories"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text)
-    deleted_at = Column(TIMESTAMP, nullable=True)  
     created_at = Column(TIMESTAMP, default=func.current_timestamp(), nullable=False)  
     updated_at = Column(TIMESTAMP, default=func.current_timestamp(), onupdate=func.current_timestamp(), nullable=False)  
     
@@ -1,20 +1,21 @@
 from sqlalchemy.orm import relationship
 from app.core.database import Base
-from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, String, TIMESTAMP
+from app.core.soft_delete import SoftDeleteMixin
+from sqlalchemy import DECIMAL, Column, ForeignKey, Index, Integer, String, TIMESTAMP, text
 from sqlalchemy.sql import func
 
 
-class Order(Base):
+class Order(SoftDeleteMixin, Base):
     """
     Representa una orden de compra realizada por un usuario.
 
     Atributos:
-        id (int): Identificador único de la orden.
+        id (int): Identificador único de la orden (clave primaria junto con created_at).
         user_id (int): ID del usuario que realizó la orden.
         total_price (Decimal): Precio total de la orden.
         status (str): Estado actual de la orden (por ejemplo, 'pendiente').
         deleted_at (datetime, opcional): Fecha de eliminación lógica.
-        created_at (datetime): Fecha de creación de la orden.
+        created_at (datetime): Fecha de creación de la orden; es la columna de partición.
         updated_at (datetime): Fecha de última actualización de la orden.
 
     Relaciones:
@@ -22,13 +23,18 @@ class Order(Base):
     """
     
     __tablename__ = "orders"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        Index("ix_orders_created_at_live", "created_at", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_orders_user_id_created_at_live", "user_id", "created_at", postgresql_where=text("deleted_at IS NULL")),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # La clave primaria de una tabla particionada incluye la columna de partición
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     total_price = Column(DECIMAL(10, 2), nullable=False)
     status = Column(String(50), nullable=False, default="pendiente")
-    deleted_at = Column(TIMESTAMP, nullable=True)  
-    created_at = Column(TIMESTAMP, default=func.current_timestamp(), nullable=False)  
+    created_at = Column(TIMESTAMP, primary_key=True, default=func.current_timestamp(), nullable=False)
     updated_at = Column(TIMESTAMP, default=func.current_timestamp(), onupdate=func.current_timestamp(), nullable=False)  
     
     order_items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="joined")
\ No newline at end of file
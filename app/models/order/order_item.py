@@ -1,15 +1,17 @@
 from sqlalchemy.orm import relationship
 from app.core.database import Base
-from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, TIMESTAMP
+from app.core.soft_delete import SoftDeleteMixin
+from sqlalchemy import DECIMAL, TIMESTAMP, Column, ForeignKey, ForeignKeyConstraint, Integer, Index, text
 
 
-class OrderItem(Base):
+class OrderItem(SoftDeleteMixin, Base):
     """
     Representa un artículo en un pedido.
 
     Atributos:
-        id (int): Identificador único del artículo del pedido.
+        id (int): Identificador único del artículo del pedido (clave primaria junto con order_created_at).
         order_id (int): ID del pedido al que pertenece.
+        order_created_at (datetime): Fecha de creación del pedido; es la columna de partición.
         product_id (int): ID del producto en el artículo.
         quantity (int): Cantidad de productos en el artículo.
         subtotal (Decimal): Subtotal por el artículo (precio * cantidad).
@@ -20,13 +22,19 @@ class OrderItem(Base):
         product (Product): Producto asociado a este artículo.
     """
     __tablename__ = "order_items"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "order_created_at"], ["orders.id", "orders.created_at"], ondelete="CASCADE"
+        ),
+        Index("ix_order_items_order_id_live", "order_id", postgresql_where=text("deleted_at IS NULL")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"))
-    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"))
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    order_id = Column(Integer, index=True)
+    order_created_at = Column(TIMESTAMP, primary_key=True, nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), index=True)
     quantity = Column(Integer, nullable=False)
     subtotal = Column(DECIMAL(10, 2), nullable=False)
-    deleted_at = Column(TIMESTAMP, nullable=True)  
 
     order = relationship("Order", back_populates="order_items", lazy="joined")
     product = relationship("Product", back_populates="order_items", lazy="joined")
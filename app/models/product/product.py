@@ -1,10 +1,11 @@
 from sqlalchemy.orm import relationship
 from app.core.database import Base
-from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, String, Text, Boolean, TIMESTAMP
+from app.core.soft_delete import SoftDeleteMixin
+from sqlalchemy import DECIMAL, Column, ForeignKey, Integer, String, Text, Boolean, TIMESTAMP, Index, text
 from sqlalchemy.sql import func
 
 
-class Product(Base):
+class Product(SoftDeleteMixin, Base):
 
     """
     Representa un producto disponible para la venta en la tienda.
@@ -26,14 +27,20 @@ class Product(Base):
     """
     
     __tablename__ = "products"
+    __mapper_args__ = {"eager_defaults": True}
+    # Los pedidos siguen mostrando el producto aunque se haya eliminado
+    filter_deleted_in_relationships = False
+    __table_args__ = (
+        Index("ix_products_name_live", "name", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_products_category_id_live", "category_id", postgresql_where=text("deleted_at IS NULL")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text)
     price = Column(DECIMAL(10, 2), nullable=False)
     stock = Column(Integer, default=0, nullable=False)
-    category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
-    deleted_at = Column(TIMESTAMP, nullable=True)  
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True, index=True)
     created_at = Column(TIMESTAMP, default=func.current_timestamp(), nullable=False)  
     updated_at = Column(TIMESTAMP, default=func.current_timestamp(), onupdate=func.current_timestamp(), nullable=False)  
     
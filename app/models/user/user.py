@@ -31,6 +31,7 @@ class User(Base):
     """
     
     __tablename__ = 'users'  
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True) 
     username = Column(String(100),nullable=False) 
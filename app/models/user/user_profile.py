@@ -3,9 +3,10 @@ from sqlalchemy import Column, Integer, String, TIMESTAMP
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, mapped_column
 from app.core.database import Base
+from app.core.soft_delete import SoftDeleteMixin
 
 
-class UserProfile(Base):
+class UserProfile(SoftDeleteMixin, Base):
     """
     Representa el perfil de usuario con información adicional asociada al usuario.
 
@@ -28,6 +29,7 @@ class UserProfile(Base):
         user (User): El usuario asociado a este perfil.
     """
     __tablename__ = "user_profiles"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
@@ -44,5 +46,4 @@ class UserProfile(Base):
 
     created_at = Column(TIMESTAMP, default=func.current_timestamp(), nullable=False)
     updated_at = Column(TIMESTAMP, default=func.current_timestamp(), onupdate=func.current_timestamp(), nullable=False)
-    deleted_at = Column(TIMESTAMP, nullable=True)
     
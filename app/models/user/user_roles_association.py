@@ -17,7 +17,7 @@ user_roles_association = Table(
     
     "user_roles_association",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
     Column("role_id", Integer, ForeignKey("user_roles.id"))
 )
 
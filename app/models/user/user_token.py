@@ -20,6 +20,7 @@ class UserToken(Base):
     """
     
     __tablename__ = "user_tokens"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = mapped_column(ForeignKey('users.id'))
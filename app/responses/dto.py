@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+
+# DTOs de solo lectura para los listados: se construyen a partir de filas de la base de
+# datos, que ya son válidas, sin pasar por la validación de pydantic. Tienen los mismos
+# campos que los modelos de `app.responses` correspondientes y se serializan con
+# `app.core.serialization.FastJSONResponse`.
+
+
+@dataclass
+class OrderItemDTO:
+    product_id: int
+    name: Optional[str]
+    quantity: int
+    subtotal: Decimal
+
+
+@dataclass
+class OrderDTO:
+    id: int
+    user_id: int
+    total_price: Decimal
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    order_items: List[OrderItemDTO]
+
+
+@dataclass
+class ProductDTO:
+    name: str
+    description: Optional[str]
+    price: Decimal
+    stock: int
+    category_id: int
+
+
+@dataclass
+class CategoryDTO:
+    id: int
+    name: str
+    description: str
+    updated_at: datetime
@@ -0,0 +1,40 @@
+from typing import Any, List, Optional
+from app.responses.base import BaseResponse
+
+
+class SlowQueryResponse(BaseResponse):
+    statement: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    callers: List[str]
+    parameters: Optional[Any] = None
+    plan: Optional[str] = None
+    last_seen: Optional[str] = None
+
+
+class PoolStatusResponse(BaseResponse):
+    pool: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+
+
+class BulkheadStatusResponse(BaseResponse):
+    name: str
+    max_workers: int
+    active: int
+    queued: int
+    utilization: float
+
+
+class ReplicaStatusResponse(BaseResponse):
+    name: str
+    lag_seconds: Optional[float] = None
+    healthy: bool
+    checked_seconds_ago: Optional[float] = None
+    error: Optional[str] = None
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from datetime import datetime
+from decimal import Decimal
 from app.responses.base import BaseResponse
 
 
@@ -7,13 +8,13 @@ class OrderItemResponse(BaseResponse):
     product_id: int
     name: Optional[str] 
     quantity: int
-    subtotal: float
+    subtotal: Decimal
 
 
 class OrderResponse(BaseResponse):
     id: int
     user_id: int
-    total_price: float
+    total_price: Decimal
     status: str
     created_at: datetime
     updated_at: datetime
@@ -24,7 +25,7 @@ class OrderResponse(BaseResponse):
 class OrderDeleteResponse(BaseResponse):
     id: int
     user_id: int
-    total_price: float
+    total_price: Decimal
     status: str
 
     order_items: List[OrderItemResponse] 
@@ -1,5 +1,6 @@
 
 from decimal import Decimal
+from typing import List, Optional
 from app.responses.base import BaseResponse
 
 class ProductResponse(BaseResponse):
@@ -7,4 +8,41 @@ class ProductResponse(BaseResponse):
     description: str
     price: Decimal
     stock: int
-    category_id: int
\ No newline at end of file
+    category_id: int
+
+
+class ProductItemResponse(ProductResponse):
+    id: int
+    description: Optional[str] = None
+    category_id: Optional[int] = None
+
+
+class ProductBatchResponse(BaseResponse):
+    products: List[ProductItemResponse]
+    missing: List[int]
+
+
+
+class ProductImportError(BaseResponse):
+    line: int
+    detail: str
+
+
+class ProductImportResponse(BaseResponse):
+    received: int
+    inserted: int
+    updated: int
+    rejected: int
+    errors: List[ProductImportError]
+
+
+
+class ProductBulkUpdateResult(BaseResponse):
+    id: int
+    status: str
+
+
+class ProductBulkUpdateResponse(BaseResponse):
+    updated: int
+    not_found: int
+    results: List[ProductBulkUpdateResult]
@@ -1,7 +1,11 @@
 from decimal import Decimal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional
 from datetime import datetime
+from app.core.settings import get_settings
+
+
+settings = get_settings()
 
 
 class ProductCreateRequest(BaseModel):   
@@ -22,4 +26,36 @@ class ProductUpdateRequest(BaseModel):
 class ProductResponseRequest(BaseModel):
     id: int
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+
+class ProductBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+
+
+
+class ProductImportRow(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    price: Decimal = Field(..., gt=0, max_digits=10, decimal_places=2)
+    stock: int = Field(0, ge=0)
+    category_id: int
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+
+class ProductBulkUpdateItem(BaseModel):
+    id: int
+    price: Optional[Decimal] = Field(None, gt=0, max_digits=10, decimal_places=2)
+    stock: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if self.price is None and self.stock is None:
+            raise ValueError("Indica al menos price o stock.")
+        return self
+
+
+class ProductBulkUpdateRequest(BaseModel):
+    items: List[ProductBulkUpdateItem] = Field(..., min_length=1, max_length=settings.PRODUCT_BULK_UPDATE_MAX_ITEMS)
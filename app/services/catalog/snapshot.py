@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Optional, Tuple
+from app.core.compression import brotli
+from app.core.database import SessionLocal
+from app.core.serialization import dumps
+from app.core.settings import get_settings
+from app.models.category.category import Category
+from app.models.product.product import Product
+from app.responses.dto import CategoryDTO
+
+
+settings = get_settings()
+
+# Fichero con la versión de la instantánea vigente
+CURRENT_FILE = "current"
+
+# Variantes precomprimidas de cada instantánea (extensión, Content-Encoding)
+VARIANTS = ((".br", "br"), (".gz", "gzip"))
+
+
+def snapshot_path(directory: str, version: str) -> str:
+    return os.path.join(directory, f"catalog-{version}.json")
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def build_snapshot(session) -> bytes:
+    """
+    Serializa el catálogo completo (categorías y productos vivos) a JSON.
+    """
+    categories = session.query(Category).order_by(Category.id).all()
+    products = session.query(
+        Product.id,
+        Product.name,
+        Product.description,
+        Product.price,
+        Product.stock,
+        Product.category_id
+    ).order_by(Product.id).all()
+
+    return dumps({
+        "categories": [
+            CategoryDTO(
+                id=category.id,
+                name=category.name,
+                description=category.description,
+                updated_at=category.updated_at
+            ) for category in categories
+        ],
+        "products": [dict(product._mapping) for product in products]
+    })
+
+
+def write_snapshot(session, directory: Optional[str] = None, keep: Optional[int] = None) -> str:
+    """
+    Escribe una nueva instantánea del catálogo y la marca como vigente.
+
+    La versión es el hash del contenido, así que sirve directamente como ETag fuerte y
+    un catálogo sin cambios no genera ficheros nuevos. Junto al JSON se escriben sus
+    versiones gzip y brotli (si está instalado) con la máxima compresión, que solo se
+    paga una vez por versión. Se conservan las `keep` últimas versiones para no borrar
+    un fichero que se esté enviando.
+
+    Returns:
+       - str: Versión de la instantánea vigente.
+    """
+    directory = directory or settings.CATALOG_SNAPSHOT_DIR
+    keep = settings.CATALOG_SNAPSHOT_KEEP if keep is None else keep
+    os.makedirs(directory, exist_ok=True)
+
+    body = build_snapshot(session)
+    version = hashlib.sha256(body).hexdigest()[:16]
+    path = snapshot_path(directory, version)
+
+    if not os.path.exists(path):
+        _write_atomic(f"{path}.gz", gzip.compress(body, compresslevel=9))
+        if brotli is not None:
+            _write_atomic(f"{path}.br", brotli.compress(body, quality=11))
+        # El JSON sin comprimir se escribe el último: su existencia indica que la versión está completa
+        _write_atomic(path, body)
+
+    _write_atomic(os.path.join(directory, CURRENT_FILE), version.encode())
+    _prune(directory, keep, version)
+    return version
+
+
+def _prune(directory: str, keep: int, current: str):
+    snapshots = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.startswith("catalog-") and entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in snapshots[max(keep, 1):]:
+        if entry.name == f"catalog-{current}.json":
+            continue
+        for suffix in ("", ".gz", ".br"):
+            try:
+                os.remove(entry.path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def current_snapshot(directory: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """
+    Versión vigente y ruta de su JSON, o None si todavía no hay instantánea.
+    """
+    directory = directory or settings.CATALOG_SNAPSHOT_DIR
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), "rb") as f:
+            version = f.read().decode().strip()
+    except FileNotFoundError:
+        return None
+
+    path = snapshot_path(directory, version)
+    return (version, path) if version and os.path.exists(path) else None
+
+
+class SnapshotScheduler:
+    """
+    Regenera la instantánea del catálogo en segundo plano tras cada cambio de productos
+    o categorías, agrupando los cambios seguidos.
+
+    Cada `schedule()` retrasa la generación `debounce` segundos, pero nunca más de
+    `max_delay` desde el primer cambio pendiente, para que una importación larga no la
+    aplace indefinidamente. Las generaciones no se solapan.
+    """
+
+    def __init__(self, debounce: float, max_delay: float):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._timer: Optional[threading.Timer] = None
+        self._pending_since: Optional[float] = None
+        self._lock = threading.Lock()
+        self._generate_lock = threading.Lock()
+
+    def schedule(self):
+        if not settings.CATALOG_SNAPSHOT_ENABLED:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if self._pending_since is None:
+                self._pending_since = now
+            delay = min(self.debounce, max(self._pending_since + self.max_delay - now, 0))
+
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self):
+        with self._lock:
+            self._timer = None
+            self._pending_since = None
+        self.generate()
+
+    def generate(self) -> Optional[str]:
+        with self._generate_lock:
+            session = SessionLocal()
+            try:
+                return write_snapshot(session)
+            except Exception as e:
+                logging.error(f"No se pudo generar la instantánea del catálogo: {e}")
+                return None
+            finally:
+                session.close()
+
+
+snapshot_scheduler = SnapshotScheduler(
+    debounce=settings.CATALOG_SNAPSHOT_DEBOUNCE,
+    max_delay=settings.CATALOG_SNAPSHOT_MAX_DELAY
+)
@@ -2,16 +2,24 @@
 from datetime import datetime, timezone
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
+from app.core.bulkhead import bulkhead
 from app.core.exceptions import CategoryNotFoundException, DatabaseErrorException, UnexpectedErrorException
 from app.models.category.category import  Category
+from app.core.cache import catalog_cache
+from app.core.replicas import read_from_replica
+from app.core.compression import PrecompressedBody
+from app.core.serialization import dumps
 from app.responses.category import  CategoryDeleteResponse, CategoryUpdateResponse
+from app.responses.dto import CategoryDTO
 from app.schemas.category import CategoryCreateRequest
-from sqlalchemy.exc import SQLAlchemyError
+from app.services.catalog.snapshot import snapshot_scheduler
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 import logging
 
 
 
-async def create_category(session, category_data: CategoryCreateRequest):
+@bulkhead("admin")
+def create_category(session, category_data: CategoryCreateRequest):
     """
     Crea una nueva categoría en la base de datos si no existe una con el mismo nombre.
 
@@ -29,7 +37,8 @@ async def create_category(session, category_data: CategoryCreateRequest):
     """
     try:
         
-        existing_category = session.query(Category).filter(Category.name == category_data.name).first()
+        # El nombre es único también entre las categorías eliminadas
+        existing_category = session.query(Category).execution_options(include_deleted=True).filter(Category.name == category_data.name).first()
         if existing_category:
             raise HTTPException(status_code=400, detail="Categoría existe.")
         new_category = Category(
@@ -39,7 +48,8 @@ async def create_category(session, category_data: CategoryCreateRequest):
 
         session.add(new_category)
         session.commit()
-        session.refresh(new_category)   
+        catalog_cache.invalidate("catalog_response", ["categories"])
+        snapshot_scheduler.schedule()
             
         return new_category
     
@@ -49,6 +59,9 @@ async def create_category(session, category_data: CategoryCreateRequest):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -56,7 +69,8 @@ async def create_category(session, category_data: CategoryCreateRequest):
         )
 
 
-async def fetch_category_id(category_id, session):
+@bulkhead("catalog")
+def fetch_category_id(category_id, session):
     """Obtiene una categoría de la base de datos según su ID.
 
     Args:
@@ -89,6 +103,9 @@ async def fetch_category_id(category_id, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -96,14 +113,15 @@ async def fetch_category_id(category_id, session):
         )
 
 
-async def fetch_all_category(session):
+@bulkhead("catalog")
+def fetch_all_category(session):
     """Obtiene todas las categorías de la base de datos.
 
     Args:
        - session (Session): Sesión de base de datos.
 
     Returns:
-       - list: Lista de categorías.
+       - Response: Lista de categorías (CategoryDTO), servida desde la caché del catálogo.
 
     Raises:
        - CategoryNotFoundException: Si no se encuentran categorías.
@@ -112,10 +130,26 @@ async def fetch_all_category(session):
     """
 
     try:
+        version = catalog_cache.version("catalog_response")
+        cached = catalog_cache.get("catalog_response", "categories")
+        if cached is not None:
+            return cached.response()
+
         categories = session.query(Category).all()
         
         if categories:
-            return categories
+            body = PrecompressedBody(dumps([
+                CategoryDTO(
+                    id=category.id,
+                    name=category.name,
+                    description=category.description,
+                    updated_at=category.updated_at
+                ) for category in categories
+            ]))
+            # Una réplica con retraso guardaría datos anteriores a la última escritura
+            if not read_from_replica(session):
+                catalog_cache.set("catalog_response", "categories", body, version)
+            return body.response()
         else:
             raise CategoryNotFoundException()
 
@@ -125,6 +159,9 @@ async def fetch_all_category(session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -133,7 +170,8 @@ async def fetch_all_category(session):
     
     
     
-async def update_categpry_id(category_id, session,category_data: CategoryCreateRequest):
+@bulkhead("admin")
+def update_categpry_id(category_id, session,category_data: CategoryCreateRequest):
     
     """Actualiza los datos de una categoría existente.
 
@@ -162,7 +200,8 @@ async def update_categpry_id(category_id, session,category_data: CategoryCreateR
         category.updated_at = datetime.now(timezone.utc)
 
         session.commit()
-        session.refresh(category)
+        catalog_cache.invalidate("catalog_response", ["categories"])
+        snapshot_scheduler.schedule()
 
 
         return CategoryUpdateResponse(
@@ -178,6 +217,9 @@ async def update_categpry_id(category_id, session,category_data: CategoryCreateR
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -185,7 +227,8 @@ async def update_categpry_id(category_id, session,category_data: CategoryCreateR
         )
 
 
-async def delete_category(category_id,session):
+@bulkhead("admin")
+def delete_category(category_id,session):
     
     """Realiza el borrado lógico de una categoría, marcando `deleted_at` con la fecha actual.
 
@@ -203,7 +246,7 @@ async def delete_category(category_id,session):
     """
 
     try:
-        category = session.query(Category).filter(Category.id == category_id).first()
+        category = session.query(Category).execution_options(include_deleted=True).filter(Category.id == category_id).first()
         if not category:
             raise HTTPException(status_code=404, detail="Categoria no encontrada")
             
@@ -216,6 +259,8 @@ async def delete_category(category_id,session):
 
         category.deleted_at = datetime.now(timezone.utc)
         session.commit()
+        catalog_cache.invalidate("catalog_response", ["categories"])
+        snapshot_scheduler.schedule()
 
         return deleted_category 
 
@@ -225,6 +270,9 @@ async def delete_category(category_id,session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -10,7 +10,7 @@ settings = get_settings()
 
 
 
-async def send_account_verification_email(user: User, background_tasks: BackgroundTasks):
+def send_account_verification_email(user: User, background_tasks: BackgroundTasks):
     from app.core.security import hash_password
     print("Preparando el correo de verificación para el usuario %s", user.email)
     
@@ -30,7 +30,7 @@ async def send_account_verification_email(user: User, background_tasks: Backgrou
         print("Datos preparados para el correo de verificación")
 
         # Llamar al envío del correo
-        await send_email(
+        send_email(
             recipients=[user.email],
             subject=subject,
             template_name="user/account-verification.html",
@@ -42,14 +42,14 @@ async def send_account_verification_email(user: User, background_tasks: Backgrou
     except Exception as e:
        print("Error al enviar el correo de verificación a %s: %s", user.email, str(e))
     
-async def send_account_activation_confirmation_email(user: User, background_tasks: BackgroundTasks):
+def send_account_activation_confirmation_email(user: User, background_tasks: BackgroundTasks):
     data = {
         'app_name': settings.APP_NAME,
         'username': user.username,
         'login_url': f'{settings.FRONTEND_HOST}'
     }
     subject = f"Welcome - {settings.APP_NAME}"
-    await send_email(
+    send_email(
         recipients=[user.email],
         subject=subject,
         template_name="user/account-verification-confirmation.html",
@@ -58,7 +58,7 @@ async def send_account_activation_confirmation_email(user: User, background_task
     )
     
 
-async def send_password_reset_email(user: User, background_tasks: BackgroundTasks):
+def send_password_reset_email(user: User, background_tasks: BackgroundTasks):
     from app.core.security import hash_password
     string_context = user.get_context_string(context=FORGOT_PASSWORD)
     token = hash_password(string_context)
@@ -69,7 +69,7 @@ async def send_password_reset_email(user: User, background_tasks: BackgroundTask
         'activate_url': reset_url,
     }
     subject = f"Reset Password - {settings.APP_NAME}"
-    await send_email(
+    send_email(
         recipients=[user.email],
         subject=subject,
         template_name="user/password-reset.html",
@@ -0,0 +1,162 @@
+import gzip
+import logging
+import os
+import re
+from datetime import date
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+# Tablas particionadas por mes de la fecha del pedido. Los artículos van primero al archivar: su
+# clave foránea referencia la partición del pedido, que no se puede separar mientras tanto.
+PARTITIONED_TABLES = ("order_items", "orders")
+
+# Bloqueo consultivo que serializa la creación de particiones entre los workers y cron
+PARTITIONS_LOCK_KEY = 7_214_305
+
+PARTITIONS_SQL = """
+    SELECT c.relname, i.inhrelid IS NOT NULL AS attached
+    FROM pg_class AS c
+    LEFT JOIN pg_inherits AS i ON i.inhrelid = c.oid AND i.inhparent = to_regclass(:table)
+    WHERE c.relkind = 'r'
+      AND c.relnamespace = 'public'::regnamespace
+      AND c.relname ~ :pattern
+"""
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def _partition_month(table: str, name: str) -> Optional[date]:
+    match = re.fullmatch(rf"{table}_(\d{{4}})_(\d{{2}})", name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def is_partitioned(session, table: str) -> bool:
+    relkind = session.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    return relkind == "p"
+
+
+def ensure_partitions(session, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """
+    Crea las particiones mensuales desde el mes actual hasta `months_ahead` meses después.
+
+    Todo se hace en una transacción con un bloqueo consultivo: si varios workers arrancan a
+    la vez, uno crea las particiones y los demás las encuentran ya creadas al obtenerlo.
+
+    Si una fila del rango ya ha caído en la partición por defecto, PostgreSQL rechaza la
+    nueva partición: el error se registra y se continúa con el resto.
+
+    Returns:
+       - list: Particiones creadas.
+    """
+    months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = (today or date.today()).replace(day=1)
+
+    session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITIONS_LOCK_KEY})
+
+    created = []
+    for table in reversed(PARTITIONED_TABLES):
+        if not is_partitioned(session, table):
+            continue
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(table, month)
+            if session.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+                continue
+            try:
+                with session.begin_nested():
+                    session.execute(text(
+                        f"CREATE TABLE {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                    ))
+            except Exception as e:
+                logging.error(f"No se pudo crear la partición {name}: {e}")
+                continue
+            created.append(name)
+
+    # El commit libera el bloqueo
+    session.commit()
+    for name in created:
+        logging.info(f"Partición {name} creada")
+
+    return created
+
+
+def _copy_to_archive(session, name: str, archive_dir: str) -> str:
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    cursor = session.connection().connection.cursor()
+    try:
+        with gzip.open(path, "wb") as archive:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", archive)
+            archive.flush()
+            os.fsync(archive.fileobj.fileno())
+    finally:
+        cursor.close()
+    return path
+
+
+def archive_old_partitions(session, retention_months: Optional[int] = None, archive_dir: Optional[str] = None,
+                           today: Optional[date] = None) -> Dict[str, dict]:
+    """
+    Separa, archiva y elimina las particiones mensuales anteriores a la retención.
+
+    Cada partición se separa de su tabla (DETACH PARTITION), se vuelca completa con COPY
+    a `archive_dir/<partición>.csv.gz` y solo después se elimina, confirmando por partición.
+    Si el proceso se interrumpe, la partición separada sigue existiendo y se completa en la
+    siguiente ejecución. Sin `archive_dir` las particiones se eliminan sin copia.
+
+    Args:
+       - session (Session): Sesión de base de datos.
+       - retention_months (int): Meses completos que se conservan además del actual (0 desactiva el archivado).
+       - archive_dir (str, opcional): Directorio de los ficheros archivados.
+
+    Returns:
+       - dict: Fichero y filas archivadas por partición.
+    """
+    retention_months = settings.ORDER_PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention_months <= 0:
+        return {}
+
+    cutoff = add_months((today or date.today()).replace(day=1), -retention_months)
+
+    archived = {}
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(session, table):
+            continue
+        partitions = session.execute(
+            text(PARTITIONS_SQL), {"table": table, "pattern": rf"^{table}_\d{{4}}_\d{{2}}$"}
+        ).all()
+
+        for name, attached in sorted(partitions):
+            month = _partition_month(table, name)
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+            try:
+                if attached:
+                    session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                    session.commit()
+                rows = session.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+                path = _copy_to_archive(session, name, archive_dir) if archive_dir else None
+                session.execute(text(f"DROP TABLE {name}"))
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            logging.info(f"Partición {name} archivada ({rows} filas) en {path}")
+            archived[name] = {"rows": rows, "archive": path}
+
+    return archived
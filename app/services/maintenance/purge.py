@@ -0,0 +1,164 @@
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import text
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+# Orden de purga: primero los hijos. Cada tabla solo borra filas que ya nadie referencia,
+# para no perder el histórico de pedidos (order_items -> products, ON DELETE CASCADE) ni
+# dejar productos sin categoría (products -> categories, ON DELETE SET NULL).
+PURGE_TABLES = {
+    "order_items": "",
+    "orders": "",
+    "products": "AND NOT EXISTS (SELECT 1 FROM order_items AS r WHERE r.product_id = t.id)",
+    "categories": "AND NOT EXISTS (SELECT 1 FROM products AS r WHERE r.category_id = t.id)",
+    "user_profiles": "",
+}
+
+PURGE_BATCH_SQL = """
+    WITH batch AS (
+        SELECT t.id FROM {table} AS t
+        WHERE t.deleted_at < :cutoff AND t.id > :last_id {condition}
+        ORDER BY t.id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM {table} AS t
+    USING batch
+    WHERE t.id = batch.id
+    RETURNING t.id, {row}
+"""
+
+COUNT_SQL = "SELECT count(*) FROM {table} AS t WHERE t.deleted_at < :cutoff {condition}"
+
+
+def _archive_path(directory: str, table: str, started_at: datetime) -> str:
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{table}-{started_at.strftime('%Y%m%d-%H%M%S')}.ndjson.gz")
+
+
+def purge_table(session, table: str, cutoff: datetime, batch_size: int, pause: float,
+                archive_dir: Optional[str] = None, started_at: Optional[datetime] = None) -> dict:
+    """
+    Borra físicamente las filas de `table` eliminadas antes de `cutoff`, por lotes.
+
+    Cada lote recorre la tabla por clave primaria (keyset, sin OFFSET), borra como mucho
+    `batch_size` filas con `DELETE ... RETURNING`, las archiva si se indica `archive_dir`
+    y confirma la transacción antes de esperar `pause` segundos. Así los bloqueos y el
+    volumen de WAL de cada transacción quedan acotados por el tamaño del lote. Las filas
+    bloqueadas por otra transacción se saltan y se purgarán en la siguiente ejecución.
+
+    Args:
+       - session (Session): Sesión de base de datos.
+       - table (str): Tabla a purgar (una de PURGE_TABLES).
+       - cutoff (datetime): Fecha límite de `deleted_at`.
+       - batch_size (int): Filas máximas por lote.
+       - pause (float): Segundos de espera entre lotes.
+       - archive_dir (str, opcional): Directorio donde guardar las filas borradas en NDJSON comprimido.
+
+    Returns:
+       - dict: Filas borradas, lotes ejecutados, segundos empleados y fichero de archivo.
+    """
+    statement = text(PURGE_BATCH_SQL.format(
+        table=table,
+        condition=PURGE_TABLES[table],
+        row="to_jsonb(t) AS row" if archive_dir else "NULL AS row"
+    ))
+
+    archive = None
+    archive_path = None
+    if archive_dir:
+        archive_path = _archive_path(archive_dir, table, started_at or datetime.now())
+        archive = gzip.open(archive_path, "at", encoding="utf-8")
+
+    deleted = 0
+    batches = 0
+    last_id = 0
+    start = time.monotonic()
+    try:
+        while True:
+            session.execute(text(f"SET LOCAL lock_timeout = {int(settings.PURGE_LOCK_TIMEOUT_MS)}"))
+            rows = session.execute(statement, {
+                "cutoff": cutoff,
+                "last_id": last_id,
+                "batch_size": batch_size
+            }).all()
+
+            if not rows:
+                session.commit()
+                break
+
+            if archive is not None:
+                for row in rows:
+                    archive.write(json.dumps(row.row, default=str) + "\n")
+                archive.flush()
+
+            session.commit()
+
+            deleted += len(rows)
+            batches += 1
+            last_id = max(row.id for row in rows)
+            logging.info(f"Purga de {table}: lote {batches}, {len(rows)} filas (total {deleted}, último id {last_id})")
+
+            if len(rows) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        if archive is not None:
+            archive.close()
+            if deleted == 0:
+                os.remove(archive_path)
+                archive_path = None
+
+    return {
+        "deleted": deleted,
+        "batches": batches,
+        "seconds": round(time.monotonic() - start, 3),
+        "archive": archive_path
+    }
+
+
+def count_purgeable(session, cutoff: datetime) -> Dict[str, int]:
+    """
+    Cuenta las filas que se purgarían con la fecha límite indicada, sin borrar nada.
+    """
+    return {
+        table: session.execute(text(COUNT_SQL.format(table=table, condition=condition)), {"cutoff": cutoff}).scalar()
+        for table, condition in PURGE_TABLES.items()
+    }
+
+
+def purge_soft_deleted(session, retention_days: Optional[int] = None, batch_size: Optional[int] = None,
+                       pause: Optional[float] = None, archive_dir: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Purga las filas eliminadas lógicamente hace más de `retention_days` días en todas las
+    tablas con borrado lógico. Los valores no indicados se toman de la configuración.
+
+    Returns:
+       - dict: Resultado de `purge_table` por tabla.
+    """
+    retention_days = settings.PURGE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    pause = settings.PURGE_BATCH_PAUSE if pause is None else pause
+    archive_dir = archive_dir if archive_dir is not None else (settings.PURGE_ARCHIVE_DIR or None)
+
+    started_at = datetime.now()
+    cutoff = started_at - timedelta(days=retention_days)
+    logging.info(f"Purga de filas eliminadas antes de {cutoff.isoformat()} (lotes de {batch_size})")
+
+    return {
+        table: purge_table(session, table, cutoff, batch_size, pause, archive_dir, started_at)
+        for table in PURGE_TABLES
+    }
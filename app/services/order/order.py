@@ -2,21 +2,28 @@ from datetime import datetime
 from fastapi import Depends, HTTPException
 from fastapi.responses import JSONResponse
 from pytest import Session
+from app.core.bulkhead import bulkhead
 from app.core.database import get_session
+from app.dependencies.database import get_read_session
+from app.dependencies.fields import order_fields
 from app.core.exceptions import DatabaseErrorException, UnexpectedErrorException
 from app.models.order.order import Order
 from app.models.order.order_item import OrderItem
 from app.models.product.product import Product
 from app.models.user.user import User
+from app.core.serialization import FastJSONResponse
 from app.responses.order import OrderItemResponse, OrderResponse
 from app.schemas.order import CreateOrderRequest
-from sqlalchemy.exc import SQLAlchemyError
+from app.services.order.queries import fetch_order_dtos, fetch_order_fields
+from app.utils.query import update_returning
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 import logging
 from app.dependencies.user import get_current_user
 
 
 
-async def create_order( order_data: CreateOrderRequest, session: Session):
+@bulkhead("orders")
+def create_order( order_data: CreateOrderRequest, session: Session):
     """Crea un nuevo pedido y asocia productos existentes al mismo.
 
     Args:
@@ -33,27 +40,36 @@ async def create_order( order_data: CreateOrderRequest, session: Session):
     """
 
     try:
+        # La fecha del pedido forma parte de su clave: los artículos la copian para ir a la
+        # misma partición mensual y referenciar el pedido con la clave foránea compuesta.
+        # Es una hora local sin zona, como la columna TIMESTAMP y el resto de fechas del servicio
+        created_at = datetime.now()
 
-        order = Order(user_id=order_data.user_id, status="pendiente", total_price=0)
-        session.add(order)
-        session.commit()
-        session.refresh(order)
-
+        product_ids = {product_data.product_id for product_data in order_data.products}
+        products = {
+            product.id: product
+            for product in session.query(Product.id, Product.name, Product.price).filter(Product.id.in_(product_ids))
+        }
 
         total_price = 0
+        order_items = []
         order_items_response = []
 
 
         for product_data in order_data.products:
-            product = session.query(Product).filter(Product.id == product_data.product_id).first()
+            product = products.get(product_data.product_id)
 
             if not product:
                 raise HTTPException(status_code=404, detail=f"Product with ID {product_data.product_id} not found.")
 
 
             subtotal = product.price * product_data.quantity
-            order_item = OrderItem(order_id=order.id, product_id=product.id, quantity=product_data.quantity, subtotal=subtotal)
-            session.add(order_item)
+            order_items.append(OrderItem(
+                product_id=product.id,
+                quantity=product_data.quantity,
+                subtotal=subtotal,
+                order_created_at=created_at
+            ))
             total_price += subtotal
 
 
@@ -65,7 +81,15 @@ async def create_order( order_data: CreateOrderRequest, session: Session):
             ))
 
 
-        order.total_price = total_price
+        # El pedido y sus artículos se insertan en la misma transacción
+        order = Order(
+            user_id=order_data.user_id,
+            status="pendiente",
+            total_price=total_price,
+            created_at=created_at,
+            order_items=order_items
+        )
+        session.add(order)
         session.commit()
 
 
@@ -85,6 +109,9 @@ async def create_order( order_data: CreateOrderRequest, session: Session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -92,16 +119,18 @@ async def create_order( order_data: CreateOrderRequest, session: Session):
         )  
 
 
-async def fetch_order_id(order_id,session: Session = Depends(get_session)):
+@bulkhead("orders")
+def fetch_order_id(order_id,session: Session = Depends(get_session), fields=None):
 
     """Obtiene los detalles de un pedido por su ID, incluyendo los productos asociados.
 
     Args:
        - order_id (int): ID del pedido a obtener.
        - session (Session): Sesión de base de datos.
+       - fields (Tuple[str], opcional): Campos a devolver (`?fields=`); por defecto, todos.
 
     Returns:
-       - OrderResponse: Respuesta con los detalles del pedido.
+       - OrderResponse: Respuesta con los detalles del pedido (solo los campos pedidos si se indica `fields`).
 
     Raises:
        - HTTPException 404: Si no se encuentra el pedido.
@@ -110,7 +139,13 @@ async def fetch_order_id(order_id,session: Session = Depends(get_session)):
     """
  
     try:
-        order = session.query(Order).filter(Order.id == order_id, Order.deleted_at == None).first()
+        if fields:
+            order = fetch_order_fields(session, fields, order_id=order_id)
+            if not order:
+                raise HTTPException(status_code=404, detail="Pedido no encontrado.")
+            return FastJSONResponse(order[0])
+
+        order = session.query(Order).filter(Order.id == order_id).first()
 
         
         if not order:
@@ -146,6 +181,9 @@ async def fetch_order_id(order_id,session: Session = Depends(get_session)):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -153,16 +191,22 @@ async def fetch_order_id(order_id,session: Session = Depends(get_session)):
         )
 
 
-async def fetch_user_orders(session: Session = Depends(get_session), current_user=Depends(get_current_user)):
+@bulkhead("orders")
+def fetch_user_orders(
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+    fields=Depends(order_fields)
+):
     """
     Obtiene todos los pedidos asociados al usuario autenticado.
 
     Args:
        - session (Session): Sesión de base de datos.
        - current_user (User): Usuario autenticado.
+       - fields (Tuple[str], opcional): Campos a devolver (`?fields=`); por defecto, todos.
 
     Returns:
-       - List[OrderResponse]: Lista de pedidos del usuario autenticado.
+       - FastJSONResponse: Lista de pedidos del usuario autenticado (OrderDTO).
 
     Raises:
        - HTTPException 404: Si el usuario no tiene pedidos.
@@ -170,37 +214,17 @@ async def fetch_user_orders(session: Session = Depends(get_session), current_use
        - Exception: Si ocurre un error inesperado durante el proceso de obtención del nuevo token.
     """
     try:
-        # Filtramos los pedidos por el `user_id` del usuario autenticado
-        orders = session.query(Order).filter(Order.user_id == current_user.id, Order.deleted_at == None).all()
+        # Una sola consulta de Core con los artículos agregados, sin objetos ORM
+        if fields:
+            order_responses = fetch_order_fields(session, fields, user_id=current_user.id)
+        else:
+            order_responses = fetch_order_dtos(session, user_id=current_user.id)
 
         # Si no hay pedidos asociados al usuario, lanzamos un error 404
-        if not orders:
+        if not order_responses:
             raise HTTPException(status_code=404, detail="No tienes pedidos registrados.")
 
-        order_responses = []
-        
-        for order in orders:
-            order_items_response = [
-                OrderItemResponse(
-                    product_id=item.product_id,
-                    name=item.product.name,  
-                    quantity=item.quantity,
-                    subtotal=item.subtotal
-                ) for item in order.order_items
-            ]
-
-            # Creamos el response de cada pedido
-            order_responses.append(OrderResponse(
-                id=order.id,
-                user_id=order.user_id,
-                total_price=order.total_price,
-                status=order.status,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
-                order_items=order_items_response
-            ))
-
-        return order_responses
+        return FastJSONResponse(order_responses)
     
     except HTTPException as e:
         return JSONResponse(
@@ -208,6 +232,9 @@ async def fetch_user_orders(session: Session = Depends(get_session), current_use
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -216,14 +243,16 @@ async def fetch_user_orders(session: Session = Depends(get_session), current_use
 
 
 
-async def fetch_all_order(session: Session = Depends(get_session)):
+@bulkhead("admin")
+def fetch_all_order(session: Session = Depends(get_read_session), fields=None):
     """Obtiene todos los pedidos no eliminados de la base de datos, junto con sus productos asociados.
 
     Args:
        - session (Session): Sesión de base de datos.
+       - fields (Tuple[str], opcional): Campos a devolver (`?fields=`); por defecto, todos.
 
     Returns:
-       - List[OrderResponse]: Lista de respuestas con los detalles de los pedidos.
+       - FastJSONResponse: Lista de respuestas con los detalles de los pedidos (OrderDTO).
 
     Raises:
        - HTTPException 404: Si no se encuentran pedidos.
@@ -232,35 +261,12 @@ async def fetch_all_order(session: Session = Depends(get_session)):
     """
     
     try:
-        orders = session.query(Order).filter(Order.deleted_at == None).all()  
+        order_responses = fetch_order_fields(session, fields) if fields else fetch_order_dtos(session)
         
-        if not orders:
+        if not order_responses:
             raise HTTPException(status_code=404, detail="Pedido no encontrado.")
         
-        order_responses = []
-        for order in orders:
-            order_items_response = []
-
-            for order_item in order.order_items:
-                order_items_response.append(OrderItemResponse(
-                    product_id=order_item.product_id,
-                    name=order_item.product.name,  
-                    quantity=order_item.quantity,
-                    subtotal=order_item.subtotal
-                ))
-            
-
-            order_responses.append(OrderResponse(
-                id=order.id,
-                user_id=order.user_id,
-                total_price=order.total_price,
-                status=order.status,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
-                order_items=order_items_response
-            ))
-        
-        return order_responses
+        return FastJSONResponse(order_responses)
     
     
     except HTTPException as e:
@@ -269,6 +275,9 @@ async def fetch_all_order(session: Session = Depends(get_session)):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -277,7 +286,8 @@ async def fetch_all_order(session: Session = Depends(get_session)):
 
 
 
-async def delete_user_order(order_id,session: Session = Depends(get_session)):
+@bulkhead("admin")
+def delete_user_order(order_id,session: Session = Depends(get_session)):
     """Realiza el borrado lógico de un pedido y de todos los items relacionados, marcando `deleted_at` con la fecha actual.
 
     Args:
@@ -295,7 +305,7 @@ async def delete_user_order(order_id,session: Session = Depends(get_session)):
     """
 
     try:
-        order  = session.query(Order).filter(Order.id == order_id).first()
+        order = session.query(Order).execution_options(include_deleted=True).filter(Order.id == order_id).first()
 
         if not order:
             raise HTTPException(status_code=404, detail="Pedido no encontrado.")
@@ -340,6 +350,9 @@ async def delete_user_order(order_id,session: Session = Depends(get_session)):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -347,7 +360,8 @@ async def delete_user_order(order_id,session: Session = Depends(get_session)):
         )
 
 
-async def patch_delete_order(order_id: int, session: Session = Depends(get_session), current_user = Depends(get_current_user)):
+@bulkhead("orders")
+def patch_delete_order(order_id: int, session: Session = Depends(get_session), current_user = Depends(get_current_user)):
 
     """Elimina lógicamente un pedido y sus ítems si el pedido está en estado "pendiente" y es propiedad del cliente.
 
@@ -369,7 +383,7 @@ async def patch_delete_order(order_id: int, session: Session = Depends(get_sessi
 
 
     try:
-        order = session.query(Order).filter(Order.id == order_id).first()
+        order = session.query(Order).execution_options(include_deleted=True).filter(Order.id == order_id).first()
 
         if not order:
             raise HTTPException(status_code=404, detail="Pedido no encontrado.")
@@ -418,6 +432,9 @@ async def patch_delete_order(order_id: int, session: Session = Depends(get_sessi
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -425,7 +442,8 @@ async def patch_delete_order(order_id: int, session: Session = Depends(get_sessi
         )
 
 
-async def update_order(order_id: int, session, data: dict):
+@bulkhead("orders")
+def update_order(order_id: int, session, data: dict):
 
     """Actualiza el estado de un pedido con los datos proporcionados.
 
@@ -445,34 +463,42 @@ async def update_order(order_id: int, session, data: dict):
 
 
     try:
-        order = session.query(Order).filter(Order.id == order_id, Order.deleted_at == None).first()
-        if not order:
-            raise HTTPException(status_code=404, detail="Pedido no encontrado")
-
+        changes = {"updated_at": datetime.now()}
         if "status" in data and data["status"]:
-            order.status = data["status"]
+            changes["status"] = data["status"]
 
-        order.updated_at = datetime.now()
+        order = update_returning(session, Order, [Order.id == order_id], changes)
+        if not order:
+            raise HTTPException(status_code=404, detail="Pedido no encontrado")
 
         session.commit()
-        session.refresh(order)
 
-        order_items_response = []
-        for order_item in order.order_items:
-            order_items_response.append(OrderItemResponse(
-                product_id=order_item.product_id,
-                name=order_item.product.name,
-                quantity=order_item.quantity,
-                subtotal=order_item.subtotal
-            ))
+        # El pedido conserva el nombre de los productos eliminados; sus líneas siguen vivas
+        order_items = session.query(
+            OrderItem.product_id,
+            Product.name,
+            OrderItem.quantity,
+            OrderItem.subtotal
+        ).outerjoin(Product, Product.id == OrderItem.product_id).filter(
+            OrderItem.order_id == order_id, OrderItem.deleted_at == None
+        ).execution_options(include_deleted=True).all()
+
+        order_items_response = [
+            OrderItemResponse(
+                product_id=item.product_id,
+                name=item.name,
+                quantity=item.quantity,
+                subtotal=item.subtotal
+            ) for item in order_items
+        ]
 
         return OrderResponse(
-            id=order.id,
-            user_id=order.user_id,
-            total_price=order.total_price,
-            status=order.status,
-            created_at=order.created_at,
-            updated_at=order.updated_at,
+            id=order["id"],
+            user_id=order["user_id"],
+            total_price=order["total_price"],
+            status=order["status"],
+            created_at=order["created_at"],
+            updated_at=order["updated_at"],
             order_items=order_items_response
         )
     
@@ -482,6 +508,9 @@ async def update_order(order_id: int, session, data: dict):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
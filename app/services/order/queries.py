@@ -0,0 +1,135 @@
+from decimal import Decimal
+from typing import List, Optional, Sequence
+from sqlalchemy import JSON, Text, cast, func, literal_column, select, type_coerce
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.core.soft_delete import INCLUDE_DELETED
+from app.dependencies.fields import ORDER_FIELDS
+from app.models.order.order import Order
+from app.models.order.order_item import OrderItem
+from app.models.product.product import Product
+from app.responses.dto import OrderDTO, OrderItemDTO
+
+
+orders = Order.__table__
+order_items = OrderItem.__table__
+products = Product.__table__
+
+
+def order_list_statement(
+    user_id: Optional[int] = None,
+    include_deleted: bool = False,
+    order_id: Optional[int] = None,
+    fields: Sequence[str] = ORDER_FIELDS
+):
+    """
+    SELECT de Core para los listados de pedidos: una fila por pedido con sus artículos
+    agregados en un array JSON (`json_agg`), en una sola consulta y sin pasar por el ORM.
+
+    Como consulta de Core no recibe el filtro automático de borrado lógico, así que se
+    aplica aquí salvo con `include_deleted`. Los artículos conservan el nombre de los
+    productos eliminados, como en `update_order`.
+
+    Args:
+       - user_id (int, opcional): Limita el listado a los pedidos de un usuario.
+       - include_deleted (bool): Incluye los pedidos y artículos eliminados lógicamente.
+       - order_id (int, opcional): Limita la consulta a un pedido.
+       - fields (Sequence[str]): Columnas a seleccionar; la subconsulta de artículos solo
+         se añade si se pide `order_items`.
+    """
+    columns = [orders.c[field] for field in fields if field != "order_items"]
+
+    if "order_items" in fields:
+        # El subtotal viaja como texto para no perder precisión al decodificar el JSON
+        item = func.json_build_object(
+            "product_id", order_items.c.product_id,
+            "name", products.c.name,
+            "quantity", order_items.c.quantity,
+            "subtotal", cast(order_items.c.subtotal, Text)
+        )
+
+        # La fecha del pedido acota la búsqueda a la partición mensual de sus artículos
+        items_filter = [
+            order_items.c.order_id == orders.c.id,
+            order_items.c.order_created_at == orders.c.created_at
+        ]
+        if not include_deleted:
+            items_filter.append(order_items.c.deleted_at.is_(None))
+
+        items = (
+            select(func.coalesce(
+                func.json_agg(aggregate_order_by(item, order_items.c.id)),
+                literal_column("'[]'::json")
+            ))
+            .select_from(order_items.outerjoin(products, products.c.id == order_items.c.product_id))
+            .where(*items_filter)
+            .scalar_subquery()
+        )
+        columns.append(type_coerce(items, JSON).label("order_items"))
+
+    statement = select(*columns).select_from(orders).order_by(orders.c.created_at, orders.c.id)
+
+    if user_id is not None:
+        statement = statement.where(orders.c.user_id == user_id)
+    if order_id is not None:
+        statement = statement.where(orders.c.id == order_id)
+    if not include_deleted:
+        statement = statement.where(orders.c.deleted_at.is_(None))
+    # El filtro de borrado lógico ya está en la consulta: el evento del ORM no la toca
+    return statement.execution_options(**{INCLUDE_DELETED: True})
+
+
+def _items(rows) -> List[OrderItemDTO]:
+    return [
+        OrderItemDTO(
+            product_id=item["product_id"],
+            name=item["name"],
+            quantity=item["quantity"],
+            subtotal=Decimal(item["subtotal"])
+        ) for item in rows
+    ]
+
+
+def fetch_order_dtos(session, user_id: Optional[int] = None) -> List[OrderDTO]:
+    """
+    Ejecuta `order_list_statement` y convierte cada fila directamente en un OrderDTO.
+
+    Respeta `include_deleted(session)` de las vistas de administración.
+    """
+    statement = order_list_statement(user_id, include_deleted=session.info.get(INCLUDE_DELETED, False))
+    return [
+        OrderDTO(
+            id=row.id,
+            user_id=row.user_id,
+            total_price=row.total_price,
+            status=row.status,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            order_items=_items(row.order_items)
+        )
+        for row in session.execute(statement)
+    ]
+
+
+def fetch_order_fields(
+    session,
+    fields: Sequence[str],
+    user_id: Optional[int] = None,
+    order_id: Optional[int] = None
+) -> List[dict]:
+    """
+    Como `fetch_order_dtos`, pero solo con los campos pedidos (`?fields=`): cada pedido
+    es un diccionario con esas claves.
+    """
+    statement = order_list_statement(
+        user_id,
+        include_deleted=session.info.get(INCLUDE_DELETED, False),
+        order_id=order_id,
+        fields=fields
+    )
+    result = []
+    for row in session.execute(statement).mappings():
+        order = dict(row)
+        if "order_items" in order:
+            order["order_items"] = _items(order["order_items"])
+        result.append(order)
+    return result
@@ -2,16 +2,35 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
+from app.core.bulkhead import bulkhead
+from app.core.cache import catalog_cache
+from app.core.replicas import read_from_replica
 from app.core.exceptions import DatabaseErrorException, ProductNotFoundException, UnexpectedErrorException
+from app.core.settings import get_settings
 from app.models.category.category import  Category
 from app.models.product.product import Product
-from app.responses.product import ProductResponse
-from sqlalchemy.exc import SQLAlchemyError
+from app.core.compression import PrecompressedBody
+from app.core.serialization import FastJSONResponse, dumps
+from app.responses.dto import ProductDTO
+from app.responses.product import ProductBatchResponse, ProductBulkUpdateResponse, ProductBulkUpdateResult, ProductItemResponse, ProductResponse
+from app.utils.query import update_returning
+from app.services.catalog.snapshot import snapshot_scheduler
+from sqlalchemy import Integer, Numeric, cast, column, func, update, values
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 import logging
 
 
+settings = get_settings()
 
-async def create_product(session, product_data):
+
+def _product_columns(fields):
+    # `fields` ya está validado contra PRODUCT_FIELDS por la dependencia product_fields
+    return [getattr(Product, field) for field in fields]
+
+
+
+@bulkhead("admin")
+def create_product(session, product_data):
     """Crea un nuevo producto en la base de datos si no existe uno con el mismo nombre y categoría.
 
     Args:
@@ -52,7 +71,8 @@ async def create_product(session, product_data):
 
         session.add(new_product)
         session.commit()
-        session.refresh(new_product)
+        catalog_cache.invalidate("catalog_response", ["products"])
+        snapshot_scheduler.schedule()
             
         return new_product
 
@@ -62,6 +82,9 @@ async def create_product(session, product_data):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -70,15 +93,17 @@ async def create_product(session, product_data):
 
 
 
-async def fetch_product_id(product_id, session):
+@bulkhead("catalog")
+def fetch_product_id(product_id, session, fields=None):
     """Obtiene un producto de la base de datos por su ID.
 
     Args:
        - product_id (int): ID del producto.
        - session (Session): Sesión de base de datos.
+       - fields (Tuple[str], opcional): Campos a devolver (`?fields=`); solo se consultan esas columnas.
 
     Returns:
-       - Product: Producto con el ID especificado.
+       - Product: Producto con el ID especificado (o solo los campos pedidos si se indica `fields`).
 
     Raises:
        - ProductNotFoundException: Si no se encuentra el producto.
@@ -87,6 +112,12 @@ async def fetch_product_id(product_id, session):
     """
 
     try:    
+        if fields:
+            row = session.query(*_product_columns(fields)).filter(Product.id == product_id).first()
+            if row is None:
+                raise ProductNotFoundException()
+            return FastJSONResponse(dict(row._mapping))
+
         product = session.query(Product).filter(Product.id == product_id).first()
 
         if product:
@@ -102,6 +133,9 @@ async def fetch_product_id(product_id, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -109,14 +143,16 @@ async def fetch_product_id(product_id, session):
         )
 
 
-async def fetch_all_products(session):
+@bulkhead("catalog")
+def fetch_all_products(session, fields=None):
     """Obtiene todos los productos de la base de datos.
 
     Args:
        - session (Session): Sesión de base de datos.
+       - fields (Tuple[str], opcional): Campos a devolver (`?fields=`); solo se consultan esas columnas.
 
     Returns:
-       - List[Product]: Lista de productos.
+       - Response: Lista de productos (ProductDTO), servida desde la caché del catálogo si no se indica `fields`.
 
     Raises:
        - ProductNotFoundException: Si no se encuentran productos.
@@ -125,10 +161,34 @@ async def fetch_all_products(session):
     """
  
     try:
+        if fields:
+            rows = session.query(*_product_columns(fields)).all()
+            if not rows:
+                raise ProductNotFoundException()
+            return FastJSONResponse([dict(row._mapping) for row in rows])
+
+        # El listado completo se guarda serializado y con sus versiones comprimidas
+        version = catalog_cache.version("catalog_response")
+        cached = catalog_cache.get("catalog_response", "products")
+        if cached is not None:
+            return cached.response()
+
         products = session.query(Product).all()
         
         if products:
-            return products
+            body = PrecompressedBody(dumps([
+                ProductDTO(
+                    name=product.name,
+                    description=product.description,
+                    price=product.price,
+                    stock=product.stock,
+                    category_id=product.category_id
+                ) for product in products
+            ]))
+            # Una réplica con retraso guardaría datos anteriores a la última escritura
+            if not read_from_replica(session):
+                catalog_cache.set("catalog_response", "products", body, version)
+            return body.response()
         else:
             raise ProductNotFoundException()
 
@@ -138,15 +198,87 @@ async def fetch_all_products(session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
             content={"detail": str(e)} 
         )
     
+
+
+
+@bulkhead("catalog")
+def fetch_products_by_ids(product_ids, session):
+    """Obtiene varios productos a la vez, por ejemplo para pintar un carrito o un pedido.
+
+    Los productos se sirven desde la caché del catálogo cuando es posible y el resto
+    se recupera con una única consulta `IN`. El resultado respeta el orden de los IDs
+    recibidos (sin duplicados) e indica qué IDs no existen.
+
+    Args:
+       - product_ids (List[int]): IDs de los productos solicitados.
+       - session (Session): Sesión de base de datos.
+
+    Returns:
+       - ProductBatchResponse: Productos encontrados e IDs inexistentes.
+
+    Raises:
+       - HTTPException 400: Si se solicitan más productos de los permitidos.
+       - Exception: Si ocurre un error inesperado durante la consulta.
+    """
+
+    try:
+        ids = list(dict.fromkeys(product_ids))
+
+        if len(ids) > settings.PRODUCT_BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Se permiten como máximo {settings.PRODUCT_BATCH_MAX_IDS} productos por petición."
+            )
+
+        version = catalog_cache.version("product")
+        found, pending = catalog_cache.get_many("product", ids)
+
+        if pending:
+            rows = session.query(
+                Product.id,
+                Product.name,
+                Product.description,
+                Product.price,
+                Product.stock,
+                Product.category_id
+            ).filter(Product.id.in_(pending)).all()
+
+            fetched = {row.id: dict(row._mapping) for row in rows}
+            catalog_cache.set_many("product", fetched, version)
+            found.update(fetched)
+
+        return ProductBatchResponse(
+            products=[ProductItemResponse(**found[product_id]) for product_id in ids if product_id in found],
+            missing=[product_id for product_id in ids if product_id not in found]
+        )
+
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.detail}
+        )
+
+    except PoolTimeoutError:
+        raise
+
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,  
+            content={"detail": str(e)} 
+        )
     
 
-async def update_product(product_id: int, session, data: dict):
+@bulkhead("admin")
+def update_product(product_id: int, session, data: dict):
     """
     Actualiza un producto con los datos proporcionados.
 
@@ -165,29 +297,21 @@ async def update_product(product_id: int, session, data: dict):
     """
 
     try:
-        product = session.query(Product).filter(Product.id == product_id).first()
+        changes = {key: value for key, value in data.items() if value is not None}
+        changes["updated_at"] = datetime.now()
+
+        product = update_returning(session, Product, [Product.id == product_id], changes)
 
         if not product:
             raise HTTPException(status_code=404, detail="Producto no encontrado")
 
-        for key, value in data.items():
-            if value is not None:  
-                setattr(product, key, value)
-
-        product.updated_at = datetime.now()
-
-
         session.commit()
-        session.refresh(product)
 
-        return ProductResponse(
-            id=product.id,
-            name=product.name,
-            description=product.description,
-            price=product.price,
-            stock=product.stock,
-            category_id=product.category_id
-        )
+        catalog_cache.invalidate("product", [product_id])
+        catalog_cache.invalidate("catalog_response", ["products"])
+        snapshot_scheduler.schedule()
+
+        return ProductResponse(**product)
         
     except HTTPException as e:
         return JSONResponse(
@@ -195,6 +319,9 @@ async def update_product(product_id: int, session, data: dict):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -202,7 +329,108 @@ async def update_product(product_id: int, session, data: dict):
         )
 
 
-async def delete_product(product_id,session):
+@bulkhead("admin")
+def bulk_update_products(session, items):
+    """
+    Actualiza el precio y/o el stock de muchos productos a la vez.
+
+    Los cambios se aplican por bloques con una única sentencia
+    `UPDATE ... FROM (VALUES ...)` por bloque y se confirman en una sola transacción.
+    Si un ID aparece varias veces sus cambios se combinan campo a campo: para el precio
+    y para el stock gana el último valor indicado. La caché del catálogo se invalida una
+    sola vez al final del lote.
+
+    Args:
+       - session (Session): Sesión de base de datos.
+       - items (List[ProductBulkUpdateItem]): Cambios a aplicar por ID de producto.
+
+    Returns:
+       - ProductBulkUpdateResponse: Resultado por elemento recibido ("updated" o "not_found")
+         y número de productos distintos actualizados y no encontrados.
+
+    Raises:
+       - HTTPException 400: Si el lote supera el tamaño máximo permitido.
+       - Exception: Si ocurre un error inesperado durante la actualización.
+    """
+
+    try:
+        if len(items) > settings.PRODUCT_BULK_UPDATE_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Se permiten como máximo {settings.PRODUCT_BULK_UPDATE_MAX_ITEMS} productos por lote."
+            )
+
+        # (precio, stock) por ID; None deja el valor actual
+        changes = {}
+        for item in items:
+            price, stock = changes.get(item.id, (None, None))
+            changes[item.id] = (
+                item.price if item.price is not None else price,
+                item.stock if item.stock is not None else stock
+            )
+
+        ids = list(changes)
+        updated_ids = set()
+
+        for start in range(0, len(ids), settings.PRODUCT_BULK_UPDATE_CHUNK_SIZE):
+            chunk_ids = ids[start:start + settings.PRODUCT_BULK_UPDATE_CHUNK_SIZE]
+
+            chunk = values(
+                column("id", Integer),
+                column("price", Numeric(10, 2)),
+                column("stock", Integer),
+                name="changes"
+            ).data([(product_id, *changes[product_id]) for product_id in chunk_ids])
+
+            statement = (
+                update(Product)
+                .where(Product.id == chunk.c.id, Product.deleted_at == None)
+                .values(
+                    price=func.coalesce(cast(chunk.c.price, Numeric(10, 2)), Product.price),
+                    stock=func.coalesce(cast(chunk.c.stock, Integer), Product.stock),
+                    updated_at=func.current_timestamp()
+                )
+                .returning(Product.id)
+                .execution_options(synchronize_session=False)
+            )
+
+            updated_ids.update(session.execute(statement).scalars())
+
+        session.commit()
+        catalog_cache.invalidate("product", updated_ids)
+        catalog_cache.invalidate("catalog_response", ["products"])
+        snapshot_scheduler.schedule()
+
+        results = [
+            ProductBulkUpdateResult(id=item.id, status="updated" if item.id in updated_ids else "not_found")
+            for item in items
+        ]
+
+        return ProductBulkUpdateResponse(
+            updated=len(updated_ids),
+            not_found=len(ids) - len(updated_ids),
+            results=results
+        )
+
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.detail}
+        )
+
+    except PoolTimeoutError:
+        raise
+
+    except Exception as e:
+        session.rollback()
+        return JSONResponse(
+            status_code=500,
+            content={"detail": str(e)}
+        )
+
+
+@bulkhead("admin")
+def delete_product(product_id,session):
     """
     Realiza el borrado lógico del producto, marcando `deleted_at` con la fecha actual.
 
@@ -220,7 +448,7 @@ async def delete_product(product_id,session):
     """
 
     try:
-        product = session.query(Product).filter(Product.id == product_id).first()
+        product = session.query(Product).execution_options(include_deleted=True).filter(Product.id == product_id).first()
 
         if not product:
             raise HTTPException(status_code=404, detail="Order not found.")
@@ -238,6 +466,9 @@ async def delete_product(product_id,session):
 
         product.deleted_at = datetime.now(timezone.utc)
         session.commit()
+        catalog_cache.invalidate("product", [product.id])
+        catalog_cache.invalidate("catalog_response", ["products"])
+        snapshot_scheduler.schedule()
 
         return deleted_product
 
@@ -247,6 +478,9 @@ async def delete_product(product_id,session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
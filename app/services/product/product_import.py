@@ -0,0 +1,307 @@
+import codecs
+import csv
+import io
+import json
+import logging
+from typing import Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.core.bulkhead import bulkhead
+from app.core.cache import catalog_cache
+from app.core.settings import get_settings
+from app.responses.product import ProductImportError, ProductImportResponse
+from app.schemas.product import ProductImportRow
+from app.services.catalog.snapshot import snapshot_scheduler
+
+
+settings = get_settings()
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+
+STAGING_TABLE = "products_import"
+STAGING_COLUMNS = ("line_no", "name", "description", "price", "stock", "category_id")
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        line_no integer NOT NULL,
+        name varchar(255) NOT NULL,
+        description text,
+        price numeric(10, 2) NOT NULL,
+        stock integer NOT NULL,
+        category_id integer NOT NULL
+    ) ON COMMIT DROP
+"""
+
+COPY_SQL = f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+REJECT_UNKNOWN_CATEGORIES_SQL = f"""
+    DELETE FROM {STAGING_TABLE} AS s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM categories AS c WHERE c.id = s.category_id AND c.deleted_at IS NULL
+    )
+    RETURNING s.line_no, s.category_id
+"""
+
+# Si un nombre aparece varias veces en el fichero, gana la última fila.
+UPDATE_EXISTING_SQL = f"""
+    WITH latest AS (
+        SELECT DISTINCT ON (name) name, description, price, stock, category_id
+        FROM {STAGING_TABLE}
+        ORDER BY name, line_no DESC
+    )
+    UPDATE products AS p
+    SET description = latest.description,
+        price = latest.price,
+        stock = latest.stock,
+        category_id = latest.category_id,
+        updated_at = CURRENT_TIMESTAMP
+    FROM latest
+    WHERE p.name = latest.name AND p.deleted_at IS NULL
+"""
+
+INSERT_NEW_SQL = f"""
+    INSERT INTO products (name, description, price, stock, category_id, created_at, updated_at)
+    SELECT DISTINCT ON (s.name) s.name, s.description, s.price, s.stock, s.category_id,
+           CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM {STAGING_TABLE} AS s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM products AS p WHERE p.name = s.name AND p.deleted_at IS NULL
+    )
+    ORDER BY s.name, s.line_no DESC
+"""
+
+
+def detect_import_format(content_type: Optional[str] = None, filename: Optional[str] = None) -> Optional[str]:
+    """
+    Deduce el formato de importación a partir del Content-Type o de la extensión del fichero.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return CSV_FORMAT
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return NDJSON_FORMAT
+
+    filename = (filename or "").lower()
+    if filename.endswith(".csv"):
+        return CSV_FORMAT
+    if filename.endswith((".ndjson", ".jsonl")):
+        return NDJSON_FORMAT
+    return None
+
+
+def _iter_lines(chunks: Iterable[bytes]):
+    """
+    Convierte un flujo de bytes en líneas de texto sin cargarlo entero en memoria.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _iter_csv_records(chunks: Iterable[bytes]):
+    """
+    Agrupa las líneas en registros CSV completos junto con la línea en la que empiezan.
+
+    Un campo entre comillas puede contener saltos de línea: el registro termina cuando
+    el número de comillas acumulado es par.
+    """
+    line_no = 0
+    start = 1
+    record = []
+    quotes = 0
+    for line in _iter_lines(chunks):
+        line_no += 1
+        if not record:
+            start = line_no
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield start, "".join(record)
+            record, quotes = [], 0
+
+    if record:
+        yield start, "".join(record)
+
+
+def _iter_csv_rows(chunks: Iterable[bytes]):
+    header = None
+    for line_no, record in _iter_csv_records(chunks):
+        if not record.strip():
+            continue
+
+        values = next(csv.reader([record]), [])
+        if header is None:
+            header = [column.strip().lower() for column in values]
+            continue
+
+        if len(values) != len(header):
+            yield line_no, f"Se esperaban {len(header)} columnas y se recibieron {len(values)}."
+            continue
+
+        yield line_no, {column: value for column, value in zip(header, values) if value != ""}
+
+
+def _iter_ndjson_rows(chunks: Iterable[bytes]):
+    line_no = 0
+    for line in _iter_lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, "JSON inválido."
+            continue
+
+        if not isinstance(row, dict):
+            yield line_no, "Cada línea debe ser un objeto JSON."
+            continue
+
+        yield line_no, {key: value for key, value in row.items() if value is not None}
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+def _validate_chunk(rows: List[Tuple[int, object]]):
+    """
+    Valida un bloque de filas y devuelve las filas válidas (listas para COPY) y los errores.
+    """
+    valid = []
+    errors = []
+    for line_no, raw in rows:
+        if isinstance(raw, str):
+            errors.append((line_no, raw))
+            continue
+
+        try:
+            item = ProductImportRow.model_validate(raw)
+        except ValidationError as e:
+            errors.append((line_no, _format_validation_error(e)))
+            continue
+
+        valid.append((line_no, item.name, item.description, item.price, item.stock, item.category_id))
+
+    return valid, errors
+
+
+def _copy_chunk(cursor, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(COPY_SQL, buffer)
+
+
+@bulkhead("admin")
+def import_products(session, chunks: Iterable[bytes], file_format: str):
+    """
+    Importa productos de forma masiva desde un flujo CSV o NDJSON.
+
+    Las filas se validan por bloques y se cargan con `COPY` en una tabla temporal.
+    Al terminar se descartan las filas con categorías inexistentes y se hace un
+    upsert sobre `products` por nombre: se actualizan los productos existentes y se
+    insertan los nuevos. Toda la importación se ejecuta en una única transacción.
+
+    Se ejecuta en el bulkhead `admin`, fuera del event loop: para leer el cuerpo de
+    una petición en streaming, pasa `iterate_in_thread(request.stream())`.
+
+    Args:
+       - session (Session): Sesión de base de datos.
+       - chunks (Iterable[bytes]): Flujo con el contenido del fichero.
+       - file_format (str): Formato del contenido, "csv" o "ndjson".
+
+    Returns:
+       - ProductImportResponse: Resumen de la importación con los errores por fila.
+
+    Raises:
+       - HTTPException 415: Si el formato no está soportado.
+       - Exception: Si ocurre un error inesperado durante la importación.
+    """
+
+    try:
+        if file_format == CSV_FORMAT:
+            rows = _iter_csv_rows(chunks)
+        elif file_format == NDJSON_FORMAT:
+            rows = _iter_ndjson_rows(chunks)
+        else:
+            raise HTTPException(status_code=415, detail="Formato no soportado. Usa CSV o NDJSON.")
+
+        connection = session.connection()
+        connection.execute(text(CREATE_STAGING_SQL))
+        cursor = connection.connection.cursor()
+
+        received = 0
+        rejected = 0
+        errors = []
+
+        def load(batch):
+            nonlocal received, rejected
+            valid, batch_errors = _validate_chunk(batch)
+            if valid:
+                _copy_chunk(cursor, valid)
+            received += len(batch)
+            rejected += len(batch_errors)
+            errors.extend(batch_errors[:max(settings.PRODUCT_IMPORT_MAX_ERRORS - len(errors), 0)])
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= settings.PRODUCT_IMPORT_CHUNK_SIZE:
+                load(batch)
+                batch = []
+        if batch:
+            load(batch)
+
+        for line_no, category_id in connection.execute(text(REJECT_UNKNOWN_CATEGORIES_SQL)):
+            rejected += 1
+            if len(errors) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+                errors.append((line_no, f"category_id: la categoría {category_id} no existe"))
+
+        updated = connection.execute(text(UPDATE_EXISTING_SQL)).rowcount
+        inserted = connection.execute(text(INSERT_NEW_SQL)).rowcount
+        session.commit()
+        catalog_cache.invalidate("product")
+        catalog_cache.invalidate("catalog_response", ["products"])
+        snapshot_scheduler.schedule()
+
+        logging.info(f"Importación de productos: {received} filas, {inserted} nuevas, {updated} actualizadas, {rejected} rechazadas")
+
+        return ProductImportResponse(
+            received=received,
+            inserted=inserted,
+            updated=updated,
+            rejected=rejected,
+            errors=[ProductImportError(line=line_no, detail=detail) for line_no, detail in sorted(errors)]
+        )
+
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.detail}
+        )
+
+    except PoolTimeoutError:
+        raise
+
+    except Exception as e:
+        session.rollback()
+        return JSONResponse(
+            status_code=500,
+            content={"detail": str(e)}
+        )
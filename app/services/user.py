@@ -4,6 +4,7 @@ from fastapi import HTTPException
 import logging
 
 from fastapi.responses import JSONResponse
+from app.core.bulkhead import bulkhead
 from app.core.exceptions import  DatabaseErrorException, RoleNotFoundException, UnexpectedErrorException, UserEmailExistsException, UserNotFoundException, UserPasswordNotStrong
 from app.core.security import decode_jwt,generate_token, hash_password, is_password_strong_enough, load_user, str_decode, str_encode, verify_password
 from app.models.user import user_roles_association
@@ -15,12 +16,14 @@ from app.core.settings import get_settings
 from app.services.email import send_account_activation_confirmation_email, send_account_verification_email, send_password_reset_email
 from app.utils.email_context import FORGOT_PASSWORD, USER_VERIFY_ACCOUNT
 from app.utils.string import unique_string
+from app.utils.query import update_returning
 from sqlalchemy.orm import joinedload
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 
 settings = get_settings()
 
-async def create_user_account(data, session, background_tasks):
+@bulkhead("auth")
+def create_user_account(data, session, background_tasks):
     
     """
     Crea una nueva cuenta de usuario, valida los datos, 
@@ -63,7 +66,6 @@ async def create_user_account(data, session, background_tasks):
 
         session.add(user)
         session.commit()
-        session.refresh(user)
         
 
         client_role = session.query(UserRole).filter(UserRole.name == "cliente").first()
@@ -75,7 +77,7 @@ async def create_user_account(data, session, background_tasks):
             RoleNotFoundException()
         
         
-        await send_account_verification_email(user, background_tasks=background_tasks)
+        send_account_verification_email(user, background_tasks=background_tasks)
             
         return user
     
@@ -85,6 +87,9 @@ async def create_user_account(data, session, background_tasks):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -94,7 +99,8 @@ async def create_user_account(data, session, background_tasks):
  
  
 
-async def activate_user_account(data, session, background_tasks):
+@bulkhead("auth")
+def activate_user_account(data, session, background_tasks):
 
     """
     Activa la cuenta de usuario tras verificar el token de confirmación.
@@ -133,9 +139,8 @@ async def activate_user_account(data, session, background_tasks):
         user.verified_at = datetime.now(timezone.utc)
         session.add(user)
         session.commit()
-        session.refresh(user)
 
-        await send_account_activation_confirmation_email(user, background_tasks)
+        send_account_activation_confirmation_email(user, background_tasks)
         
         return user
     
@@ -145,6 +150,9 @@ async def activate_user_account(data, session, background_tasks):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -153,7 +161,8 @@ async def activate_user_account(data, session, background_tasks):
 
 
 
-async def get_login_token(data, session):
+@bulkhead("auth")
+def get_login_token(data, session):
 
     """
     Genera un token de inicio de sesión tras validar las credenciales del usuario.
@@ -172,7 +181,7 @@ async def get_login_token(data, session):
     """
 
 
-    user = await load_user(data.username, session)
+    user = load_user(data.username, session)
     if not user:
         raise HTTPException(status_code=400, detail="El correo electrónico no está registrado.")
     
@@ -219,7 +228,6 @@ def _generate_tokens(user, session):
     user_token.expires_at = datetime.now(timezone.utc) + rt_expires
     session.add(user_token)
     session.commit()
-    session.refresh(user_token)
 
     at_payload = {
 
@@ -243,7 +251,8 @@ def _generate_tokens(user, session):
  
  
     
-async def get_refresh_token(refresh_token, session):
+@bulkhead("auth")
+def get_refresh_token(refresh_token, session):
     """
     Genera un nuevo token de acceso utilizando un token de actualización (refresh token).
 
@@ -285,7 +294,8 @@ async def get_refresh_token(refresh_token, session):
 
 
 
-async def email_forgot_password_link(data, background_tasks, session):
+@bulkhead("auth")
+def email_forgot_password_link(data, background_tasks, session):
     """
     Envía un correo de restablecimiento de contraseña si el usuario está verificado y activo.
 
@@ -305,7 +315,7 @@ async def email_forgot_password_link(data, background_tasks, session):
 
     try:
         
-        user = await load_user(data.email, session)
+        user = load_user(data.email, session)
         
         if not user:
             raise HTTPException(status_code=400, detail="El usuario no existe.")
@@ -316,7 +326,7 @@ async def email_forgot_password_link(data, background_tasks, session):
         if not user.is_active:
             raise HTTPException(status_code=400, detail="Tu cuenta ha sido desactivada. Por favor, contacta con soporte.")
         
-        await send_password_reset_email(user, background_tasks)
+        send_password_reset_email(user, background_tasks)
         
     except HTTPException as e:
         return JSONResponse(
@@ -324,6 +334,9 @@ async def email_forgot_password_link(data, background_tasks, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -334,7 +347,8 @@ async def email_forgot_password_link(data, background_tasks, session):
   
        
     
-async def reset_user_password(data, session):
+@bulkhead("auth")
+def reset_user_password(data, session):
     """
     Restablece la contraseña del usuario si el token es válido y el usuario está activo y verificado.
 
@@ -353,7 +367,7 @@ async def reset_user_password(data, session):
 
 
     try:
-        user = await load_user(data.email, session)
+        user = load_user(data.email, session)
         
         if not user:
             raise HTTPException(status_code=400, detail="Respuesta inválida.")
@@ -378,7 +392,6 @@ async def reset_user_password(data, session):
         user.updated_at = datetime.now()
         session.add(user)
         session.commit()
-        session.refresh(user)
 
         return {"message": "Contraseña restablecida con éxito."}
 
@@ -388,6 +401,9 @@ async def reset_user_password(data, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -426,6 +442,9 @@ async def fetch_user_detail(user_id, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -453,18 +472,15 @@ async def update_user_account(data, session, current_user: User):
     """
 
     try:
-        user = session.query(User).filter(User.id == current_user.id).first()
+        user = update_returning(session, User, [User.id == current_user.id], {
+            "username": data.username,
+            "updated_at": datetime.now(timezone.utc)
+        })
         
         if not user:
             raise UserNotFoundException()
 
-
-        user.username = data.username
-        user.updated_at = datetime.now(timezone.utc)
-
-
         session.commit()
-        session.refresh(user)
 
         return user  
     
@@ -474,6 +490,9 @@ async def update_user_account(data, session, current_user: User):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -527,6 +546,9 @@ async def delete_user_account(user_id: int, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -2,10 +2,12 @@ from datetime import datetime, timezone
 import logging
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.core.exceptions import UserNotFoundException
 from app.core.security import dni_valid
 from app.models.user.user_profile import UserProfile
 from app.schemas.user_profile import UserProfileUpdateAdressRequest
+from app.utils.query import update_returning
 
 
 
@@ -29,7 +31,7 @@ async def create_user_profile(data, session, current_user):
     """
 
     try:
-        existing_profile = session.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
+        existing_profile = session.query(UserProfile).execution_options(include_deleted=True).filter(UserProfile.user_id == current_user.id).first()
         if existing_profile:
             raise HTTPException(status_code=400, detail="User profile already exists")
         
@@ -50,7 +52,6 @@ async def create_user_profile(data, session, current_user):
 
         session.add(user_profile)
         session.commit()
-        session.refresh(user_profile)
         
         return user_profile
     
@@ -60,6 +61,9 @@ async def create_user_profile(data, session, current_user):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -89,27 +93,29 @@ async def update_user_profile(data, session, current_user):
 
 
     try:
-        existing_profile = session.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
-
-        if not existing_profile:
-            raise UserNotFoundException()
-        
+        # Un perfil inexistente responde 404 antes que un DNI inválido; la consulta de
+        # existencia solo se hace en el caso de error
         if not dni_valid(data.dni):
+            if not session.query(UserProfile.id).filter(UserProfile.user_id == current_user.id).first():
+                raise UserNotFoundException()
             raise HTTPException(status_code=400, detail="DNI inválido")
 
-        existing_profile.first_name = data.first_name
-        existing_profile.last_name = data.last_name
-        existing_profile.dni = data.dni
-        existing_profile.phone = data.phone
-        existing_profile.address = data.address
-        existing_profile.birth_date = data.birth_date
-        existing_profile.city = data.city
-        existing_profile.zip_code = data.zip_code
-        existing_profile.updated_at = datetime.now(timezone.utc)
+        existing_profile = update_returning(session, UserProfile, [UserProfile.user_id == current_user.id], {
+            "first_name": data.first_name,
+            "last_name": data.last_name,
+            "dni": data.dni,
+            "phone": data.phone,
+            "address": data.address,
+            "birth_date": data.birth_date,
+            "city": data.city,
+            "zip_code": data.zip_code,
+            "updated_at": datetime.now(timezone.utc)
+        })
 
+        if not existing_profile:
+            raise UserNotFoundException()
 
         session.commit()
-        session.refresh(existing_profile)
 
         return {
             "message": "Perfil actualizado correctamente",
@@ -122,6 +128,9 @@ async def update_user_profile(data, session, current_user):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -149,23 +158,22 @@ async def update_user_address(data: UserProfileUpdateAdressRequest, session, cur
     """
 
     try:
-        user_profile = session.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
-
-        if not user_profile:
-            raise HTTPException(status_code=404, detail="User profile not encontrado")
-
+        changes = {"updated_at": datetime.now(timezone.utc)}
         if data.address:
-            user_profile.address = data.address
+            changes["address"] = data.address
         if data.city:
-            user_profile.city = data.city
+            changes["city"] = data.city
         if data.zip_code:
-            user_profile.zip_code = data.zip_code
+            changes["zip_code"] = data.zip_code
+
+        user_profile = update_returning(session, UserProfile, [UserProfile.user_id == current_user.id], changes)
+
+        if not user_profile:
+            raise HTTPException(status_code=404, detail="User profile not encontrado")
 
-        user_profile.updated_at = datetime.now(timezone.utc)  
         session.commit()
-        session.refresh(user_profile)
 
-        return {"message": f"User profile {user_profile.first_name} address actualizado correctamente"}
+        return {"message": f"User profile {user_profile['first_name']} address actualizado correctamente"}
     
     except HTTPException as e:
         return JSONResponse(
@@ -173,6 +181,9 @@ async def update_user_address(data: UserProfileUpdateAdressRequest, session, cur
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -212,6 +223,9 @@ async def get_user_profile(user_id, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
@@ -239,7 +253,7 @@ async def delete_user_profile(user_id, session):
     """
 
     try:
-        user_profile = session.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        user_profile = session.query(UserProfile).execution_options(include_deleted=True).filter(UserProfile.user_id == user_id).first()
 
         if not user_profile:
             raise UserNotFoundException()
@@ -259,6 +273,9 @@ async def delete_user_profile(user_id, session):
             content={"detail": e.detail}
         )
 
+    except PoolTimeoutError:
+        raise
+
     except Exception as e:
         return JSONResponse(
             status_code=500,  
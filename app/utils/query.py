@@ -0,0 +1,39 @@
+from typing import Iterable, Optional
+from sqlalchemy import update
+from app.core.soft_delete import SoftDeleteMixin
+
+
+def update_returning(session, model, filters: Iterable, values: dict, include_deleted: bool = False) -> Optional[dict]:
+    """
+    Actualiza parcialmente las filas de `model` que cumplen `filters` con una única
+    sentencia `UPDATE ... WHERE ... RETURNING`. No confirma la transacción: el commit
+    (o el rollback, si la fila no sirve) queda en manos de quien llama.
+
+    Sustituye al patrón SELECT + modificar en Python + commit + refresh, que necesita
+    tres viajes a la base de datos para cambiar un solo campo.
+
+    Como las consultas, solo actualiza filas vivas de los modelos con borrado lógico.
+
+    Args:
+       - session (Session): Sesión de base de datos.
+       - model: Modelo ORM a actualizar.
+       - filters (Iterable): Condiciones del WHERE.
+       - values (dict): Columnas a actualizar y sus nuevos valores.
+       - include_deleted (bool): Permite actualizar también filas eliminadas lógicamente.
+
+    Returns:
+       - dict | None: Columnas de la fila actualizada o None si ninguna fila coincide.
+    """
+    filters = list(filters)
+    if issubclass(model, SoftDeleteMixin) and not include_deleted:
+        filters.append(model.deleted_at.is_(None))
+
+    statement = (
+        update(model)
+        .where(*filters)
+        .values(**values)
+        .returning(*model.__table__.columns)
+    )
+
+    row = session.execute(statement).mappings().first()
+    return dict(row) if row else None
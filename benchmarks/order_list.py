@@ -0,0 +1,117 @@
+"""
+Compara el listado de pedidos por el ORM (objetos Order/OrderItem/Product con sus
+relaciones cargadas y copiados campo a campo en DTOs) frente a la consulta de Core con
+`json_agg` de `app.services.order.queries`, que mapea cada fila directamente al DTO.
+
+Crea un usuario con `--orders` pedidos de `--items` artículos, mide tiempo, CPU por fila
+y pico de memoria de cada camino y borra los datos al terminar.
+
+Uso (contra la base de datos configurada en el .env):
+    python -m benchmarks.order_list --orders 5000 --items 3 --repeat 5
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from decimal import Decimal
+from app.core.database import SessionLocal
+from app.models.category.category import Category
+from app.models.order.order import Order
+from app.models.order.order_item import OrderItem
+from app.models.product.product import Product
+from app.models.user.user import User
+from app.responses.dto import OrderDTO, OrderItemDTO
+from app.services.order.queries import fetch_order_dtos
+
+
+def _orm_orders(session, user_id):
+    orders = session.query(Order).filter(Order.user_id == user_id).all()
+    return [
+        OrderDTO(
+            id=order.id,
+            user_id=order.user_id,
+            total_price=order.total_price,
+            status=order.status,
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+            order_items=[
+                OrderItemDTO(product_id=item.product_id, name=item.product.name, quantity=item.quantity, subtotal=item.subtotal)
+                for item in order.order_items
+            ]
+        )
+        for order in orders
+    ]
+
+
+def _core_orders(session, user_id):
+    return fetch_order_dtos(session, user_id=user_id)
+
+
+def _measure(label, func, session, user_id, repeat):
+    timings, cpu = [], []
+    for _ in range(repeat):
+        start, start_cpu = time.perf_counter(), time.process_time()
+        rows = len(func(session, user_id))
+        timings.append((time.perf_counter() - start) * 1000)
+        cpu.append(time.process_time() - start_cpu)
+        session.expunge_all()
+
+    tracemalloc.start()
+    func(session, user_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    session.expunge_all()
+
+    print(
+        f"{label:<5} pedidos={rows}  media={statistics.mean(timings):.1f} ms  "
+        f"cpu/fila={statistics.mean(cpu) / rows * 1e6:.1f} µs  pico={peak / 1024 / 1024:.1f} MiB"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del listado de pedidos.")
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    session = SessionLocal()
+    suffix = time.time_ns()
+    user = User(username=f"benchmark-{suffix}", email=f"benchmark-{suffix}@example.com", password="benchmark", is_active=True)
+    category = Category(name=f"benchmark-{suffix}", description="benchmark")
+    products = [
+        Product(name=f"benchmark-{suffix}-{i}", description="benchmark", price=Decimal("10.50"), stock=0, category=category)
+        for i in range(args.items)
+    ]
+    session.add_all([user, *products])
+    session.flush()
+    session.add_all([
+        Order(
+            user_id=user.id,
+            total_price=Decimal("21.00") * args.items,
+            status="pendiente",
+            order_items=[
+                OrderItem(product_id=product.id, quantity=2, subtotal=Decimal("21.00"))
+                for product in products
+            ]
+        )
+        for _ in range(args.orders)
+    ])
+    session.commit()
+    user_id, category_id = user.id, category.id
+    session.expunge_all()
+
+    try:
+        _measure("orm", _orm_orders, session, user_id, args.repeat)
+        _measure("core", _core_orders, session, user_id, args.repeat)
+    finally:
+        session.query(Order).filter(Order.user_id == user_id).delete()
+        session.query(Product).filter(Product.category_id == category_id).delete()
+        session.query(Category).filter(Category.id == category_id).delete()
+        session.query(User).filter(User.id == user_id).delete()
+        session.commit()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compara la latencia de una actualización parcial con el patrón clásico
+(SELECT + modificar en Python + commit + refresh) frente a `update_returning`
+(un único UPDATE ... RETURNING).
+
+Uso (contra la base de datos configurada en el .env):
+    python -m benchmarks.partial_update --iterations 500
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from app.core.database import SessionLocal
+from app.models.category.category import Category
+from app.models.product.product import Product
+from app.utils.query import update_returning
+
+
+def _classic_update(session, product_id, stock):
+    product = session.query(Product).filter(Product.id == product_id).first()
+    product.stock = stock
+    product.updated_at = datetime.now()
+    session.commit()
+    session.refresh(product)
+    return product
+
+
+def _returning_update(session, product_id, stock):
+    product = update_returning(session, Product, [Product.id == product_id], {
+        "stock": stock,
+        "updated_at": datetime.now()
+    })
+    session.commit()
+    return product
+
+
+def _measure(label, func, session, product_id, iterations):
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(session, product_id, i)
+        timings.append((time.perf_counter() - start) * 1000)
+        session.expunge_all()
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<20} media={statistics.mean(timings):.3f} ms  p50={statistics.median(timings):.3f} ms  p95={p95:.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de actualizaciones parciales.")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    session = SessionLocal()
+    category = Category(name=f"benchmark-{time.time_ns()}", description="benchmark")
+    product = Product(name=f"benchmark-{time.time_ns()}", description="benchmark", price=1, stock=0, category=category)
+    session.add(product)
+    session.commit()
+    product_id, category_id = product.id, category.id
+
+    try:
+        _measure("select+commit+refresh", _classic_update, session, product_id, args.iterations)
+        _measure("update_returning", _returning_update, session, product_id, args.iterations)
+    finally:
+        session.query(Product).filter(Product.id == product_id).delete()
+        session.query(Category).filter(Category.id == category_id).delete()
+        session.commit()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Prueba de carga del pool de conexiones en saturación.
+
+Lanza `--concurrency` peticiones simultáneas que obtienen una conexión como lo hace
+`get_session` y la retienen `--hold` segundos (SELECT pg_sleep). Con más peticiones que
+conexiones, las que no consiguen conexión en DB_POOL_TIMEOUT segundos reciben un 503
+inmediato en lugar de esperar en cola. Compara, por ejemplo:
+
+    python -m benchmarks.pool_saturation --concurrency 50 --hold 1 --pool-timeout 30
+    python -m benchmarks.pool_saturation --concurrency 50 --hold 1 --pool-timeout 0.5
+
+Uso (contra la base de datos configurada en el .env):
+    python -m benchmarks.pool_saturation --concurrency 50 --hold 1
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from app.core.database import create_app_engine, pool_status
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def _request(engine, hold: float):
+    start = time.perf_counter()
+    session = Session(bind=engine)
+    try:
+        session.execute(text("SELECT pg_sleep(:hold)"), {"hold": hold})
+        status = 200
+    except PoolTimeoutError:
+        # La aplicación responde 503 (ver `pool_timeout_handler`)
+        status = 503
+    finally:
+        session.close()
+    return status, (time.perf_counter() - start) * 1000
+
+
+def _summary(label, timings):
+    if not timings:
+        print(f"{label:<10} 0")
+        return
+    timings.sort()
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"{label:<10} {len(timings):>5}  p50={statistics.median(timings):.1f} ms  p95={p95:.1f} ms  max={timings[-1]:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del pool de conexiones.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--hold", type=float, default=1.0, help="Segundos que cada petición retiene la conexión.")
+    parser.add_argument("--pool-size", type=int, default=settings.DB_POOL_SIZE)
+    parser.add_argument("--max-overflow", type=int, default=settings.DB_MAX_OVERFLOW)
+    parser.add_argument("--pool-timeout", type=float, default=settings.DB_POOL_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    engine = create_app_engine(
+        settings.DATABASE_URI, "benchmark",
+        pool_size=args.pool_size, max_overflow=args.max_overflow, pool_timeout=args.pool_timeout
+    )
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(lambda _: _request(engine, args.hold), range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+        print(f"pool={pool_status(engine)} concurrencia={args.concurrency} retención={args.hold}s total={elapsed:.2f}s")
+        _summary("200", [ms for status, ms in results if status == 200])
+        _summary("503", [ms for status, ms in results if status == 503])
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compara el coste de serializar una página de pedidos por el camino de pydantic
+(OrderResponse + validación del response_model + JSONResponse con json.dumps) frente a
+los DTOs servidos con FastJSONResponse (orjson, sin validación).
+
+Los pedidos se generan en memoria con la forma de las filas de la base de datos, así que
+no necesita base de datos.
+
+Uso:
+    python -m benchmarks.serialization --orders 10000 --items 3 --repeat 5
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+from pydantic import TypeAdapter
+from app.core.serialization import FastJSONResponse
+from app.responses.dto import OrderDTO, OrderItemDTO
+from app.responses.order import OrderItemResponse, OrderResponse
+
+
+def _fake_orders(count: int, items: int):
+    now = datetime.now()
+    return [
+        SimpleNamespace(
+            id=i,
+            user_id=i % 100,
+            total_price=Decimal("1234.50") * items,
+            status="pendiente",
+            created_at=now,
+            updated_at=now,
+            order_items=[
+                SimpleNamespace(product_id=j, name=f"Producto {j}", quantity=2, subtotal=Decimal("1234.50"))
+                for j in range(items)
+            ]
+        )
+        for i in range(count)
+    ]
+
+
+def _pydantic_page(orders, adapter: TypeAdapter) -> bytes:
+    responses = [
+        OrderResponse(
+            id=order.id,
+            user_id=order.user_id,
+            total_price=order.total_price,
+            status=order.status,
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+            order_items=[
+                OrderItemResponse(product_id=item.product_id, name=item.name, quantity=item.quantity, subtotal=item.subtotal)
+                for item in order.order_items
+            ]
+        )
+        for order in orders
+    ]
+    # Lo que hace FastAPI con el response_model antes de crear la respuesta
+    content = adapter.dump_python(adapter.validate_python(responses), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _dto_page(orders, adapter: TypeAdapter) -> bytes:
+    return FastJSONResponse([
+        OrderDTO(
+            id=order.id,
+            user_id=order.user_id,
+            total_price=order.total_price,
+            status=order.status,
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+            order_items=[
+                OrderItemDTO(product_id=item.product_id, name=item.name, quantity=item.quantity, subtotal=item.subtotal)
+                for item in order.order_items
+            ]
+        )
+        for order in orders
+    ]).body
+
+
+def _measure(label, func, orders, adapter, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(orders, adapter)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func(orders, adapter)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<10} media={statistics.mean(timings):.1f} ms  min={min(timings):.1f} ms  "
+        f"pico={peak / 1024 / 1024:.1f} MiB  tamaño={len(body) / 1024:.0f} KiB"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de páginas de pedidos.")
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    orders = _fake_orders(args.orders, args.items)
+    adapter = TypeAdapter(List[OrderResponse])
+
+    _measure("pydantic", _pydantic_page, orders, adapter, args.repeat)
+    _measure("dto", _dto_page, orders, adapter, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from dotenv import load_dotenv
 import sys
 from typing import Generator
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from starlette.testclient import TestClient
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,6 +18,8 @@ from app.core.security import generate_token, hash_password
 from app.models.user.user import User
 from app.main import app
 from app.core.database import Base, get_session
+from app.core.cache import catalog_cache
+from app.core.rate_limit import MemoryRateLimitBackend, rate_limiter
 
 # Cargar las variables de entorno desde el archivo .env
 load_dotenv()
@@ -43,7 +45,7 @@ engine = create_engine(DATABASE_URL)
 
 
 # Sesión de prueba para las operaciones de la base de datos
-SessionTesting = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionTesting = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Fixture para crear la sesión de prueba y consultas a la BBDD
 @pytest.fixture(scope="function")
@@ -58,11 +60,25 @@ def test_session() -> Generator:
         session.close()  
         print(f"\n🔴 Sesión cerrada.")  
 
+# Fixture que registra las sentencias SQL ejecutadas durante la prueba
+@pytest.fixture(scope="function")
+def query_counter():
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
 # Fixture para preparar la aplicación para las pruebas
 @pytest.fixture(scope="function")
 def app_test():
     print("Prueba app_test...")
     Base.metadata.create_all(bind=engine)  
+    catalog_cache.invalidate()
+    rate_limiter.backend = MemoryRateLimitBackend()
     yield app 
     Base.metadata.drop_all(bind=engine) 
 
@@ -242,6 +258,7 @@ def test_order_item(test_session, test_order, test_product):
 
     order_item = OrderItem(
         order_id=test_order.id,  
+        order_created_at=test_order.created_at,
         product_id=test_product.id,
         quantity=2,
         subtotal=2400.00  # 2 * 1200.00
@@ -297,3 +314,50 @@ def admin_user(test_session):
     test_session.commit()
   
     return admin_user
+
+
+#Fixture que crea un usuario con rol cliente (sin permisos de administrador)
+@pytest.fixture(scope="function")
+def customer_user(test_session):
+
+    customer_role = test_session.query(UserRole).filter_by(name="cliente").first()
+    if not customer_role:
+        customer_role = UserRole(name="cliente")
+        test_session.add(customer_role)
+        test_session.commit()
+
+    customer = User(
+        username="cliente",
+        email="cliente@example.com",
+        password=hash_password(USER_PASSWORD),
+        verified_at=datetime.now(timezone.utc),
+        is_active=True
+    )
+    customer.roles = [customer_role]
+
+    test_session.add(customer)
+    test_session.commit()
+
+    return customer
+
+
+#Fixture para autenticar un usuario sin rol admin en las pruebas
+@pytest.fixture(scope="function")
+def auth_client_for_customer(app_test, test_session, customer_user):
+
+    def _test_db():
+        try:
+            yield test_session
+        finally:
+            pass
+
+    # Sobrescribe la dependencia para que use la base de datos de prueba
+    app_test.dependency_overrides[get_session] = _test_db
+
+    payload = {"sub": str(customer_user.id)}
+    token = generate_token(payload, timedelta(minutes=30))
+
+    client = TestClient(app_test)
+    client.headers['Authorization'] = f"Bearer {token}"
+
+    return client
@@ -0,0 +1,109 @@
+import importlib.util
+from datetime import date, datetime
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import bindparam, text
+from app.models.order.order import Order
+from app.models.order.order_item import OrderItem
+from tests.conftest import SessionTesting
+from app.services.maintenance.partitions import (
+    add_months,
+    archive_old_partitions,
+    ensure_partitions,
+    is_partitioned,
+    partition_name
+)
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("orders", date(2026, 3, 1)) == "orders_2026_03"
+
+
+def test_maintenance_skips_unpartitioned_tables(app_test, test_session):
+    # El esquema de los tests se crea con create_all, sin particiones
+    assert is_partitioned(test_session, "orders") is False
+    assert ensure_partitions(test_session, months_ahead=2) == []
+    assert archive_old_partitions(test_session, retention_months=1) == {}
+
+
+def test_archive_disabled_without_retention(test_session):
+    assert archive_old_partitions(test_session, retention_months=0) == {}
+
+
+# Esquema migrado: orders y order_items particionados con las claves compuestas
+MIGRATION = Path(__file__).resolve().parents[2] / "alembic" / "versions" / "4c8e2a6f0b17_partition_orders_by_created_at.py"
+
+
+@pytest.fixture(scope="function")
+def partitioned_schema(app_test, test_session):
+    spec = importlib.util.spec_from_file_location("partition_orders_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    with Operations.context(MigrationContext.configure(test_session.connection())):
+        migration.upgrade()
+    test_session.commit()
+
+
+def test_items_reference_their_order_in_the_migrated_schema(partitioned_schema, auth_client, test_session, user, test_product):
+    assert is_partitioned(test_session, "order_items") is True
+
+    response = auth_client.post("/orders/create/", json={
+        "user_id": user.id,
+        "total_price": 1200.00,
+        "status": "pendiente",
+        "products": [{"product_id": test_product.id, "quantity": 1}]
+    })
+    assert response.status_code == 201
+
+    # Artículos añadidos en otra transacción, también a un pedido de un mes anterior
+    new_order = test_session.query(Order).filter(Order.id == response.json()["id"]).one()
+    old_order = Order(user_id=user.id, total_price=0, status="pendiente", created_at=datetime(2020, 1, 15))
+    test_session.add(old_order)
+    test_session.commit()
+
+    items = [
+        OrderItem(order_id=order.id, order_created_at=order.created_at, product_id=test_product.id,
+                  quantity=1, subtotal=Decimal("1200.00"))
+        for order in (new_order, old_order)
+    ]
+    test_session.add_all(items)
+    test_session.commit()
+
+    partitions = dict(test_session.execute(
+        text("SELECT id, tableoid::regclass::text FROM order_items WHERE id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        {"ids": [item.id for item in items]}
+    ).all())
+    assert partitions[items[0].id] == partition_name("order_items", new_order.created_at.date())
+    assert partitions[items[1].id] == "order_items_default"
+
+    response = auth_client.get("/orders/me")
+    assert response.status_code == 200
+    quantities = {order["id"]: len(order["order_items"]) for order in response.json()}
+    assert quantities == {new_order.id: 2, old_order.id: 1}
+
+
+def test_workers_starting_together_create_each_partition_once(partitioned_schema, test_session):
+    def create():
+        session = SessionTesting()
+        try:
+            return ensure_partitions(session, months_ahead=2, today=date(2031, 1, 10))
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: create(), range(4)))
+
+    created = [name for result in results for name in result]
+    assert sorted(created) == sorted(
+        partition_name(table, date(2031, month, 1)) for table in ("orders", "order_items") for month in (1, 2, 3)
+    )
+    assert results.count([]) == 3
@@ -0,0 +1,58 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from app.models.order.order import Order
+from app.models.order.order_item import OrderItem
+from app.models.product.product import Product
+from app.services.maintenance.purge import purge_soft_deleted
+
+
+def _all(session, model):
+    return session.query(model).execution_options(include_deleted=True).all()
+
+
+def test_purge_removes_only_expired_rows(app_test, test_session, test_order, test_order_item, test_category):
+    expired = datetime.now() - timedelta(days=100)
+    test_order.deleted_at = expired
+    recent_product = Product(name="Recent", description="", price=1, stock=1,
+                             category_id=test_category.id, deleted_at=datetime.now())
+    expired_product = Product(name="Expired", description="", price=1, stock=1,
+                              category_id=test_category.id, deleted_at=expired)
+    test_session.add_all([recent_product, expired_product])
+    test_session.commit()
+    recent_product_id, expired_product_id = recent_product.id, expired_product.id
+
+    report = purge_soft_deleted(test_session, retention_days=30, batch_size=1, pause=0)
+
+    assert report["orders"]["deleted"] == 1
+    assert report["products"]["deleted"] == 1
+    test_session.expire_all()
+    assert _all(test_session, Order) == []
+    assert _all(test_session, OrderItem) == []
+    product_ids = {product.id for product in _all(test_session, Product)}
+    assert expired_product_id not in product_ids
+    assert recent_product_id in product_ids
+
+
+def test_purge_keeps_products_referenced_by_orders(app_test, test_session, test_order_item, test_product):
+    test_product.deleted_at = datetime.now() - timedelta(days=100)
+    test_session.commit()
+    product_id = test_product.id
+
+    report = purge_soft_deleted(test_session, retention_days=30, batch_size=10, pause=0)
+
+    assert report["products"]["deleted"] == 0
+    assert test_session.query(Product).execution_options(include_deleted=True).get(product_id) is not None
+
+
+def test_purge_archives_deleted_rows(app_test, test_session, test_order, tmp_path):
+    test_order.deleted_at = datetime.now() - timedelta(days=100)
+    test_session.commit()
+    order_id = test_order.id
+
+    report = purge_soft_deleted(test_session, retention_days=30, batch_size=10, pause=0, archive_dir=str(tmp_path))
+
+    with gzip.open(report["orders"]["archive"], "rt") as archive:
+        rows = [json.loads(line) for line in archive]
+    assert [row["id"] for row in rows] == [order_id]
+    assert report["user_profiles"]["archive"] is None
@@ -0,0 +1,131 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from app.core.admission import ROUTE_GROUPS, AdmissionController, AdmissionLimiter, match_route, route_group
+from app.main import app
+from app.middlewares.admission import AdmissionControlMiddleware
+
+
+def test_queue_serves_higher_priority_first():
+    async def scenario():
+        limiter = AdmissionLimiter("test", limit=1, max_queue=5)
+        assert await limiter.acquire(priority=0, timeout=1)
+
+        order = []
+
+        async def wait(name, priority):
+            assert await limiter.acquire(priority, timeout=1)
+            order.append(name)
+            limiter.release()
+
+        tasks = [asyncio.create_task(wait("catalog", 3)), asyncio.create_task(wait("orders", 0))]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+        return order, limiter.active
+
+    order, active = asyncio.run(scenario())
+
+    assert order == ["orders", "catalog"]
+    assert active == 0
+
+
+def test_rejects_when_queue_is_full_or_wait_times_out():
+    async def scenario():
+        limiter = AdmissionLimiter("test", limit=1, max_queue=1)
+        assert await limiter.acquire(0, timeout=1)
+        waiting = asyncio.create_task(limiter.acquire(0, timeout=0.05))
+        await asyncio.sleep(0)
+        full = await limiter.acquire(0, timeout=1)
+        timed_out = await waiting
+        return full, timed_out, limiter.active
+
+    full, timed_out, active = asyncio.run(scenario())
+
+    assert full is False
+    assert timed_out is False
+    assert active == 1
+
+
+def test_group_limit_isolates_admin_requests():
+    async def scenario():
+        controller = AdmissionController(10, {"admin": (1, 4), "orders": (5, 0)}, max_queue=0, timeout=0.01)
+        first = await controller.admit("admin")
+        second = await controller.admit("admin")
+        orders = await controller.admit("orders")
+        return first, second, orders
+
+    first, second, orders = asyncio.run(scenario())
+
+    assert first is not None
+    assert second is None
+    assert orders is not None
+
+
+def _group(method, path):
+    scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+    return route_group(match_route(app.router.routes, scope))
+
+
+def test_routes_are_grouped_by_area():
+    assert _group("POST", "/orders/create/") == "orders"
+    assert _group("GET", "/products/products/") == "catalog"
+    assert _group("POST", "/auth/login") == "auth"
+    assert _group("GET", "/orders/orders/") == "admin"
+    assert _group("GET", "/admin/db/pool") == "admin"
+
+
+def test_full_queue_returns_503(client, monkeypatch):
+    saturated = AdmissionController(0, {name: (0, 0) for name in ROUTE_GROUPS}, max_queue=0, timeout=0)
+    monkeypatch.setattr("app.middlewares.admission.admission_controller", saturated)
+
+    response = client.get("/products/")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
+
+
+def test_slot_is_held_until_streamed_body_is_sent(monkeypatch):
+    controller = AdmissionController(1, {name: (1, 0) for name in ROUTE_GROUPS}, max_queue=0, timeout=0)
+    monkeypatch.setattr("app.middlewares.admission.admission_controller", controller)
+
+    streaming_app = FastAPI()
+    streaming_app.add_middleware(AdmissionControlMiddleware)
+
+    @streaming_app.get("/products/stream")
+    async def stream():
+        async def body():
+            for chunk in (b"uno", b"dos"):
+                await asyncio.sleep(0.01)
+                yield chunk
+        return StreamingResponse(body())
+
+    active_while_sending = []
+
+    async def scenario():
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/products/stream", "raw_path": b"/products/stream",
+            "root_path": "", "query_string": b"", "headers": [], "server": ("test", 80), "client": ("test", 1234)
+        }
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                active_while_sending.append(controller.global_limiter.active)
+
+        await streaming_app(scope, receive, send)
+        return controller.global_limiter.active
+
+    active_after = asyncio.run(scenario())
+
+    assert len(active_while_sending) >= 2
+    assert all(active == 1 for active in active_while_sending)
+    assert active_after == 0
@@ -0,0 +1,135 @@
+import asyncio
+import contextvars
+import pstats
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from app.core.bulkhead import Bulkhead, iterate_in_thread
+from app.core.profiling import reset_thread_profiles, save_profile, start_thread_profiles, stop_profile, try_start_profile
+from app.models.product.product import Product
+from app.services.product import product_import
+from app.services.product.product_import import CSV_FORMAT, import_products
+
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_slow_pool_does_not_delay_other_pools():
+    admin = Bulkhead("test-admin", max_workers=1, max_queue=10)
+    orders = Bulkhead("test-orders", max_workers=1, max_queue=10)
+
+    async def scenario():
+        report = asyncio.create_task(admin.run(time.sleep, 0.5))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await orders.run(lambda: None)
+        elapsed = time.perf_counter() - start
+        status = admin.status()
+        await report
+        return elapsed, status
+
+    elapsed, status = asyncio.run(scenario())
+
+    assert elapsed < 0.3
+    assert status["active"] == 1
+    assert status["utilization"] == 1.0
+
+
+def test_rejects_when_queue_is_full():
+    pool = Bulkhead("test-full", max_workers=1, max_queue=1)
+
+    async def scenario():
+        running = asyncio.create_task(pool.run(time.sleep, 0.3))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(pool.run(lambda: None))
+        await asyncio.sleep(0.05)
+        queued = pool.status()["queued"]
+        with pytest.raises(HTTPException) as error:
+            await pool.run(lambda: None)
+        await asyncio.gather(running, waiting)
+        return queued, error.value
+
+    queued, error = asyncio.run(scenario())
+
+    assert queued == 1
+    assert error.status_code == 503
+    assert "Retry-After" in error.headers
+
+
+def test_runs_sync_services_in_worker_thread_with_request_context():
+    pool = Bulkhead("test-context", max_workers=2, max_queue=10)
+
+    def service():
+        return request_id.get(), threading.get_ident()
+
+    async def scenario():
+        request_id.set("abc")
+        return await pool.run(service), threading.get_ident()
+
+    (value, worker_thread), loop_thread = asyncio.run(scenario())
+
+    assert value == "abc"
+    assert worker_thread != loop_thread
+
+
+def test_profile_follows_work_into_bulkhead_thread(tmp_path):
+    pool = Bulkhead("test-profile", max_workers=1, max_queue=10)
+
+    def slow_report():
+        return sum(i * i for i in range(100_000))
+
+    async def scenario():
+        profiler = try_start_profile()
+        thread_profiles, token = start_thread_profiles()
+        try:
+            await pool.run(slow_report)
+        finally:
+            stop_profile(profiler)
+            reset_thread_profiles(token)
+        return save_profile(profiler, str(tmp_path), "GET", "/admin/report", 5, thread_profiles)
+
+    profile_id = asyncio.run(scenario())
+    stats = pstats.Stats(str(tmp_path / f"{profile_id}.prof"))
+
+    assert any(function == "slow_report" for _, _, function in stats.stats)
+
+
+def test_loop_stays_responsive_during_product_import(app_test, test_session, test_category, monkeypatch):
+    validate_chunk = product_import._validate_chunk
+
+    def slow_validate_chunk(rows):
+        time.sleep(0.3)
+        return validate_chunk(rows)
+
+    monkeypatch.setattr(product_import, "_validate_chunk", slow_validate_chunk)
+
+    async def chunks():
+        yield b"name,description,price,stock,category_id\n"
+        for i in range(5):
+            await asyncio.sleep(0.01)
+            yield f"Producto {i},Importado,10.00,1,{test_category.id}\n".encode()
+
+    async def scenario():
+        gaps = []
+        done = asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        result = await import_products(test_session, iterate_in_thread(chunks()), CSV_FORMAT)
+        done.set()
+        await tick
+        return result, max(gaps)
+
+    result, max_gap = asyncio.run(scenario())
+
+    assert result.inserted == 5
+    assert max_gap < 0.15
+    assert test_session.query(Product).filter(Product.name.like("Producto %")).count() == 5
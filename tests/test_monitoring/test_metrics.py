@@ -0,0 +1,64 @@
+import json
+import os
+from app.core.metrics import MetricsRegistry
+
+
+def test_metrics_endpoint_reports_route_templates(client, test_product):
+    client.get(f"/products/{test_product.id}")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/products/{product_id}"' in response.text
+    assert "http_request_duration_seconds_bucket" in response.text
+    assert 'db_pool_checked_out{pool="primary"}' in response.text
+
+
+def test_registry_aggregates_worker_snapshots(tmp_path):
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Peticiones.", ("status",))
+    latency = registry.histogram("latency_seconds", "Latencia.", buckets=(0.1, 1.0))
+    requests.inc("200", amount=2)
+    latency.observe(0.05)
+
+    # Instantánea de otro worker vivo (se usa el pid del proceso padre)
+    other_worker = {
+        "requests_total": [[["200"], 3]],
+        "latency_seconds": [[[], [[0, 1, 0], 0.5, 1]]]
+    }
+    with open(os.path.join(tmp_path, f"{os.getppid()}.json"), "w") as f:
+        json.dump(other_worker, f)
+
+    output = registry.render(str(tmp_path))
+
+    assert 'requests_total{status="200"} 5' in output
+    assert 'latency_seconds_bucket{le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{le="1"} 2' in output
+    assert "latency_seconds_count 2" in output
+
+
+def test_registry_keeps_counters_of_dead_workers(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Peticiones.").inc()
+    registry.histogram("latency_seconds", "Latencia.", buckets=(0.1, 1.0))
+    registry.gauge("in_flight", "Peticiones en curso.")
+
+    dead_snapshot = os.path.join(tmp_path, "999999999.json")
+    with open(dead_snapshot, "w") as f:
+        json.dump({
+            "requests_total": [[[], 10]],
+            "latency_seconds": [[[], [[1, 0, 0], 0.05, 1]]],
+            "in_flight": [[[], 4]]
+        }, f)
+
+    output = registry.render(str(tmp_path))
+
+    # Los totales del worker terminado se conservan; su gauge se descarta
+    assert "requests_total 11" in output
+    assert "latency_seconds_count 1" in output
+    assert "in_flight 4" not in output
+    assert not os.path.exists(dead_snapshot)
+
+    # Se acumulan una sola vez aunque se vuelva a exportar
+    assert "requests_total 11" in registry.render(str(tmp_path))
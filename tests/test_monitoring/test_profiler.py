@@ -0,0 +1,44 @@
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def test_admin_can_profile_request(auth_client_for_admin, test_product, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+
+    response = auth_client_for_admin.get(f"/products/{test_product.id}", headers={settings.PROFILE_HEADER: "1"})
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    profiles = auth_client_for_admin.get("/admin/profiles")
+    assert profile_id in profiles.json()
+
+    report = auth_client_for_admin.get(f"/admin/profiles/{profile_id}")
+    assert report.status_code == 200
+    assert "function calls" in report.text
+
+
+def test_profile_header_ignored_for_non_admin(auth_client_for_customer, test_product, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+
+    response = auth_client_for_customer.get(f"/products/{test_product.id}", headers={settings.PROFILE_HEADER: "1"})
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profiles_endpoint_requires_admin(auth_client_for_customer):
+    response = auth_client_for_customer.get("/admin/profiles")
+
+    assert response.status_code == 403
+
+
+def test_unknown_profile_returns_404(auth_client_for_admin, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+
+    response = auth_client_for_admin.get("/admin/profiles/../../etc/passwd")
+
+    assert response.status_code == 404
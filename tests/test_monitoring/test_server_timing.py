@@ -0,0 +1,38 @@
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def _phases(header):
+    return {part.split(";")[0].strip() for part in header.split(",")}
+
+
+def test_server_timing_for_admin_header(auth_client_for_admin, test_order):
+    response = auth_client_for_admin.get("/orders/me", headers={settings.SERVER_TIMING_HEADER: "1"})
+
+    assert response.status_code == 200
+    phases = _phases(response.headers["Server-Timing"])
+    assert {"auth", "deps", "app", "serialize", "db", "total"} <= phases
+
+
+def test_server_timing_header_ignored_for_non_admin(auth_client_for_customer, test_product):
+    response = auth_client_for_customer.get(f"/products/{test_product.id}", headers={settings.SERVER_TIMING_HEADER: "1"})
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+
+def test_server_timing_enabled_by_config(auth_client, test_product, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+
+    response = auth_client.get(f"/products/{test_product.id}")
+
+    assert response.status_code == 200
+    assert "app" in _phases(response.headers["Server-Timing"])
+
+
+def test_server_timing_disabled_by_default(auth_client, test_product):
+    response = auth_client.get(f"/products/{test_product.id}")
+
+    assert "Server-Timing" not in response.headers
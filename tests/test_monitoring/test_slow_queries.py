@@ -0,0 +1,75 @@
+import json
+import pytest
+from app.core.settings import get_settings
+from app.core.slow_queries import is_read_only, normalize_statement, parameters_shape, slow_query_recorder
+
+
+settings = get_settings()
+
+
+@pytest.fixture
+def record_every_query(tmp_path, monkeypatch):
+    # Umbral mínimo para que cualquier sentencia se considere lenta
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.000001)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", False)
+    monkeypatch.setattr(settings, "SLOW_QUERY_LOG_FILE", str(tmp_path / "slow_queries.log"))
+    slow_query_recorder.reset()
+    yield tmp_path / "slow_queries.log"
+    slow_query_recorder.reset()
+
+
+def test_normalize_statement_groups_parameters_and_in_lists():
+    statement = (
+        "SELECT products.id FROM products "
+        "WHERE products.id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s) AND products.name = 'Tablet' LIMIT 10"
+    )
+
+    assert normalize_statement(statement) == (
+        "SELECT products.id FROM products WHERE products.id IN (...) AND products.name = ? LIMIT ?"
+    )
+
+
+def test_parameters_shape_hides_values():
+    assert parameters_shape({"id": 1, "name": "Tablet"}) == {"id": "int", "name": "str"}
+    assert parameters_shape([{"id": 1}, {"id": 2}], executemany=True) == {"rows": 2, "shape": {"id": "int"}}
+
+
+def test_slow_queries_are_listed_for_admin(auth_client_for_admin, test_order, record_every_query):
+    auth_client_for_admin.get(f"/orders/{test_order.id}")
+
+    response = auth_client_for_admin.get("/admin/slow-queries", params={"sort": "count"})
+
+    assert response.status_code == 200
+    entries = response.json()
+    assert entries
+    assert any(caller.startswith("app.services.order.order:") for entry in entries for caller in entry["callers"])
+    assert all("%(" not in entry["statement"] for entry in entries)
+
+
+def test_slow_queries_endpoint_requires_admin(auth_client_for_customer):
+    response = auth_client_for_customer.get("/admin/slow-queries")
+
+    assert response.status_code == 403
+
+
+def test_only_read_only_statements_are_analyzed():
+    assert is_read_only("SELECT * FROM products WHERE id = %(id)s")
+    assert not is_read_only("SELECT * FROM products FOR UPDATE")
+    assert not is_read_only("WITH latest AS (SELECT 1) UPDATE products SET stock = 0")
+    assert not is_read_only("UPDATE products SET stock = 0 RETURNING id")
+
+
+def test_slow_queries_are_logged_to_the_configured_file(client, test_product, record_every_query):
+    client.get(f"/products/{test_product.id}")
+
+    records = [json.loads(line) for line in record_every_query.read_text().splitlines()]
+    assert any("FROM products" in record["statement"] for record in records)
+
+
+def test_plans_come_from_the_database_that_ran_the_statement(app_test, test_session):
+    url = test_session.get_bind().url
+
+    plan = slow_query_recorder._explain(url, "SELECT 1", None)
+
+    assert "Result" in plan
+    assert slow_query_recorder._explain_engines[url].url == url
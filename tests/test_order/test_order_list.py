@@ -0,0 +1,43 @@
+from datetime import datetime
+from decimal import Decimal
+from app.models.order.order_item import OrderItem
+
+
+def test_user_orders_in_a_single_query(auth_client, test_order, test_order_item, query_counter):
+    response = auth_client.get("/orders/me")
+
+    assert response.status_code == 200
+    order = response.json()[0]
+    assert order["id"] == test_order.id
+    assert order["order_items"] == [{
+        "product_id": test_order_item.product_id,
+        "name": "Laptop Gamer",
+        "quantity": 2,
+        "subtotal": "2400.00"
+    }]
+    # usuario autenticado + pedidos con sus artículos
+    assert len(query_counter) == 2
+
+
+def test_user_orders_skip_deleted_items(auth_client, test_session, test_order, test_order_item, test_product):
+    test_session.add(OrderItem(
+        order_id=test_order.id,
+        order_created_at=test_order.created_at,
+        product_id=test_product.id,
+        quantity=1,
+        subtotal=Decimal("1200.00"),
+        deleted_at=datetime.now()
+    ))
+    test_session.commit()
+
+    response = auth_client.get("/orders/me")
+
+    assert response.status_code == 200
+    assert [item["quantity"] for item in response.json()[0]["order_items"]] == [2]
+
+
+def test_order_without_items_has_empty_list(auth_client, test_order):
+    response = auth_client.get("/orders/me")
+
+    assert response.status_code == 200
+    assert response.json()[0]["order_items"] == []
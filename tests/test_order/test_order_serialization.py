@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from app.core.serialization import dumps
+from app.responses.dto import OrderDTO, OrderItemDTO
+
+
+def test_dumps_keeps_decimals_exact():
+    order = OrderDTO(
+        id=1,
+        user_id=2,
+        total_price=Decimal("2400.10"),
+        status="pendiente",
+        created_at=datetime(2025, 3, 1, 12, 30),
+        updated_at=datetime(2025, 3, 1, 12, 30),
+        order_items=[OrderItemDTO(product_id=3, name="Portátil", quantity=2, subtotal=Decimal("2400.10"))]
+    )
+
+    data = json.loads(dumps([order]))
+
+    assert data[0]["total_price"] == "2400.10"
+    assert data[0]["order_items"][0] == {"product_id": 3, "name": "Portátil", "quantity": 2, "subtotal": "2400.10"}
+    assert data[0]["created_at"] == "2025-03-01T12:30:00"
+
+
+def test_order_list_uses_dto_response(auth_client, test_order, test_order_item):
+    response = auth_client.get("/orders/me")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    order = response.json()[0]
+    assert set(order) == {"id", "user_id", "total_price", "status", "created_at", "updated_at", "order_items"}
+    assert Decimal(order["order_items"][0]["subtotal"]) == test_order_item.subtotal
@@ -0,0 +1,61 @@
+import gzip
+import json
+import os
+import time
+from app.core.settings import get_settings
+from app.services.catalog.snapshot import SnapshotScheduler, current_snapshot, write_snapshot
+
+
+settings = get_settings()
+
+
+def test_snapshot_is_versioned_by_content(test_session, test_product, tmp_path):
+    version = write_snapshot(test_session, str(tmp_path))
+
+    assert current_snapshot(str(tmp_path)) == (version, str(tmp_path / f"catalog-{version}.json"))
+    with gzip.open(tmp_path / f"catalog-{version}.json.gz") as f:
+        catalog = json.load(f)
+    assert catalog["products"][0]["name"] == "Laptop Gamer"
+    assert catalog["categories"][0]["id"] == test_product.category_id
+
+    # Sin cambios en el catálogo la versión no cambia
+    assert write_snapshot(test_session, str(tmp_path)) == version
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".json")]) == 1
+
+
+def test_snapshot_endpoint_with_etag(client, test_session, test_product, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_DIR", str(tmp_path))
+    version = write_snapshot(test_session)
+
+    response = client.get("/catalog/snapshot", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f'"{version}-gzip"'
+    assert response.json()["products"][0]["id"] == test_product.id
+
+    cached = client.get("/catalog/snapshot", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+    plain = client.get("/catalog/snapshot", headers={"Accept-Encoding": "identity"})
+    assert plain.headers["etag"] == f'"{version}"'
+    assert "content-encoding" not in plain.headers
+
+
+def test_snapshot_endpoint_without_snapshot(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_DIR", str(tmp_path))
+
+    assert client.get("/catalog/snapshot").status_code == 404
+
+
+def test_scheduler_debounces_changes(monkeypatch):
+    monkeypatch.setattr(settings, "CATALOG_SNAPSHOT_ENABLED", True)
+    scheduler = SnapshotScheduler(debounce=0.1, max_delay=5)
+    calls = []
+    monkeypatch.setattr(scheduler, "generate", lambda: calls.append(time.monotonic()))
+
+    for _ in range(5):
+        scheduler.schedule()
+    time.sleep(0.3)
+
+    assert len(calls) == 1
@@ -0,0 +1,94 @@
+import pytest
+from app.core.cache import CatalogCache
+
+
+
+
+def test_fetch_products_batch(client, test_product):
+    """
+    Prueba la consulta de varios productos en una sola petición.
+    """
+    payload = {"ids": [999999, test_product.id, test_product.id]}
+
+    response = client.post("/products/batch", json=payload)
+
+    if response.status_code != 200:
+        print(f"Respuesta del servidor: {response.text}\n")
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [product["id"] for product in data["products"]] == [test_product.id]
+    assert data["products"][0]["name"] == test_product.name
+    assert data["missing"] == [999999]
+
+
+def test_fetch_products_batch_uses_cache(client, test_product, query_counter):
+    """
+    Prueba que una segunda consulta se sirve desde la caché del catálogo.
+    """
+    response = client.post("/products/batch", json={"ids": [test_product.id]})
+    assert response.status_code == 200
+    query_counter.clear()
+
+    cached = client.post("/products/batch", json={"ids": [test_product.id]})
+    assert cached.status_code == 200
+    assert cached.json()["products"][0]["name"] == test_product.name
+    assert not [statement for statement in query_counter if "FROM products" in statement]
+
+
+def test_invalidation_reaches_other_workers(tmp_path):
+    """
+    Prueba que una invalidación hecha en un worker descarta las entradas de los demás.
+    """
+    worker = CatalogCache(ttl=300, max_entries=100, sync_dir=str(tmp_path))
+    other_worker = CatalogCache(ttl=300, max_entries=100, sync_dir=str(tmp_path))
+
+    worker.get_many("product", [1, 2])
+    worker.set_many("product", {1: {"name": "Laptop"}, 2: {"name": "Ratón"}})
+    assert worker.get("product", 1) == {"name": "Laptop"}
+
+    other_worker.invalidate("product", [1])
+
+    assert worker.get_many("product", [1, 2]) == ({}, [1, 2])
+
+
+def test_invalidation_during_read_drops_the_write(tmp_path):
+    """
+    Prueba que no se guarda en caché lo leído antes de una invalidación de otro worker.
+    """
+    worker = CatalogCache(ttl=300, max_entries=100, sync_dir=str(tmp_path), sync_interval=60)
+    other_worker = CatalogCache(ttl=300, max_entries=100, sync_dir=str(tmp_path))
+
+    version = worker.version("product")
+    assert worker.get_many("product", [1]) == ({}, [1])
+    other_worker.invalidate("product", [1])
+    worker.set_many("product", {1: {"name": "Laptop"}}, version)
+
+    assert worker.get("product", 1) is None
+
+    version = worker.version("product")
+    worker.set_many("product", {1: {"name": "Laptop Gamer"}}, version)
+    assert worker.get("product", 1) == {"name": "Laptop Gamer"}
+
+
+def test_version_files_are_checked_at_most_once_per_interval(tmp_path, monkeypatch):
+    worker = CatalogCache(ttl=300, max_entries=100, sync_dir=str(tmp_path), sync_interval=60)
+    stats = []
+    read_version = worker._read_version
+    monkeypatch.setattr(worker, "_read_version", lambda namespace: stats.append(namespace) or read_version(namespace))
+
+    for _ in range(10):
+        worker.get("product", 1)
+
+    assert len(stats) == 2
+
+
+def test_relative_sync_dir_is_rejected():
+    with pytest.raises(ValueError):
+        CatalogCache(ttl=300, max_entries=100, sync_dir="cache/catalog")
+
+
+def test_fetch_products_batch_empty(client):
+    response = client.post("/products/batch", json={"ids": []})
+    assert response.status_code == 422
@@ -0,0 +1,69 @@
+from decimal import Decimal
+from app.models.product.product import Product
+
+
+def test_bulk_update_products(auth_client_for_admin, test_session, test_product):
+    """
+    Prueba la actualización masiva de precio y stock.
+    """
+    payload = {
+        "items": [
+            {"id": test_product.id, "price": "1099.90"},
+            {"id": 999999, "stock": 1},
+            {"id": test_product.id, "stock": 4},
+        ]
+    }
+
+    response = auth_client_for_admin.patch("/products/bulk", json=payload)
+
+    if response.status_code != 200:
+        print(f"Respuesta del servidor: {response.text}\n")
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["updated"] == 1
+    assert data["not_found"] == 1
+    assert data["results"] == [
+        {"id": test_product.id, "status": "updated"},
+        {"id": 999999, "status": "not_found"},
+        {"id": test_product.id, "status": "updated"},
+    ]
+
+    test_session.expire_all()
+    product = test_session.query(Product).filter_by(id=test_product.id).first()
+    # Los cambios del mismo ID se combinan: el precio del primero y el stock del segundo
+    assert product.price == Decimal("1099.90")
+    assert product.stock == 4
+
+
+def test_bulk_update_products_requires_changes(auth_client_for_admin, test_product):
+    response = auth_client_for_admin.patch("/products/bulk", json={"items": [{"id": test_product.id}]})
+    assert response.status_code == 422
+
+
+def test_bulk_update_products_last_value_wins_per_field(auth_client_for_admin, test_session, test_product):
+    payload = {
+        "items": [
+            {"id": test_product.id, "price": "10.00", "stock": 1},
+            {"id": test_product.id, "price": "20.00"},
+        ]
+    }
+
+    response = auth_client_for_admin.patch("/products/bulk", json=payload)
+
+    assert response.status_code == 200
+    test_session.expire_all()
+    product = test_session.query(Product).filter_by(id=test_product.id).first()
+    assert product.price == Decimal("20.00")
+    assert product.stock == 1
+
+
+def test_bulk_update_products_caps_raw_item_count(auth_client_for_admin, test_product, monkeypatch):
+    monkeypatch.setattr("app.services.product.product.settings.PRODUCT_BULK_UPDATE_MAX_ITEMS", 2)
+    items = [{"id": test_product.id, "stock": stock} for stock in range(3)]
+
+    response = auth_client_for_admin.patch("/products/bulk", json={"items": items})
+
+    # El límite cuenta los elementos recibidos, aunque repitan ID
+    assert response.status_code == 400
@@ -0,0 +1,66 @@
+import asyncio
+from app.core.compression import choose_encoding, compress
+from app.middlewares import compression as compression_middleware
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def test_choose_encoding_respects_quality():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("") is None
+
+
+def test_small_responses_are_not_compressed(client, test_product):
+    response = client.get("/products/products/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_product_list_is_compressed_once(client, test_product, monkeypatch, query_counter):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 0)
+
+    first = client.get("/products/products/", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/products/products/", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "gzip"
+    assert second.headers["vary"] == "Accept-Encoding"
+    assert second.json() == first.json()
+    assert first.json()[0]["name"] == "Laptop Gamer"
+    # La segunda respuesta sale de la caché del catálogo, ya comprimida
+    assert len([statement for statement in query_counter if "FROM products" in statement]) == 1
+
+
+def test_uncompressed_client_gets_plain_body(client, test_product, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 0)
+
+    response = client.get("/products/products/", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json()[0]["name"] == "Laptop Gamer"
+
+
+def test_large_bodies_are_compressed_off_the_event_loop(client, test_product, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 0)
+    on_loop = []
+
+    def spy(body, encoding):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return compress(body, encoding)
+
+    monkeypatch.setattr(compression_middleware, "compress", spy)
+
+    small = client.get(f"/products/{test_product.id}", headers={"Accept-Encoding": "gzip"})
+    monkeypatch.setattr(settings, "COMPRESSION_THREAD_MIN_SIZE", 0)
+    large = client.get(f"/products/{test_product.id}", headers={"Accept-Encoding": "gzip"})
+
+    assert small.headers["content-encoding"] == large.headers["content-encoding"] == "gzip"
+    assert large.json()["name"] == "Laptop Gamer"
+    assert on_loop == [True, False]
@@ -0,0 +1,59 @@
+from app.models.product.product import Product
+
+
+def test_import_products_csv(auth_client_for_admin, test_session, test_category, test_product):
+    """
+    Prueba la importación masiva de productos desde CSV con upsert por nombre.
+    """
+    content = (
+        "name,description,price,stock,category_id\n"
+        f"{test_product.name},Actualizado,999.99,3,{test_category.id}\n"
+        f"Ratón,\"Ratón inalámbrico,\nergonómico\",19.90,100,{test_category.id}\n"
+        f"Teclado,Mecánico,-5,10,{test_category.id}\n"
+        "Monitor,27 pulgadas,199.00,5,999999\n"
+    )
+
+    response = auth_client_for_admin.post(
+        "/products/import",
+        content=content.encode("utf-8"),
+        headers={"Content-Type": "text/csv"}
+    )
+
+    if response.status_code != 200:
+        print(f"Respuesta del servidor: {response.text}\n")
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["received"] == 4
+    assert data["inserted"] == 1
+    assert data["updated"] == 1
+    assert data["rejected"] == 2
+    assert [error["line"] for error in data["errors"]] == [5, 6]
+
+    test_session.expire_all()
+    updated = test_session.query(Product).filter_by(name=test_product.name).first()
+    assert updated.stock == 3
+
+    created = test_session.query(Product).filter_by(name="Ratón").first()
+    assert created is not None
+    assert created.description == "Ratón inalámbrico,\nergonómico"
+
+
+def test_import_products_ndjson(auth_client_for_admin, test_session, test_category):
+    content = (
+        f'{{"name": "Auriculares", "price": "49.99", "stock": 7, "category_id": {test_category.id}}}\n'
+        "esto no es json\n"
+    )
+
+    response = auth_client_for_admin.post("/products/import?format=ndjson", content=content.encode("utf-8"))
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 1
+    assert data["errors"] == [{"line": 2, "detail": "JSON inválido."}]
+
+
+def test_import_products_unknown_format(auth_client_for_admin):
+    response = auth_client_for_admin.post("/products/import", content=b"name\n", headers={"Content-Type": "text/plain"})
+    assert response.status_code == 415
@@ -21,7 +21,7 @@ def test_delete_profile_user(auth_client, user_profile, test_session):
     assert response.status_code == 200
 
     # Confirmar que el perfil fue marcado como eliminado
-    deleted_profile = test_session.query(UserProfile).filter(UserProfile.user_id == user_profile.id).first()
+    deleted_profile = test_session.query(UserProfile).execution_options(include_deleted=True).filter(UserProfile.user_id == user_profile.id).first()
 
     assert deleted_profile is not None
     assert deleted_profile.deleted_at is not None
@@ -1,4 +1,4 @@
-
+from datetime import datetime
 from app.models.user.user_profile import UserProfile
 
 def test_update_user_profile(auth_client, user_profile, test_session):
@@ -37,3 +37,51 @@ def test_update_user_profile(auth_client, user_profile, test_session):
     assert updated_profile.first_name == payload["first_name"]
     assert updated_profile.last_name == payload["last_name"]
     print(f"Nuevo nombre y apellidos: ",updated_profile.first_name)
+
+
+PAYLOAD = {
+    "first_name": "Pepito",
+    "last_name": "Palotes",
+    "dni": "01456123X",
+    "phone": 987654321,
+    "address": "Sesame Street",
+    "birth_date": "1980-03-28",
+    "city": "Kyoto",
+    "zip_code": 29010
+}
+
+
+def test_update_user_profile_not_found(auth_client, user):
+    """
+    Prueba que actualizar un perfil inexistente devuelve 404, también con un DNI inválido.
+    """
+    response = auth_client.put("/users/profile/update", json={**PAYLOAD, "user_id": user.id})
+    assert response.status_code == 404
+
+    response = auth_client.put("/users/profile/update", json={**PAYLOAD, "user_id": user.id, "dni": "1234"})
+    assert response.status_code == 404
+
+
+def test_update_user_profile_invalid_dni(auth_client, user_profile, test_session):
+    response = auth_client.put("/users/profile/update", json={**PAYLOAD, "user_id": user_profile.id, "dni": "1234"})
+
+    assert response.status_code == 400
+    test_session.expire_all()
+    assert test_session.query(UserProfile).filter(UserProfile.id == user_profile.id).one().first_name != "Pepito"
+
+
+def test_update_soft_deleted_user_profile(auth_client, user_profile, test_session):
+    """
+    Prueba que un perfil eliminado lógicamente no se actualiza.
+    """
+    user_profile.deleted_at = datetime.now()
+    test_session.commit()
+
+    response = auth_client.put("/users/profile/update", json={**PAYLOAD, "user_id": user_profile.id})
+
+    assert response.status_code == 404
+    deleted = test_session.query(UserProfile).execution_options(include_deleted=True).filter(
+        UserProfile.id == user_profile.id
+    ).one()
+    test_session.refresh(deleted)
+    assert deleted.first_name != "Pepito"
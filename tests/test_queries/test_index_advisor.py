@@ -0,0 +1,26 @@
+from app.commands.index_advisor import advise, extract_predicates
+
+
+def test_extract_predicates_resolves_aliases_and_live_filters():
+    query = (
+        "SELECT orders.id FROM orders "
+        "LEFT OUTER JOIN order_items AS order_items_1 ON orders.id = order_items_1.order_id "
+        "WHERE orders.user_id = $1 AND orders.deleted_at IS NULL"
+    )
+
+    columns, live_tables = extract_predicates(query)
+
+    assert ("orders", "user_id") in columns
+    assert ("order_items", "order_id") in columns
+    assert ("orders", "deleted_at") not in columns
+    assert live_tables == {"orders"}
+
+
+def test_model_foreign_keys_are_indexed(app_test, test_session):
+    suggestions = advise(test_session)
+
+    unindexed = {(item["table"], tuple(item["columns"])) for item in suggestions["foreign_keys"]}
+    assert ("orders", ("user_id",)) not in unindexed
+    assert ("order_items", ("order_id",)) not in unindexed
+    assert ("order_items", ("product_id",)) not in unindexed
+    assert ("products", ("category_id",)) not in unindexed
@@ -0,0 +1,81 @@
+"""
+Pruebas de regresión sobre el número de sentencias SQL que ejecuta cada endpoint de creación.
+
+Los INSERT recuperan los valores por defecto con RETURNING, así que ninguna creación
+debe volver a leer la fila recién insertada.
+"""
+from tests.conftest import USER_PASSWORD
+
+
+def test_create_category_query_count(auth_client_for_admin, query_counter):
+    response = auth_client_for_admin.post("/categories/create", json={"name": "Audio", "description": "Sonido"})
+
+    assert response.status_code == 201
+    assert response.json()["created_at"] is not None
+    # usuario autenticado + comprobación de nombre + INSERT
+    assert len(query_counter) == 3, query_counter
+
+
+def test_create_product_query_count(auth_client_for_admin, test_category, query_counter):
+    product_data = {
+        "name": "Tablet",
+        "description": "Tablet de 11 pulgadas",
+        "price": 349.99,
+        "stock": 5,
+        "category_id": test_category.id
+    }
+
+    response = auth_client_for_admin.post("/products/create", json=product_data)
+
+    assert response.status_code == 201
+    # usuario autenticado + categoría + comprobación de nombre + INSERT
+    assert len(query_counter) == 4, query_counter
+
+
+def test_create_order_query_count(auth_client, user, test_product, query_counter):
+    payload = {"user_id": user.id, "products": [{"product_id": test_product.id, "quantity": 2}]}
+
+    response = auth_client.post("/orders/create/", json=payload)
+
+    assert response.status_code == 201
+    # usuario autenticado + productos (IN) + INSERT pedido + INSERT artículos
+    assert len(query_counter) == 4, query_counter
+
+
+def test_register_user_query_count(client, user_roles, query_counter):
+    payload = {"username": "Misty", "email": "misty@example.com", "password": "Cerulean_123!"}
+
+    response = client.post("/users", json=payload)
+
+    assert response.status_code == 201
+    assert response.json()["created_at"] is not None
+    # email existente + INSERT usuario + rol cliente + INSERT rol
+    assert len(query_counter) == 4, query_counter
+
+
+def test_login_query_count(client, user, query_counter):
+    response = client.post("/auth/login", data={"username": user.email, "password": USER_PASSWORD})
+
+    assert response.status_code == 200
+    # usuario + INSERT token
+    assert len(query_counter) == 2, query_counter
+
+
+def test_create_profile_query_count(auth_client, user, query_counter):
+    payload = {
+        "user_id": user.id,
+        "first_name": "Brock",
+        "last_name": "Harrison",
+        "dni": "12345678Z",
+        "phone": 600000000,
+        "address": "Pewter City",
+        "birth_date": "1990-01-01",
+        "city": "Kanto",
+        "zip_code": 28001
+    }
+
+    response = auth_client.post("/users/profile/create", json=payload)
+
+    assert response.status_code == 201
+    # usuario autenticado + perfil existente + INSERT
+    assert len(query_counter) == 3, query_counter
@@ -0,0 +1,54 @@
+import os
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.core import database
+from app.core.database import RoutingSession, create_app_engine, get_session
+
+
+# URI de un PgBouncer en modo transacción (pool_mode = transaction) delante de la base de datos de tests
+PGBOUNCER_URI = os.getenv("TEST_PGBOUNCER_DATABASE_URI")
+
+pytestmark = pytest.mark.skipif(not PGBOUNCER_URI, reason="TEST_PGBOUNCER_DATABASE_URI no configurada")
+
+
+@pytest.fixture(scope="function")
+def pgbouncer_session(monkeypatch):
+    monkeypatch.setattr(database.settings, "DB_PGBOUNCER", True)
+    engine = create_app_engine(PGBOUNCER_URI)
+    session = sessionmaker(class_=RoutingSession, bind=engine, autoflush=False, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _use_session(app, session):
+    def _pgbouncer_db():
+        yield session
+
+    app.dependency_overrides[get_session] = _pgbouncer_db
+
+
+def test_pgbouncer_mode_uses_null_pool(pgbouncer_session):
+    assert isinstance(pgbouncer_session.get_bind().pool, NullPool)
+
+
+def test_services_work_through_pgbouncer(auth_client, app_test, pgbouncer_session, user, test_product):
+    _use_session(app_test, pgbouncer_session)
+
+    response = auth_client.get("/products/products/")
+    assert response.status_code == 200
+    assert test_product.name in [product["name"] for product in response.json()]
+
+    for _ in range(3):
+        response = auth_client.post("/orders/create/", json={
+            "user_id": user.id,
+            "total_price": float(test_product.price),
+            "status": "pendiente",
+            "products": [{"product_id": test_product.id, "quantity": 1}]
+        })
+        assert response.status_code == 201
+
+    response = auth_client.get("/orders/me")
+    assert response.status_code == 200
+    assert len(response.json()) == 3
@@ -0,0 +1,49 @@
+import asyncio
+import time
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from app.core.database import create_app_engine, pool_status, pool_timeout_handler
+from app.services.product.product import fetch_all_products
+
+
+def test_checkout_fails_fast_with_retry_after(test_session):
+    engine = create_app_engine(test_session.get_bind().url, "test", pool_size=1, max_overflow=0, pool_timeout=0.2)
+    holder = Session(bind=engine)
+    waiting = Session(bind=engine)
+    try:
+        holder.connection()
+        assert pool_status(engine)["checked_out"] == 1
+
+        start = time.perf_counter()
+        with pytest.raises(PoolTimeoutError) as error:
+            waiting.connection()
+
+        assert time.perf_counter() - start < 2
+        response = asyncio.run(pool_timeout_handler(None, error.value))
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+        holder.close()
+        waiting.connection()
+        assert pool_status(engine)["checked_out"] == 1
+    finally:
+        holder.close()
+        waiting.close()
+        engine.dispose()
+
+
+def test_services_let_pool_timeouts_through(app_test, test_session):
+    engine = create_app_engine(test_session.get_bind().url, "test", pool_size=1, max_overflow=0, pool_timeout=0.2)
+    holder = Session(bind=engine)
+    waiting = Session(bind=engine)
+    try:
+        holder.connection()
+
+        # El servicio no lo convierte en un 500: lo responde el manejador de la aplicación
+        with pytest.raises(PoolTimeoutError):
+            asyncio.run(fetch_all_products(waiting))
+    finally:
+        holder.close()
+        waiting.close()
+        engine.dispose()
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.cache import catalog_cache
+from app.core.database import Base, RoutingSession
+from app.core.replicas import READ_ONLY, ReplicaSet, ReplicaState, get_primary_pin, reset_primary_pin, start_primary_pin
+from app.dependencies.database import get_read_session
+from app.models.category.category import Category
+from app.services.product.product import fetch_all_products
+
+
+# Una segunda base de datos PostgreSQL hace de réplica (no necesita replicación real)
+REPLICA_URI = os.getenv("TEST_REPLICA_DATABASE_URI")
+
+
+class FakeLagReplicaSet(ReplicaSet):
+    def __init__(self, lags, max_lag=5):
+        super().__init__([ReplicaState(name=name, engine=None) for name in lags], max_lag=max_lag, check_interval=0)
+        self.lags = lags
+
+    def measure_lag(self, replica):
+        lag = self.lags[replica.name]
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+def test_choose_skips_lagging_and_failing_replicas():
+    replicas = FakeLagReplicaSet({"replica0": 30.0, "replica1": 0.5, "replica2": RuntimeError("sin conexión")})
+
+    assert {replicas.choose().name for _ in range(3)} == {"replica1"}
+    assert [status["healthy"] for status in replicas.status()] == [False, True, False]
+
+
+def test_choose_falls_back_to_primary_when_all_replicas_lag():
+    replicas = FakeLagReplicaSet({"replica0": 30.0})
+
+    assert replicas.choose() is None
+
+    replicas.lags["replica0"] = 1.0
+    assert replicas.choose().name == "replica0"
+
+
+def test_read_session_uses_primary_when_pinned(test_session):
+    token = start_primary_pin(True)
+    try:
+        session = get_read_session(test_session)
+    finally:
+        reset_primary_pin(token)
+
+    assert READ_ONLY not in session.info
+
+
+def test_committed_write_pins_primary(app_test, test_session):
+    session = sessionmaker(class_=RoutingSession, bind=test_session.get_bind(), expire_on_commit=False)()
+    token = start_primary_pin(False)
+    try:
+        session.add(Category(name="Replicas", description=""))
+        session.commit()
+        assert get_primary_pin().wrote is True
+    finally:
+        reset_primary_pin(token)
+        session.close()
+
+
+def test_product_list_read_from_replica_is_not_cached(app_test, test_session, test_product):
+    # Réplica con retraso aceptado (2 s < 5 s): sus datos pueden ser anteriores a la última escritura
+    replicas = FakeLagReplicaSet({"replica0": 2.0})
+    replicas.replicas[0].engine = test_session.get_bind()
+    Session = sessionmaker(class_=RoutingSession, bind=test_session.get_bind(), replicas=replicas)
+
+    with Session(info={READ_ONLY: True}) as session:
+        response = asyncio.run(fetch_all_products(session))
+        assert session.info["replica"].name == "replica0"
+
+    assert response.status_code == 200
+    assert catalog_cache.get("catalog_response", "products") is None
+
+    with Session() as session:
+        asyncio.run(fetch_all_products(session))
+
+    assert catalog_cache.get("catalog_response", "products") is not None
+
+
+@pytest.mark.skipif(not REPLICA_URI, reason="TEST_REPLICA_DATABASE_URI no configurada")
+def test_read_only_session_reads_from_replica(app_test, test_session):
+    replica_engine = create_engine(REPLICA_URI)
+    Base.metadata.create_all(bind=replica_engine)
+    try:
+        with sessionmaker(bind=replica_engine)() as replica_session:
+            replica_session.add(Category(name="Solo en la réplica", description=""))
+            replica_session.commit()
+
+        replicas = ReplicaSet([ReplicaState(name="replica0", engine=replica_engine)], max_lag=5, check_interval=0)
+        Session = sessionmaker(class_=RoutingSession, bind=test_session.get_bind(), replicas=replicas)
+
+        with Session() as session:
+            assert session.query(Category).filter(Category.name == "Solo en la réplica").first() is None
+
+        with Session(info={READ_ONLY: True}) as session:
+            assert session.query(Category).filter(Category.name == "Solo en la réplica").first() is not None
+    finally:
+        Base.metadata.drop_all(bind=replica_engine)
+        replica_engine.dispose()
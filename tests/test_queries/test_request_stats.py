@@ -0,0 +1,56 @@
+from app.core.instrumentation import RequestStats
+from app.core.settings import get_settings
+
+
+settings = get_settings()
+
+
+def test_n_plus_one_detects_repeated_statement_with_different_parameters():
+    stats = RequestStats()
+    statement = "SELECT products.id FROM products WHERE products.category_id = %(param_1)s"
+    for category_id in range(6):
+        stats.record(statement, {"param_1": category_id}, 0.001)
+
+    suspects = stats.n_plus_one(5)
+
+    assert stats.query_count == 6
+    assert suspects == [{"statement": statement, "count": 6}]
+
+
+def test_n_plus_one_ignores_identical_parameters():
+    stats = RequestStats()
+    statement = "SELECT 1"
+    for _ in range(6):
+        stats.record(statement, {}, 0.001)
+
+    assert stats.n_plus_one(5) == []
+
+
+def test_slowest_statement_is_tracked():
+    stats = RequestStats()
+    stats.record("SELECT 1", {}, 0.002)
+    stats.record("SELECT 2", {}, 0.010)
+    stats.record("SELECT 3", {}, 0.001)
+
+    assert stats.slowest_statement == "SELECT 2"
+    assert round(stats.db_time, 3) == 0.013
+
+
+def test_debug_headers_expose_query_stats(auth_client, test_product, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    response = auth_client.get(f"/products/{test_product.id}")
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) >= 1
+    assert float(response.headers["X-DB-Time"]) >= 0
+    assert response.headers["X-DB-N-Plus-One"] == "0"
+
+
+def test_query_stats_headers_hidden_without_debug(auth_client, test_product, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", False)
+
+    response = auth_client.get(f"/products/{test_product.id}")
+
+    assert response.status_code == 200
+    assert "X-DB-Query-Count" not in response.headers
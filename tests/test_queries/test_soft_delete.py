@@ -0,0 +1,71 @@
+from datetime import datetime
+from sqlalchemy.orm import lazyload
+from app.models.order.order import Order
+from app.models.order.order_item import OrderItem
+from app.models.product.product import Product
+
+
+def test_deleted_product_is_hidden(client, test_product, test_session):
+    test_product.deleted_at = datetime.now()
+    test_session.commit()
+
+    response = client.get(f"/products/{test_product.id}")
+
+    assert response.status_code == 404
+    assert test_session.query(Product).filter(Product.id == test_product.id).first() is None
+    assert test_session.query(Product).execution_options(include_deleted=True).filter(
+        Product.id == test_product.id
+    ).first() is not None
+
+
+def test_deleted_orders_are_hidden_unless_admin_opts_out(auth_client_for_admin, test_order, test_session):
+    test_order.deleted_at = datetime.now()
+    test_session.commit()
+
+    response = auth_client_for_admin.get(f"/orders/{test_order.id}")
+    assert response.status_code == 404
+
+    response = auth_client_for_admin.get(f"/orders/{test_order.id}", params={"include_deleted": True})
+    assert response.status_code == 200
+    assert response.json()["id"] == test_order.id
+
+
+def test_order_keeps_name_of_deleted_product(auth_client, test_order_item, test_product, test_session):
+    test_product.deleted_at = datetime.now()
+    test_session.commit()
+    test_session.expire_all()
+
+    response = auth_client.get("/orders/me")
+
+    assert response.status_code == 200
+    items = response.json()[0]["order_items"]
+    assert items[0]["name"] == test_product.name
+
+
+def test_deleted_order_items_are_not_loaded(test_order_item, test_order, test_session):
+    test_order_item.deleted_at = datetime.now()
+    test_session.commit()
+    test_session.expire_all()
+
+    order = test_session.query(Order).filter(Order.id == test_order.id).first()
+
+    assert order.order_items == []
+
+
+def test_order_item_loads_deleted_product(test_order_item, test_product, test_session):
+    test_product.deleted_at = datetime.now()
+    test_session.commit()
+    test_session.expire_all()
+
+    # Carga joined (la de la relación) y carga perezosa de la relación
+    item = test_session.query(OrderItem).filter(OrderItem.id == test_order_item.id).one()
+    test_session.expunge_all()
+    lazy_item = test_session.query(OrderItem).options(lazyload(OrderItem.product)).filter(
+        OrderItem.id == test_order_item.id
+    ).one()
+
+    assert item.product is not None
+    assert item.product.name == test_product.name
+    assert lazy_item.product is not None
+    # Consultado directamente, el producto eliminado sigue oculto
+    assert test_session.query(Product).filter(Product.id == test_product.id).first() is None
@@ -0,0 +1,37 @@
+def test_product_list_returns_only_requested_fields(client, test_product, query_counter):
+    response = client.get("/products/products/?fields=id,name,price")
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": test_product.id, "name": "Laptop Gamer", "price": "1200.00"}]
+    products_query = [statement for statement in query_counter if "FROM products" in statement][0]
+    assert "description" not in products_query
+
+
+def test_product_detail_with_fields(client, test_product):
+    response = client.get(f"/products/{test_product.id}?fields=name,stock")
+
+    assert response.status_code == 200
+    assert response.json() == {"name": "Laptop Gamer", "stock": 10}
+
+
+def test_unknown_field_is_rejected(client, test_product):
+    response = client.get(f"/products/{test_product.id}?fields=name,cost")
+
+    assert response.status_code == 400
+    assert "cost" in response.json()["detail"]
+
+
+def test_order_list_without_items(auth_client, test_order, test_order_item, query_counter):
+    response = auth_client.get("/orders/me?fields=id,status,total_price")
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": test_order.id, "status": "pendiente", "total_price": "0.00"}]
+    assert not any("order_items" in statement for statement in query_counter)
+
+
+def test_order_detail_with_items(auth_client_for_admin, test_order, test_order_item):
+    response = auth_client_for_admin.get(f"/orders/{test_order.id}?fields=id,order_items")
+
+    assert response.status_code == 200
+    assert response.json()["order_items"][0]["subtotal"] == "2400.00"
+    assert set(response.json()) == {"id", "order_items"}
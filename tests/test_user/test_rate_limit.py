@@ -0,0 +1,47 @@
+import asyncio
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimiter
+from app.dependencies import rate_limit
+from tests.conftest import USER_PASSWORD
+
+
+def test_sliding_window_blocks_and_recovers():
+    limiter = RateLimiter(MemoryRateLimitBackend())
+
+    async def scenario():
+        allowed = [await limiter.hit("key", limit=3, window=60, now=120 + i) for i in range(3)]
+        blocked = await limiter.hit("key", limit=3, window=60, now=125)
+        # Al empezar la ventana siguiente aún cuenta la mayor parte de la anterior
+        still_blocked = await limiter.hit("key", limit=3, window=60, now=190)
+        recovered = await limiter.hit("key", limit=3, window=60, now=245)
+        return allowed, blocked, still_blocked, recovered
+
+    allowed, blocked, still_blocked, recovered = asyncio.run(scenario())
+
+    assert allowed == [None, None, None]
+    assert blocked is not None and blocked >= 1
+    assert still_blocked is not None
+    assert recovered is None
+
+
+def test_login_is_limited_per_account_before_touching_the_database(client, user, query_counter, monkeypatch):
+    monkeypatch.setattr(rate_limit.login_rate_limit, "per_account", 2)
+    data = {"username": user.email, "password": "incorrecta"}
+
+    for _ in range(2):
+        assert client.post("/auth/login", data=data).status_code == 400
+
+    query_counter.clear()
+    response = client.post("/auth/login", data={"username": user.email.upper(), "password": USER_PASSWORD})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert query_counter == []
+
+
+def test_forgot_password_is_limited_per_ip(client, user, monkeypatch):
+    monkeypatch.setattr(rate_limit.forgot_password_rate_limit, "per_ip", 1)
+
+    client.post("/auth/forgot-password", json={"email": "otro@ejemplo.com"})
+    response = client.post("/auth/forgot-password", json={"email": user.email})
+
+    assert response.status_code == 429